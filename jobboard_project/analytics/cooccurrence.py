@@ -0,0 +1,220 @@
+# analytics/cooccurrence.py
+"""
+"People who viewed this also viewed" from visitor co-occurrence.
+
+An incremental batch job reads the JobView and Application rows added
+since its cursors, groups them by visitor (logged-in user or anonymous
+visitor id) and, for every job that is new in a visitor's history, adds
+one to the pair count with each job the visitor had already seen. A batch's
+pairs are gathered as NumPy coordinate arrays and summed into a sparse
+increment matrix in one vectorised pass; counts live in the sparse
+JobCooccurrence table and the top pairs of every
+touched job are copied into JobNeighbours (kind BEHAVIOUR), so the job
+page reads a single precomputed row.
+"""
+import heapq
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from applications.models import Application
+from jobs.models import JobNeighbours
+
+from .models import JobCooccurrence, JobView, ProcessingCursor
+from .rollups import visitor_key
+
+KIND = 'BEHAVIOUR'
+NEIGHBOURS_KEPT = 10
+VIEW_CURSOR = 'cooccurrence.views'
+APPLICATION_CURSOR = 'cooccurrence.applications'
+# Only the recent history of a visitor pairs with a new view
+HISTORY_DAYS = 90
+# Visitors touching more jobs than this are crawlers or shared machines
+MAX_JOBS_PER_VISITOR = 100
+
+
+def new_events(batch_size):
+    """Visitor -> new job ids (in event order) from rows past the cursors"""
+    view_cursor = ProcessingCursor.get_position(VIEW_CURSOR)
+    application_cursor = ProcessingCursor.get_position(APPLICATION_CURSOR)
+
+    events = defaultdict(list)
+    last_view = view_cursor
+    views = JobView.objects.filter(id__gt=view_cursor).order_by('id').values_list(
+        'id', 'job_id', 'viewer_id', 'session_key'
+    )[:batch_size]
+    for view_id, job_id, viewer_id, session_key in views:
+        last_view = view_id
+        # IP-only visitors are too coarse (NAT, offices) to pair on
+        key = visitor_key(viewer_id, session_key, None)
+        if key:
+            events[key].append(job_id)
+
+    last_application = application_cursor
+    applications = Application.objects.filter(id__gt=application_cursor).order_by('id').values_list(
+        'id', 'job_id', 'applicant_id'
+    )[:batch_size]
+    for application_id, job_id, applicant_id in applications:
+        last_application = application_id
+        events[visitor_key(applicant_id, None, None)].append(job_id)
+
+    return events, (view_cursor, last_view), (application_cursor, last_application)
+
+
+def visitor_history(keys, view_cursor, application_cursor):
+    """Jobs each visitor had already touched before this batch"""
+    since = timezone.now() - timedelta(days=HISTORY_DAYS)
+    user_ids = [int(key[2:]) for key in keys if key.startswith('u:')]
+    session_keys = [key[2:] for key in keys if key.startswith('s:')]
+
+    history = defaultdict(set)
+    for start in range(0, len(user_ids), 1000):
+        chunk = user_ids[start:start + 1000]
+        rows = JobView.objects.filter(
+            viewer_id__in=chunk, viewed_at__gte=since, id__lte=view_cursor
+        ).values_list('viewer_id', 'job_id').distinct()
+        for user_id, job_id in rows:
+            history[f"u:{user_id}"].add(job_id)
+        rows = Application.objects.filter(
+            applicant_id__in=chunk, id__lte=application_cursor
+        ).values_list('applicant_id', 'job_id')
+        for user_id, job_id in rows:
+            history[f"u:{user_id}"].add(job_id)
+
+    for start in range(0, len(session_keys), 1000):
+        rows = JobView.objects.filter(
+            session_key__in=session_keys[start:start + 1000], viewer__isnull=True,
+            viewed_at__gte=since, id__lte=view_cursor
+        ).values_list('session_key', 'job_id').distinct()
+        for session_key, job_id in rows:
+            history[f"s:{session_key}"].add(job_id)
+
+    return history
+
+
+def count_pairs(events, history):
+    """Sparse pair increments {(job_id, other_id): n}, symmetric"""
+    rows = []
+    cols = []
+    for key, job_ids in events.items():
+        seen = list(history.get(key, ()))
+        seen_set = set(seen)
+        if len(seen) >= MAX_JOBS_PER_VISITOR:
+            continue
+        for job_id in job_ids:
+            if job_id in seen_set:
+                continue
+            if seen:
+                rows.append(np.full(len(seen), job_id, dtype=np.int64))
+                cols.append(np.array(seen, dtype=np.int64))
+            seen.append(job_id)
+            seen_set.add(job_id)
+            if len(seen) >= MAX_JOBS_PER_VISITOR:
+                break
+    if not rows:
+        return {}
+
+    # COO coordinates, mirrored so the matrix is symmetric; duplicates sum
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+    width = int(cols.max()) + 1
+    cells, counts = np.unique(rows * width + cols, return_counts=True)
+    return {
+        (int(cell // width), int(cell % width)): int(count)
+        for cell, count in zip(cells, counts)
+    }
+
+
+def apply_increments(pairs, batch_size=1000):
+    """Add the increments to JobCooccurrence (read-modify-write per chunk)"""
+    items = sorted(pairs.items())
+    for start in range(0, len(items), batch_size):
+        chunk = dict(items[start:start + batch_size])
+        job_ids = {job_id for job_id, other_id in chunk}
+        other_ids = {other_id for job_id, other_id in chunk}
+
+        with transaction.atomic():
+            existing = JobCooccurrence.objects.select_for_update().filter(
+                job_id__in=job_ids, other_job_id__in=other_ids
+            )
+            to_update = []
+            for row in existing:
+                increment = chunk.pop((row.job_id, row.other_job_id), 0)
+                if increment:
+                    row.count += increment
+                    to_update.append(row)
+            JobCooccurrence.objects.bulk_update(to_update, ['count'])
+            JobCooccurrence.objects.bulk_create([
+                JobCooccurrence(job_id=job_id, other_job_id=other_id, count=increment)
+                for (job_id, other_id), increment in chunk.items()
+            ])
+
+
+def refresh_neighbours(job_ids, k=NEIGHBOURS_KEPT, batch_size=200):
+    """Copy the top-k pairs of each job into JobNeighbours"""
+    job_ids = sorted(job_ids)
+    now = timezone.now()
+    for start in range(0, len(job_ids), batch_size):
+        chunk = job_ids[start:start + batch_size]
+        top = defaultdict(list)
+        rows = JobCooccurrence.objects.filter(
+            job_id__in=chunk, other_job__is_active=True
+        ).values_list('job_id', 'other_job_id', 'count')
+        for job_id, other_id, count in rows.iterator(chunk_size=5000):
+            entry = (count, -other_id)
+            if len(top[job_id]) < k:
+                heapq.heappush(top[job_id], entry)
+            elif entry > top[job_id][0]:
+                heapq.heapreplace(top[job_id], entry)
+
+        with transaction.atomic():
+            JobNeighbours.objects.bulk_create(
+                [JobNeighbours(job_id=job_id, kind=KIND) for job_id in chunk],
+                ignore_conflicts=True
+            )
+            rows = list(JobNeighbours.objects.select_for_update().filter(kind=KIND, job_id__in=chunk))
+            for row in rows:
+                row.neighbours = [[-other, count] for count, other in sorted(top[row.job_id], reverse=True)]
+                row.is_stale = False
+                row.updated_at = now
+            JobNeighbours.objects.bulk_update(rows, ['neighbours', 'is_stale', 'updated_at'])
+
+
+def build_cooccurrence(batch_size=20000, max_batches=50):
+    """
+    Consume new views and applications in batches (all of them when
+    `max_batches` is None) and refresh the "also viewed" lists of every
+    job whose counts changed.
+    Returns (events processed, jobs refreshed).
+    """
+    processed = 0
+    batches = 0
+    touched = set()
+    while max_batches is None or batches < max_batches:
+        batches += 1
+        events, views, applications = new_events(batch_size)
+        if views[0] == views[1] and applications[0] == applications[1]:
+            break
+
+        history = visitor_history(list(events), views[0], applications[0])
+        pairs = count_pairs(events, history)
+        apply_increments(pairs)
+        touched.update(job_id for job_id, other_id in pairs)
+
+        ProcessingCursor.set_position(VIEW_CURSOR, views[1])
+        ProcessingCursor.set_position(APPLICATION_CURSOR, applications[1])
+        processed += sum(len(job_ids) for job_ids in events.values())
+
+    refresh_neighbours(touched)
+    return processed, len(touched)
+
+
+def reset_cooccurrence():
+    """Forget every count so the next build starts from the oldest raw row"""
+    with transaction.atomic():
+        JobCooccurrence.objects.all().delete()
+        JobNeighbours.objects.filter(kind=KIND).delete()
+        ProcessingCursor.objects.filter(name__in=[VIEW_CURSOR, APPLICATION_CURSOR]).delete()
@@ -0,0 +1,94 @@
+# analytics/hll.py
+import hashlib
+import math
+import zlib
+
+
+class HyperLogLog:
+    """
+    HyperLogLog cardinality sketch.
+
+    With the default precision (2^12 registers) a sketch is 4 KB before
+    compression and estimates distinct counts with ~1.6% standard error.
+    Sketches with the same precision merge by taking the register-wise max,
+    so daily sketches can be combined into any date range, and sketches
+    built by different workers can be combined into one.
+    """
+
+    DEFAULT_PRECISION = 12
+
+    def __init__(self, precision=DEFAULT_PRECISION, registers=None):
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.m)
+        if len(self.registers) != self.m:
+            raise ValueError("Register count does not match precision")
+
+    @staticmethod
+    def _hash(value):
+        digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big')
+
+    def add(self, value):
+        x = self._hash(value)
+        bits = 64 - self.precision
+        index = x >> bits
+        rest = x & ((1 << bits) - 1)
+        rank = bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def count(self):
+        m = self.m
+        if m == 16:
+            alpha = 0.673
+        elif m == 32:
+            alpha = 0.697
+        elif m == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / m)
+
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        # Small range correction (linear counting)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
+
+    def to_bytes(self):
+        """Serialize as one precision byte followed by the zlib-compressed registers"""
+        return bytes([self.precision]) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data):
+        if not data:
+            return cls()
+        data = bytes(data)
+        return cls(precision=data[0], registers=zlib.decompress(data[1:]))
+
+    @classmethod
+    def merged(cls, sketches):
+        """Merge an iterable of serialized sketches into one sketch"""
+        result = cls()
+        for data in sketches:
+            if data:
+                result.merge(cls.from_bytes(data))
+        return result
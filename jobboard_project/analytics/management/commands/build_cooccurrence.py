@@ -0,0 +1,18 @@
+# analytics/management/commands/build_cooccurrence.py
+from django.core.management.base import BaseCommand
+from analytics.cooccurrence import build_cooccurrence, reset_cooccurrence
+
+class Command(BaseCommand):
+    help = 'Build "people who viewed this also viewed" lists from view co-occurrence'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Drop all counts and rebuild from the oldest raw view')
+        parser.add_argument('--batch-size', type=int, default=20000)
+    
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset_cooccurrence()
+            self.stdout.write("🧹 Cleared co-occurrence counts")
+        
+        processed, refreshed = build_cooccurrence(batch_size=options['batch_size'], max_batches=None)
+        self.stdout.write(f"🎉 Processed {processed} event(s), refreshed {refreshed} job list(s)")
@@ -0,0 +1,19 @@
+# analytics/management/commands/compact_job_views.py
+from django.core.management.base import BaseCommand
+from analytics.retention import compact_job_views
+
+class Command(BaseCommand):
+    help = 'Roll up old job views and drop raw rows older than the retention window'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, help='Months of raw views to keep (default: JOBVIEW_RETENTION_MONTHS)')
+    
+    def handle(self, *args, **options):
+        result = compact_job_views(options['months'])
+        
+        self.stdout.write(f"✅ Rolled up {result['rolled_up_days']} day(s)")
+        if 'partitions_dropped' in result:
+            self.stdout.write(f"🗂️ Added partitions: {', '.join(result['partitions_added']) or 'none'}")
+            self.stdout.write(f"🗑️ Dropped partitions: {', '.join(result['partitions_dropped']) or 'none'}")
+        else:
+            self.stdout.write(f"🗑️ Deleted {result['rows_deleted']} raw view(s) before {result['cutoff']}")
@@ -0,0 +1,34 @@
+# analytics/management/commands/rollup_job_views.py
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from analytics.rollups import rollup_day, rollup_pending_days
+
+class Command(BaseCommand):
+    help = 'Roll up raw job views into daily per-job totals'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Rebuild a single day (YYYY-MM-DD)')
+        parser.add_argument('--since', help='Rebuild every day from this date (YYYY-MM-DD) until yesterday')
+    
+    def handle(self, *args, **options):
+        try:
+            single_day = date.fromisoformat(options['date']) if options['date'] else None
+            since = date.fromisoformat(options['since']) if options['since'] else None
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+        
+        if single_day:
+            rows = rollup_day(single_day)
+            self.stdout.write(f"✅ {single_day}: {rows} job(s) rolled up")
+            return
+        
+        if since:
+            day = since
+            yesterday = timezone.localdate() - timedelta(days=1)
+            while day <= yesterday:
+                rollup_day(day)
+                day += timedelta(days=1)
+        
+        days = rollup_pending_days()
+        self.stdout.write(f"🎉 Rolled up {days} pending day(s)")
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_initial'),
+        ('jobs', '0006_create_job_alert_fresh'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobViewDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('unique_viewers', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='jobs.job')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='analytics_j_date_20b424_idx')],
+                'unique_together': {('job', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_jobviewdaily'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobviewdaily',
+            name='viewer_sketch',
+            field=models.BinaryField(blank=True, default=b''),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.9 on 2026-10-19 05:58
+
+import django.db.models.deletion
+from datetime import date
+from django.conf import settings
+from django.db import migrations, models
+
+from analytics import partitions
+
+
+def partition_job_views(apps, schema_editor):
+    """Split analytics_jobview into monthly partitions (MySQL only)"""
+    connection = schema_editor.connection
+    if not partitions.supports_partitions(connection) or partitions.is_partitioned(connection):
+        return
+    
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(viewed_at) FROM {partitions.TABLE}")
+        first_view = cursor.fetchone()[0]
+    first_month = first_view.date() if first_view else date.today()
+    partitions.create_partitions(connection, first_month)
+
+
+def unpartition_job_views(apps, schema_editor):
+    connection = schema_editor.connection
+    if partitions.is_partitioned(connection):
+        partitions.remove_partitions(connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_jobviewdaily_viewer_sketch'),
+        ('jobs', '0006_create_job_alert_fresh'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobview',
+            name='job',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='job_views', to='jobs.job'),
+        ),
+        migrations.AlterField(
+            model_name='jobview',
+            name='viewer',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(partition_job_views, unpartition_job_views),
+    ]
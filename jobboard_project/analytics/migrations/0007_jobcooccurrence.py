@@ -0,0 +1,59 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_partition_jobview_by_month'),
+        ('jobs', '0008_jobneighbours'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobCooccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProcessingCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('position', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='jobview',
+            index=models.Index(fields=['viewer', 'viewed_at'], name='analytics_j_viewer__f95ffe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobview',
+            index=models.Index(fields=['session_key', 'viewed_at'], name='analytics_j_session_0fb390_idx'),
+        ),
+        migrations.AddField(
+            model_name='jobcooccurrence',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cooccurrences', to='jobs.job'),
+        ),
+        migrations.AddField(
+            model_name='jobcooccurrence',
+            name='other_job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jobs.job'),
+        ),
+        migrations.AddIndex(
+            model_name='jobcooccurrence',
+            index=models.Index(fields=['job', '-count'], name='analytics_j_job_id_7fc3a9_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobcooccurrence',
+            unique_together={('job', 'other_job')},
+        ),
+    ]
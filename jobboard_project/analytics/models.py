@@ -6,8 +6,12 @@ from applications.models import Application
 User = get_user_model()
 
 class JobView(models.Model):
-    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='job_views')
-    viewer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    # No database-level FK constraints: on MySQL this table is partitioned by
+    # month (see analytics.partitions), and partitioned InnoDB tables cannot
+    # have foreign keys. CASCADE / SET_NULL are still applied by Django.
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='job_views', db_constraint=False)
+    viewer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, db_constraint=False)
+    # Anonymous visitor id from analytics.tracking (not a Django session key)
     session_key = models.CharField(max_length=40, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     viewed_at = models.DateTimeField(auto_now_add=True)
@@ -15,11 +19,68 @@ class JobView(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['job', 'viewed_at']),
+            models.Index(fields=['viewer', 'viewed_at']),
+            models.Index(fields=['session_key', 'viewed_at']),
         ]
     
     def __str__(self):
         return f"{self.job.title} viewed at {self.viewed_at}"
 
+class JobViewDaily(models.Model):
+    """Per-job, per-day rollup of JobView rows (filled by analytics.rollups)"""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='daily_views')
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    unique_viewers = models.PositiveIntegerField(default=0)
+    # Serialized analytics.hll.HyperLogLog of the day's visitors
+    viewer_sketch = models.BinaryField(blank=True, default=b'')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['job', 'date']
+        ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.job.title} on {self.date}: {self.views} views"
+
+class JobCooccurrence(models.Model):
+    """
+    One cell of the sparse job x job co-occurrence matrix: how many visitors
+    viewed or applied to both jobs. Stored in both directions.
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='cooccurrences')
+    other_job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='+')
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['job', 'other_job']
+        indexes = [
+            models.Index(fields=['job', '-count']),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} & {self.other_job_id}: {self.count}"
+
+class ProcessingCursor(models.Model):
+    """Last row id consumed by an incremental batch job"""
+    name = models.CharField(max_length=100, unique=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
+    
+    @classmethod
+    def get_position(cls, name):
+        return cls.objects.get_or_create(name=name)[0].position
+    
+    @classmethod
+    def set_position(cls, name, position):
+        cls.objects.update_or_create(name=name, defaults={'position': position})
+
 class ApplicationEvent(models.Model):
     EVENT_CHOICES = [
         ('APPLIED', 'Applied'),
@@ -0,0 +1,119 @@
+# analytics/partitions.py
+"""
+Monthly partition maintenance for the raw analytics_jobview table.
+
+On MySQL the table is RANGE-partitioned on TO_DAYS(viewed_at), one
+partition per month plus a catch-all `pmax`, so old months are removed
+with a cheap DROP PARTITION instead of a huge DELETE. Other backends keep
+a plain table and are pruned with batched deletes (see retention.py).
+"""
+from datetime import date
+
+from django.db import connection
+
+TABLE = 'analytics_jobview'
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"p{month:%Y%m}"
+
+
+def partition_clause(month):
+    upper = add_months(month, 1)
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN (TO_DAYS('{upper:%Y-%m-%d}'))"
+
+
+def supports_partitions(conn=None):
+    return (conn or connection).vendor == 'mysql'
+
+
+def existing_partitions(conn=None):
+    """Return {partition_name: upper_bound_in_days} for the table, or {} if not partitioned"""
+    conn = conn or connection
+    if not supports_partitions(conn):
+        return {}
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+              AND PARTITION_NAME IS NOT NULL
+            """,
+            [TABLE]
+        )
+        return dict(cursor.fetchall())
+
+
+def is_partitioned(conn=None):
+    return bool(existing_partitions(conn))
+
+
+def create_partitions(conn, first_month, months_ahead=3):
+    """Convert the table to monthly RANGE partitions (MySQL only)"""
+    last_month = add_months(month_start(date.today()), months_ahead)
+    clauses = []
+    month = month_start(first_month)
+    while month <= last_month:
+        clauses.append(partition_clause(month))
+        month = add_months(month, 1)
+    clauses.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+
+    with conn.cursor() as cursor:
+        # Every unique key must contain the partitioning column
+        cursor.execute(f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id, viewed_at)")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} PARTITION BY RANGE (TO_DAYS(viewed_at)) ({', '.join(clauses)})"
+        )
+
+
+def remove_partitions(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} REMOVE PARTITIONING")
+        cursor.execute(f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+
+
+def ensure_future_partitions(months_ahead=3):
+    """Split `pmax` so the next few months always have their own partition"""
+    existing = existing_partitions()
+    if not existing:
+        return []
+
+    added = []
+    month = month_start(date.today())
+    last_month = add_months(month, months_ahead)
+    while month <= last_month:
+        if partition_name(month) not in existing:
+            added.append(month)
+        month = add_months(month, 1)
+
+    if added:
+        clauses = [partition_clause(month) for month in added]
+        clauses.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {TABLE} REORGANIZE PARTITION pmax INTO ({', '.join(clauses)})"
+            )
+    return [partition_name(month) for month in added]
+
+
+def drop_partitions_before(cutoff):
+    """Drop every monthly partition that only holds rows older than `cutoff` (a month start)"""
+    existing = existing_partitions()
+    expired = [
+        name for name in existing
+        if name != 'pmax' and name[1:] < f"{cutoff:%Y%m}"
+    ]
+    if expired:
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {TABLE} DROP PARTITION {', '.join(sorted(expired))}")
+    return sorted(expired)
@@ -0,0 +1,58 @@
+# analytics/retention.py
+from django.conf import settings
+from django.utils import timezone
+
+from . import partitions
+from .models import JobView
+from .rollups import day_bounds, rollup_pending_days
+
+DEFAULT_RETENTION_MONTHS = 6
+
+
+def retention_cutoff(months=None):
+    """First day that still keeps raw JobView rows"""
+    if months is None:
+        months = getattr(settings, 'JOBVIEW_RETENTION_MONTHS', DEFAULT_RETENTION_MONTHS)
+    this_month = partitions.month_start(timezone.localdate())
+    return partitions.add_months(this_month, -months)
+
+
+def delete_views_before(cutoff, batch_size=10000):
+    """Batched DELETE for backends without partitions; keeps each transaction small"""
+    before = day_bounds(cutoff)[0]
+    deleted = 0
+    while True:
+        ids = list(
+            JobView.objects.filter(viewed_at__lt=before)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += JobView.objects.filter(id__in=ids).delete()[0]
+
+
+def compact_job_views(months=None):
+    """
+    Make sure every closed day is rolled up into JobViewDaily, then drop the
+    raw rows of months older than the retention window.
+    """
+    cutoff = retention_cutoff(months)
+
+    rolled_up_days = rollup_pending_days()
+
+    if partitions.is_partitioned():
+        added = partitions.ensure_future_partitions()
+        dropped = partitions.drop_partitions_before(cutoff)
+        return {
+            'cutoff': cutoff,
+            'rolled_up_days': rolled_up_days,
+            'partitions_added': added,
+            'partitions_dropped': dropped,
+        }
+
+    return {
+        'cutoff': cutoff,
+        'rolled_up_days': rolled_up_days,
+        'rows_deleted': delete_views_before(cutoff),
+    }
@@ -0,0 +1,172 @@
+# analytics/rollups.py
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Max, Min, Sum, Count
+from django.utils import timezone
+
+from .hll import HyperLogLog
+from .models import JobView, JobViewDaily
+
+
+def day_bounds(day):
+    """Return the [start, end) datetimes of a calendar day in the current timezone"""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(day, time.min), tz)
+    return start, start + timedelta(days=1)
+
+
+def visitor_key(viewer_id, session_key, ip_address):
+    """Identify a visitor: logged-in user first, then session, then IP"""
+    if viewer_id:
+        return f"u:{viewer_id}"
+    if session_key:
+        return f"s:{session_key}"
+    if ip_address:
+        return f"ip:{ip_address}"
+    return None
+
+
+def rollup_day(day):
+    """
+    Rebuild the JobViewDaily rows for one day from the raw JobView table.
+    Safe to run any number of times - the day is replaced, never added to.
+    Days whose raw rows were already purged by retention are left alone.
+    """
+    start, end = day_bounds(day)
+
+    views = Counter()
+    visitors = defaultdict(HyperLogLog)
+
+    raw = JobView.objects.filter(
+        viewed_at__gte=start,
+        viewed_at__lt=end
+    ).values_list('job_id', 'viewer_id', 'session_key', 'ip_address')
+
+    for job_id, viewer_id, session_key, ip_address in raw.iterator(chunk_size=5000):
+        views[job_id] += 1
+        key = visitor_key(viewer_id, session_key, ip_address)
+        if key:
+            visitors[job_id].add(key)
+
+    if not views:
+        # Nothing raw left for this day (or no traffic): keep what is there
+        return 0
+
+    rows = []
+    for job_id, count in views.items():
+        sketch = visitors[job_id]
+        rows.append(JobViewDaily(
+            job_id=job_id,
+            date=day,
+            views=count,
+            unique_viewers=sketch.count(),
+            viewer_sketch=sketch.to_bytes(),
+        ))
+
+    with transaction.atomic():
+        JobViewDaily.objects.filter(date=day).delete()
+        JobViewDaily.objects.bulk_create(rows, batch_size=1000)
+
+    return len(rows)
+
+
+def last_rolled_up_date():
+    return JobViewDaily.objects.aggregate(last=Max('date'))['last']
+
+
+def rollup_pending_days(until=None):
+    """
+    Roll up every closed day that has not been rolled up yet.
+    The last rolled-up day is always redone so late rows are picked up.
+    """
+    until = until or timezone.localdate() - timedelta(days=1)
+
+    day = last_rolled_up_date()
+    if day is None:
+        first_view = JobView.objects.aggregate(first=Min('viewed_at'))['first']
+        if first_view is None:
+            return 0
+        day = timezone.localdate(first_view)
+
+    days = 0
+    while day <= until:
+        rollup_day(day)
+        day += timedelta(days=1)
+        days += 1
+
+    return days
+
+
+def raw_views_since():
+    """Start of the window that is not covered by rollups yet"""
+    last = last_rolled_up_date()
+    if last is None:
+        return None
+    return day_bounds(last + timedelta(days=1))[0]
+
+
+def job_view_counts(**job_filter):
+    """
+    Total views per job id, read from the rollups plus raw rows newer than
+    the last rollup. `job_filter` uses Job lookups, e.g. company=company.
+    """
+    job_lookup = {f"job__{key}": value for key, value in job_filter.items()}
+
+    counts = Counter()
+    for row in JobViewDaily.objects.filter(**job_lookup).values('job_id').annotate(total=Sum('views')):
+        counts[row['job_id']] += row['total']
+
+    raw = JobView.objects.filter(**job_lookup)
+    since = raw_views_since()
+    if since is not None:
+        raw = raw.filter(viewed_at__gte=since)
+    for row in raw.values('job_id').annotate(total=Count('id')):
+        counts[row['job_id']] += row['total']
+
+    return counts
+
+
+def unique_viewer_sketches(start_date=None, end_date=None, **job_filter):
+    """
+    HyperLogLog sketch of the visitors per job id between two dates
+    (inclusive), merged from the daily sketches plus raw rows newer than
+    the last rollup. `job_filter` uses Job lookups, like job_view_counts.
+    """
+    job_lookup = {f"job__{key}": value for key, value in job_filter.items()}
+
+    daily = JobViewDaily.objects.filter(**job_lookup)
+    raw = JobView.objects.filter(**job_lookup)
+    if start_date:
+        daily = daily.filter(date__gte=start_date)
+        raw = raw.filter(viewed_at__gte=day_bounds(start_date)[0])
+    if end_date:
+        daily = daily.filter(date__lte=end_date)
+        raw = raw.filter(viewed_at__lt=day_bounds(end_date)[1])
+
+    sketches = defaultdict(HyperLogLog)
+    for job_id, data in daily.values_list('job_id', 'viewer_sketch').iterator(chunk_size=500):
+        if data:
+            sketches[job_id].merge(HyperLogLog.from_bytes(data))
+
+    since = raw_views_since()
+    if since is not None:
+        raw = raw.filter(viewed_at__gte=since)
+    rows = raw.values_list('job_id', 'viewer_id', 'session_key', 'ip_address')
+    for job_id, viewer_id, session_key, ip_address in rows.iterator(chunk_size=5000):
+        key = visitor_key(viewer_id, session_key, ip_address)
+        if key:
+            sketches[job_id].add(key)
+
+    return sketches
+
+
+def unique_viewer_counts(start_date=None, end_date=None, **job_filter):
+    """Estimated unique viewers per job id, plus the overall total across those jobs"""
+    sketches = unique_viewer_sketches(start_date, end_date, **job_filter)
+    counts = {job_id: sketch.count() for job_id, sketch in sketches.items()}
+    total = HyperLogLog()
+    for sketch in sketches.values():
+        total.merge(sketch)
+    return counts, total.count()
@@ -0,0 +1,28 @@
+from celery import shared_task
+from . import retention
+from .cooccurrence import build_cooccurrence
+from .rollups import rollup_pending_days
+
+@shared_task
+def rollup_job_views():
+    """
+    Roll up raw JobView rows into JobViewDaily
+    """
+    days = rollup_pending_days()
+    return f"Rolled up {days} day(s) of job views"
+
+@shared_task
+def compact_job_views():
+    """
+    Roll up and drop raw JobView months older than the retention window
+    """
+    result = retention.compact_job_views()
+    return f"Compacted job views older than {result['cutoff']}: {result}"
+
+@shared_task
+def build_job_cooccurrence():
+    """
+    Fold new views and applications into the "also viewed" lists
+    """
+    processed, refreshed = build_cooccurrence()
+    return f"Processed {processed} event(s), refreshed {refreshed} job(s)"
@@ -0,0 +1,69 @@
+# analytics/tracking.py
+import re
+
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import salted_hmac
+
+VISITOR_COOKIE = 'jb_visitor'
+VISITOR_COOKIE_SALT = 'analytics.visitor'
+VISITOR_COOKIE_MAX_AGE = 60 * 60 * 24 * 365
+
+CRAWLER_PATTERN = re.compile(
+    r'bot|crawl|spider|slurp|facebookexternalhit|preview|monitor|curl|wget|python-requests|httpclient',
+    re.IGNORECASE
+)
+
+
+def get_client_ip(request):
+    """
+    REMOTE_ADDR, unless TRUSTED_PROXY_COUNT proxies sit in front of us: then
+    the address the outermost of them saw. Entries to its left are client
+    supplied and never trusted.
+    """
+    proxies = getattr(settings, 'TRUSTED_PROXY_COUNT', 0)
+    if proxies:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR')
+
+
+def is_crawler(request):
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+    return not user_agent or bool(CRAWLER_PATTERN.search(user_agent))
+
+
+def visitor_fingerprint(request):
+    """Keyed hash of IP + user agent, so the raw values are never stored"""
+    value = f"{get_client_ip(request)}|{request.META.get('HTTP_USER_AGENT', '')}"
+    return salted_hmac(VISITOR_COOKIE_SALT, value).hexdigest()[:32]
+
+
+def get_visitor_id(request):
+    """
+    Return (visitor_id, is_new) for an anonymous visitor without touching
+    the session table. Returning visitors are identified by a signed cookie;
+    first-time visitors get an IP + user agent fingerprint.
+    """
+    try:
+        visitor_id = request.get_signed_cookie(
+            VISITOR_COOKIE,
+            salt=VISITOR_COOKIE_SALT,
+            max_age=VISITOR_COOKIE_MAX_AGE
+        )
+        return visitor_id, False
+    except (KeyError, signing.BadSignature):
+        return visitor_fingerprint(request), True
+
+
+def remember_visitor(response, visitor_id):
+    response.set_signed_cookie(
+        VISITOR_COOKIE,
+        visitor_id,
+        salt=VISITOR_COOKIE_SALT,
+        max_age=VISITOR_COOKIE_MAX_AGE,
+        httponly=True,
+        samesite='Lax'
+    )
+    return response
@@ -0,0 +1,153 @@
+# applications/counters.py
+"""
+Denormalized application counts per job and status.
+
+ApplicationStatusCount holds one row per (job, status) with the company
+copied in, so a job's or a company's status breakdown is a single indexed
+read. applications.signals adjusts the rows when an application is
+created, changes status or is deleted, and bulk_transition() moves counts
+for a whole batch; every adjustment is an F() UPDATE inside the caller's
+transaction. Rows for a job are created on its first application. When a
+job is deleted its counts go with it, so cascaded deletes are not
+counted. The recount_application_counts command rebuilds the table.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from jobs.models import Job
+
+from .models import Application, ApplicationStatusCount
+
+STATUSES = [status for status, label in Application.STATUS_CHOICES]
+
+
+def create_rows(job_id):
+    """Zero rows for every status of a job; existing rows are left alone"""
+    company_id = Job.objects.filter(pk=job_id).values_list('company_id', flat=True).first()
+    if company_id is None:
+        return
+    ApplicationStatusCount.objects.bulk_create(
+        [ApplicationStatusCount(company_id=company_id, job_id=job_id, status=status) for status in STATUSES],
+        ignore_conflicts=True
+    )
+
+
+def adjust(job_ids, status, delta):
+    """Add `delta` to the `status` count of each job"""
+    job_ids = list(job_ids)
+    if not job_ids or not delta:
+        return
+    counts = ApplicationStatusCount.objects.filter(job_id__in=job_ids, status=status)
+    updated = counts.update(count=F('count') + delta)
+    # Only an increment can be the job's first application
+    if delta > 0 and updated < len(job_ids):
+        missing = set(job_ids) - set(counts.values_list('job_id', flat=True))
+        for job_id in missing:
+            create_rows(job_id)
+        counts.filter(job_id__in=missing).update(count=F('count') + delta)
+
+
+def add_counts(changes):
+    """Apply {(job_id, status): delta}, one UPDATE per status and amount"""
+    grouped = {}
+    for (job_id, status), delta in changes.items():
+        if delta:
+            grouped.setdefault((status, delta), []).append(job_id)
+    for (status, delta), job_ids in grouped.items():
+        adjust(job_ids, status, delta)
+
+
+def application_saved(application, old_status):
+    """Apply the change from `old_status` (None for a new application)"""
+    if old_status == application.status:
+        return
+    if old_status:
+        adjust([application.job_id], old_status, -1)
+    adjust([application.job_id], application.status, 1)
+
+
+def application_deleted(application):
+    adjust([application.job_id], application.status, -1)
+
+
+def statuses_moved(rows, new_status):
+    """Counts for (job_id, old_status) pairs that all moved to `new_status`"""
+    changes = Counter()
+    for job_id, old_status in rows:
+        changes[(job_id, old_status)] -= 1
+        changes[(job_id, new_status)] += 1
+    add_counts(changes)
+
+
+def status_counts(company=None, job=None):
+    """
+    {status: count} for a job or a whole company, every status present,
+    plus 'total'
+    """
+    counts = ApplicationStatusCount.objects.all()
+    if job is not None:
+        counts = counts.filter(job=job)
+    if company is not None:
+        counts = counts.filter(company=company)
+    result = dict.fromkeys(STATUSES, 0)
+    for status, count in counts.order_by().values('status').annotate(total=Sum('count')).values_list(
+        'status', 'total'
+    ):
+        result[status] = count
+    result['total'] = sum(result.values())
+    return result
+
+
+def queryset_status_counts(queryset):
+    """status_counts() for an arbitrary application queryset, in one GROUP BY"""
+    result = dict.fromkeys(STATUSES, 0)
+    result.update(queryset.order_by().values('status').annotate(total=Count('pk')).values_list('status', 'total'))
+    result['total'] = sum(result.values())
+    return result
+
+
+def job_totals(job_ids):
+    """{job_id: applications} for the given jobs"""
+    return dict(
+        ApplicationStatusCount.objects.filter(job_id__in=job_ids).order_by().values('job_id')
+        .annotate(total=Sum('count')).values_list('job_id', 'total')
+    )
+
+
+def live_counts():
+    """{(job_id, status): count} straight from the application table"""
+    return {
+        (row['job_id'], row['status']): row['total']
+        for row in Application.objects.order_by().values('job_id', 'status').annotate(total=Count('pk'))
+    }
+
+
+def recount_counters():
+    """Rebuild every count from the application table; returns the number of rows written"""
+    live = live_counts()
+    companies = dict(Job.objects.filter(
+        id__in={job_id for job_id, status in live}
+    ).values_list('id', 'company_id'))
+    with transaction.atomic():
+        ApplicationStatusCount.objects.all().delete()
+        ApplicationStatusCount.objects.bulk_create([
+            ApplicationStatusCount(company_id=companies[job_id], job_id=job_id, status=status, count=count)
+            for (job_id, status), count in live.items()
+        ], batch_size=1000)
+    return len(live)
+
+
+def counter_drift():
+    """[(job_id, status, stored, live)] for every count that differs from the live count"""
+    live = live_counts()
+    stored = {
+        (job_id, status): count
+        for job_id, status, count in ApplicationStatusCount.objects.values_list('job_id', 'status', 'count')
+    }
+    return [
+        (job_id, status, stored.get((job_id, status), 0), live.get((job_id, status), 0))
+        for job_id, status in sorted(set(live) | set(stored))
+        if stored.get((job_id, status), 0) != live.get((job_id, status), 0)
+    ]
@@ -1,5 +1,5 @@
 # applications/emails.py
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection, send_mail
 from django.conf import settings
 from datetime import datetime, timedelta
 
@@ -46,14 +46,10 @@ def get_next_monday():
         days_ahead += 7
     return today + timedelta(days=days_ahead)
 
-def send_application_status_email(application, old_status=None):
+def status_email_content(application):
     """
-    Send email when application status changes
+    Subject and message of the email for the application's current status
     """
-    if not application.email:
-        print(f"No email for application {application.id}")
-        return False
-    
     # Get company name and address
     company_name = "the company"
     company_address = ""
@@ -224,6 +220,18 @@ The Recruitment Team
 """
     })
     
+    return email_content
+
+def send_application_status_email(application, old_status=None):
+    """
+    Send email when application status changes
+    """
+    if not application.email:
+        print(f"No email for application {application.id}")
+        return False
+    
+    email_content = status_email_content(application)
+    
     print(f"Preparing to send email to: {application.email}")
     print(f"Status: {application.status}")
     
@@ -241,6 +249,32 @@ The Recruitment Team
         print(f"Error sending email to {application.email}: {e}")
         return False
 
+def send_status_emails(applications):
+    """
+    Status emails for many applications over one mail connection; returns how many were sent
+    """
+    emails = []
+    for application in applications:
+        if not application.email:
+            continue
+        content = status_email_content(application)
+        emails.append(EmailMessage(
+            subject=content['subject'],
+            body=content['message'],
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[application.email],
+        ))
+    
+    if not emails:
+        return 0
+    try:
+        sent = get_connection().send_messages(emails)
+        print(f"Sent {sent} status email(s)")
+        return sent or 0
+    except Exception as e:
+        print(f"Error sending status emails: {e}")
+        return 0
+
 def send_hired_details_email(application):
     """
     Send formal hired email with start date, time, and location
@@ -567,4 +601,45 @@ def test_time_conversion():
     print("="*30)
     for time_24h in test_times:
         time_12h = convert_to_12h_format(time_24h)
-        print(f"{time_24h} → {time_12h}")
\ No newline at end of file
+        print(f"{time_24h} → {time_12h}")
+
+def send_export_ready_email(export_job):
+    """
+    Tell the employer their background export can be downloaded
+    """
+    from django.urls import reverse
+    from django.utils import timezone
+    
+    user = export_job.requested_by
+    site_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
+    download_url = site_url + reverse('export_job_download', kwargs={'pk': export_job.pk})
+    
+    subject = f'Your export is ready: {export_job.filename}'
+    
+    message = f"""Hello {user.first_name or user.username},
+
+Your application export has finished.
+
+File: {export_job.filename}
+Rows: {export_job.processed_rows}
+
+Download it here: {download_url}
+
+The file will be available until {timezone.localtime(export_job.expires_at).strftime('%B %d, %Y %I:%M %p')}.
+
+JobBoard PH
+"""
+    
+    try:
+        send_mail(
+            subject=subject,
+            message=message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[user.email],
+            fail_silently=False,
+        )
+        print(f"Export ready email sent to {user.email}")
+        return True
+    except Exception as e:
+        print(f"Error sending export ready email to {user.email}: {e}")
+        return False
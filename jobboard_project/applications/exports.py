@@ -0,0 +1,261 @@
+# applications/exports.py
+"""
+Application exports that stream instead of building the file in memory.
+
+Rows come from one query with the job and applicant joined in and only the
+exported columns selected, read through a chunked iterator. CSV output is
+produced row by row into a StreamingHttpResponse, so memory stays flat and
+the first bytes go out before the last row is read. XLSX output is written
+by xlsxwriter in constant_memory mode (each row is flushed to disk as soon
+as the next one starts) into a temporary file that is then streamed back.
+
+Exports above EXPORT_SYNC_MAX_ROWS are not built in the request: an
+ExportJob is queued and run_export() writes the same file from a Celery
+worker, recording progress as it goes. The file is kept for
+EXPORT_FILE_TTL_HOURS and the employer is emailed when it is ready.
+"""
+import csv
+import io
+import logging
+import tempfile
+from datetime import timedelta
+
+import xlsxwriter
+from django.conf import settings
+from django.core.files import File
+from django.db.models.functions import Substr
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from .emails import send_export_ready_email
+from .models import Application, ExportJob
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 2000
+COVER_LETTER_PREVIEW = 100
+PROGRESS_EVERY = 1000
+
+HEADERS = [
+    'ID', 'Applicant Name', 'Email', 'Phone', 'Job Title',
+    'Applied Date', 'Status', 'Current Position', 'Skills',
+    'Education Level', 'Degree', 'University', 'Location',
+    'Expected Salary', 'Notice Period', 'Cover Letter'
+]
+
+# Column widths in characters, as the old .xls export set them (2000, 4000,
+# 8000 and 5000 in 1/256ths of a character)
+COLUMN_WIDTHS = {0: 7.8, 5: 15.6, 14: 15.6, 15: 31.25}
+DEFAULT_COLUMN_WIDTH = 19.5
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+EXPORT_FIELDS = [
+    'id', 'full_name', 'email', 'phone', 'applied_at', 'status', 'current_position', 'skills',
+    'education_level', 'degree', 'university', 'location', 'expected_salary', 'notice_period',
+    'job__id', 'job__title', 'applicant__id', 'applicant__username', 'applicant__email',
+]
+
+
+def export_queryset(queryset, full_cover_letter=False):
+    """
+    `queryset` narrowed to the exported columns with job and applicant joined.
+    Without `full_cover_letter` only the preview of the cover letter is read.
+    """
+    queryset = queryset.select_related('job', 'applicant').order_by('id')
+    if full_cover_letter:
+        return queryset.only(*EXPORT_FIELDS, 'cover_letter')
+    return queryset.only(*EXPORT_FIELDS).annotate(
+        cover_letter_preview=Substr('cover_letter', 1, COVER_LETTER_PREVIEW)
+    )
+
+
+def application_row(app, cover_letter):
+    return [
+        app.id,
+        app.full_name or f"{app.applicant.username}",
+        app.email or app.applicant.email,
+        app.phone or '',
+        app.job.title,
+        app.applied_at.strftime('%Y-%m-%d %H:%M:%S'),
+        app.get_status_display(),
+        app.current_position or '',
+        app.skills or '',
+        app.get_education_level_display() if app.education_level else '',
+        app.degree or '',
+        app.university or '',
+        app.location or '',
+        app.expected_salary or '',
+        app.notice_period or '',
+        cover_letter,
+    ]
+
+
+def application_rows(queryset, full_cover_letter=False):
+    """Export rows for `queryset`, one query however many rows there are"""
+    for app in export_queryset(queryset, full_cover_letter).iterator(chunk_size=CHUNK_SIZE):
+        if full_cover_letter:
+            cover_letter = app.cover_letter or ''
+        else:
+            cover_letter = (app.cover_letter_preview + '...') if app.cover_letter_preview else ''
+        yield application_row(app, cover_letter)
+
+
+def archived_application_rows(job):
+    """Export rows for the applications of an ArchivedJob, from their stored documents"""
+    education_levels = dict(Application.EDUCATION_LEVELS)
+    for app in job.applications.order_by('id').iterator(chunk_size=CHUNK_SIZE):
+        data = app.data
+        cover_letter = data.get('cover_letter') or ''
+        yield [
+            app.original_id,
+            app.full_name,
+            app.email,
+            data.get('phone') or '',
+            job.title,
+            app.applied_at.strftime('%Y-%m-%d %H:%M:%S'),
+            app.get_status_display(),
+            data.get('current_position') or '',
+            data.get('skills') or '',
+            education_levels.get(data.get('education_level'), ''),
+            data.get('degree') or '',
+            data.get('university') or '',
+            data.get('location') or '',
+            data.get('expected_salary') or '',
+            data.get('notice_period') or '',
+            (cover_letter[:COVER_LETTER_PREVIEW] + '...') if cover_letter else '',
+        ]
+
+
+class Echo:
+    """File-like object whose write() hands the line back to the generator"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(HEADERS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def csv_response(rows, filename):
+    response = StreamingHttpResponse(csv_lines(rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def write_csv(rows, output):
+    """Write HEADERS and `rows` as CSV to the binary file `output`"""
+    text = io.TextIOWrapper(output, encoding='utf-8', newline='')
+    text.writelines(csv_lines(rows))
+    text.flush()
+    text.detach()
+
+
+def write_xlsx(rows, output):
+    """Write HEADERS and `rows` as an .xlsx workbook to `output`, one row in memory at a time"""
+    workbook = xlsxwriter.Workbook(output, {
+        'constant_memory': True,
+        # Applicant-supplied text is data, never a formula or link
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+    })
+    worksheet = workbook.add_worksheet('Applications')
+    header_format = workbook.add_format({
+        'bold': True, 'text_wrap': True, 'valign': 'vcenter', 'align': 'center'
+    })
+
+    for col, header in enumerate(HEADERS):
+        worksheet.set_column(col, col, COLUMN_WIDTHS.get(col, DEFAULT_COLUMN_WIDTH))
+        worksheet.write(0, col, header, header_format)
+    for row_number, row in enumerate(rows, start=1):
+        worksheet.write_row(row_number, 0, row)
+
+    workbook.close()
+
+
+def xlsx_response(rows, filename):
+    """Write `rows` under HEADERS to a temporary .xlsx file and stream it back"""
+    output = tempfile.TemporaryFile(suffix='.xlsx')
+    write_xlsx(rows, output)
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
+
+
+def sync_max_rows():
+    return getattr(settings, 'EXPORT_SYNC_MAX_ROWS', 5000)
+
+
+def file_ttl():
+    return timedelta(hours=getattr(settings, 'EXPORT_FILE_TTL_HOURS', 24))
+
+
+def tracked(rows, export_job):
+    """Pass `rows` through, saving processed_rows every PROGRESS_EVERY rows"""
+    count = 0
+    for row in rows:
+        yield row
+        count += 1
+        if count % PROGRESS_EVERY == 0:
+            ExportJob.objects.filter(pk=export_job.pk).update(processed_rows=count)
+    export_job.processed_rows = count
+
+
+def run_export(export_job):
+    """Build the file for a queued ExportJob, store it and email the employer"""
+    export_job.status = 'RUNNING'
+    export_job.started_at = timezone.now()
+    applications = export_job.get_queryset()
+    export_job.total_rows = applications.count()
+    export_job.save(update_fields=['status', 'started_at', 'total_rows'])
+
+    is_xlsx = export_job.file_format == 'XLSX'
+    try:
+        rows = tracked(application_rows(applications, full_cover_letter=is_xlsx), export_job)
+        with tempfile.TemporaryFile() as output:
+            (write_xlsx if is_xlsx else write_csv)(rows, output)
+            output.seek(0)
+            export_job.file.save(export_job.filename, File(output), save=False)
+    except Exception as e:
+        logger.exception("Export %s failed", export_job.pk)
+        export_job.status = 'FAILED'
+        export_job.error = str(e)
+        export_job.finished_at = timezone.now()
+        export_job.save(update_fields=['status', 'error', 'finished_at'])
+        return export_job
+
+    export_job.status = 'READY'
+    export_job.finished_at = timezone.now()
+    export_job.expires_at = export_job.finished_at + file_ttl()
+    export_job.save(update_fields=['status', 'processed_rows', 'file', 'finished_at', 'expires_at'])
+    send_export_ready_email(export_job)
+    return export_job
+
+
+def queue_export(export_job):
+    """Hand a saved ExportJob to Celery; marks it FAILED if the broker refuses it"""
+    from .tasks import run_application_export
+    try:
+        run_application_export.delay(export_job.pk)
+    except Exception as e:
+        logger.exception("Could not queue export %s", export_job.pk)
+        export_job.status = 'FAILED'
+        export_job.error = f"Could not queue the export: {e}"
+        export_job.finished_at = timezone.now()
+        export_job.save(update_fields=['status', 'error', 'finished_at'])
+        return False
+    return True
+
+
+def expire_exports():
+    """Delete the files of exports past their expiry; returns how many were expired"""
+    expired = 0
+    for export_job in ExportJob.objects.filter(status='READY', expires_at__lt=timezone.now()).iterator():
+        if export_job.file:
+            export_job.file.delete(save=False)
+        export_job.status = 'EXPIRED'
+        export_job.save(update_fields=['status', 'file'])
+        expired += 1
+    return expired
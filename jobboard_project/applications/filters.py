@@ -0,0 +1,54 @@
+import django_filters
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+from jobs.models import Job
+from .models import Application
+
+def start_of_day(value):
+    return timezone.make_aware(datetime.combine(value, time.min))
+
+class ApplicationFilter(django_filters.FilterSet):
+    status = django_filters.ChoiceFilter(
+        field_name='status',
+        choices=Application.STATUS_CHOICES,
+        label='Status'
+    )
+    job = django_filters.ModelChoiceFilter(
+        field_name='job',
+        queryset=Job.objects.none(),
+        label='Job'
+    )
+    min_rating = django_filters.NumberFilter(
+        field_name='rating',
+        lookup_expr='gte',
+        label='Minimum Rating'
+    )
+    applied_from = django_filters.DateFilter(
+        method='filter_applied_from',
+        label='Applied From'
+    )
+    applied_to = django_filters.DateFilter(
+        method='filter_applied_to',
+        label='Applied To'
+    )
+    education_level = django_filters.ChoiceFilter(
+        field_name='education_level',
+        choices=Application.EDUCATION_LEVELS,
+        label='Education Level'
+    )
+    
+    class Meta:
+        model = Application
+        fields = ['status', 'job', 'min_rating', 'applied_from', 'applied_to', 'education_level']
+    
+    def __init__(self, *args, jobs=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if jobs is not None:
+            self.filters['job'].queryset = jobs
+    
+    # Date bounds as datetime ranges, so the applied_at indexes are used
+    def filter_applied_from(self, queryset, name, value):
+        return queryset.filter(applied_at__gte=start_of_day(value))
+    
+    def filter_applied_to(self, queryset, name, value):
+        return queryset.filter(applied_at__lt=start_of_day(value + timedelta(days=1)))
@@ -0,0 +1,118 @@
+# applications/inbox.py
+"""
+Keyset pagination for the application inbox.
+
+Each page is ordered by one of SORTS, which always ends in id so the order
+is total. A page does not use OFFSET. It starts after the sort values of the
+previous page's last row, which travel in a signed `after` cursor. Page 1000
+costs the same as page 1, and applications arriving in the meantime never
+shift rows between pages. NULLs are kept in the database's own position
+(connection.features.nulls_order_largest), so the ORDER BY stays a plain
+index scan on the composite indexes of Application.
+"""
+from functools import reduce
+from operator import or_
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Q
+
+from .models import Application
+
+PAGE_SIZE = 25
+CURSOR_SALT = 'applications.inbox'
+
+# name: (label, [(field, descending), ...])
+SORTS = {
+    'newest': ('Newest first', [('applied_at', True), ('id', True)]),
+    'oldest': ('Oldest first', [('applied_at', False), ('id', False)]),
+    'rating': ('Highest rating', [('rating', True), ('applied_at', True), ('id', True)]),
+    'salary_high': ('Highest expected salary', [('expected_salary', True), ('id', True)]),
+    'salary_low': ('Lowest expected salary', [('expected_salary', False), ('id', False)]),
+}
+DEFAULT_SORT = 'newest'
+
+
+class InboxPage:
+    def __init__(self, applications, next_cursor, sort):
+        self.applications = applications
+        self.next_cursor = next_cursor
+        self.sort = sort
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def sort_keys(sort):
+    return SORTS.get(sort, SORTS[DEFAULT_SORT])[1]
+
+
+def nulls_last(descending):
+    # Ascending puts NULLs last exactly when the backend sorts them as largest
+    return connection.features.nulls_order_largest != descending
+
+
+def encode_cursor(sort, application):
+    values = []
+    for field, descending in sort_keys(sort):
+        value = getattr(application, field)
+        values.append(None if value is None else str(value))
+    return signing.dumps(values, salt=f'{CURSOR_SALT}.{sort}', compress=True)
+
+
+def decode_cursor(sort, cursor):
+    """{field: value} from a cursor of this sort, or None if it is not valid"""
+    try:
+        values = signing.loads(cursor, salt=f'{CURSOR_SALT}.{sort}')
+    except signing.BadSignature:
+        return None
+    keys = sort_keys(sort)
+    if not isinstance(values, list) or len(values) != len(keys):
+        return None
+    try:
+        return {
+            field: None if value is None else Application._meta.get_field(field).to_python(value)
+            for (field, descending), value in zip(keys, values)
+        }
+    except ValidationError:
+        return None
+
+
+def after_condition(keys, values):
+    """Q for the rows that come after `values` in the order given by `keys`"""
+    terms = []
+    equal = Q()
+    for field, descending in keys:
+        value = values[field]
+        nullable = Application._meta.get_field(field).null
+        if value is None:
+            # Only non-NULL values can follow a NULL, and only when NULLs come first
+            if not nulls_last(descending):
+                terms.append(equal & Q(**{f'{field}__isnull': False}))
+            equal &= Q(**{f'{field}__isnull': True})
+            continue
+        after = Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+        if nullable and nulls_last(descending):
+            after |= Q(**{f'{field}__isnull': True})
+        terms.append(equal & after)
+        equal &= Q(**{field: value})
+    return reduce(or_, terms) if terms else Q(pk__in=[])
+
+
+def paginate(queryset, sort=DEFAULT_SORT, after=None, page_size=PAGE_SIZE):
+    """One InboxPage of `queryset`, starting after the `after` cursor"""
+    sort = sort if sort in SORTS else DEFAULT_SORT
+    keys = sort_keys(sort)
+    queryset = queryset.order_by(*[f"{'-' if descending else ''}{field}" for field, descending in keys])
+    values = decode_cursor(sort, after) if after else None
+    if values is not None:
+        queryset = queryset.filter(after_condition(keys, values))
+
+    applications = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(applications) > page_size:
+        applications = applications[:page_size]
+        next_cursor = encode_cursor(sort, applications[-1])
+    return InboxPage(applications, next_cursor, sort)
@@ -0,0 +1,21 @@
+# applications/management/commands/recount_application_counts.py
+from django.core.management.base import BaseCommand
+from applications.counters import counter_drift, recount_counters
+
+class Command(BaseCommand):
+    help = 'Repair the per-job application status counts'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only report counts that drifted')
+    
+    def handle(self, *args, **options):
+        drift = counter_drift()
+        for job_id, status, stored, live in drift:
+            self.stdout.write(f"⚠️ Job {job_id} {status}: stored {stored}, actual {live}")
+        
+        if options['check']:
+            self.stdout.write(f"🔍 {len(drift)} application count(s) drifted")
+            return
+        
+        rows = recount_counters()
+        self.stdout.write(f"🎉 Recounted {rows} job/status count(s); fixed {len(drift)}")
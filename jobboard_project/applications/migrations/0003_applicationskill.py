@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_initial'),
+        ('jobs', '0009_skill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='applications.application')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='jobs.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='canonical_skills',
+            field=models.ManyToManyField(blank=True, related_name='applications', through='applications.ApplicationSkill', to='jobs.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationskill',
+            index=models.Index(fields=['skill', 'application'], name='application_skill_i_0f3ebb_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='applicationskill',
+            unique_together={('application', 'skill')},
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_applications(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    ApplicationStatusCount = apps.get_model('applications', 'ApplicationStatusCount')
+    
+    rows = Application.objects.order_by().values('job', 'job__company', 'status').annotate(total=Count('id'))
+    ApplicationStatusCount.objects.bulk_create([
+        ApplicationStatusCount(
+            job_id=row['job'], company_id=row['job__company'], status=row['status'], count=row['total']
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_exportjob'),
+        ('companies', '0002_initial'),
+        ('jobs', '0013_archivedjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStatusCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending Review'), ('REVIEWED', 'Reviewed'), ('SHORTLISTED', 'Shortlisted'), ('INTERVIEW', 'Interview Scheduled'), ('OFFER', 'Offer Extended'), ('HIRED', 'Hired'), ('REJECTED', 'Rejected'), ('WITHDRAWN', 'Withdrawn')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_status_counts', to='companies.company')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_status_counts', to='jobs.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['company', 'status'], name='application_company_f9a261_idx')],
+                'unique_together': {('job', 'status')},
+            },
+        ),
+        migrations.RunPython(count_applications, migrations.RunPython.noop),
+    ]
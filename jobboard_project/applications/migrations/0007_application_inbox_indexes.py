@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_application_status_counts'),
+        ('jobs', '0013_archivedjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='application',
+            name='application_job_id_7836e3_idx',
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applied_at', 'id'], name='application_applied_471bab_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['rating', 'applied_at', 'id'], name='application_rating_018adf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['expected_salary', 'id'], name='application_expecte_6b05d2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'applied_at', 'id'], name='application_job_id_11becc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', 'applied_at', 'id'], name='application_job_id_e8e0f5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'rating', 'applied_at', 'id'], name='application_job_id_dec2b2_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0007_application_inbox_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedapplication',
+            name='original_id',
+            field=models.PositiveBigIntegerField(unique=True),
+        ),
+    ]
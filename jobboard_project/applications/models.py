@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from jobs.models import Job, ScreeningQuestion
+from jobs.models import ArchivedJob, Job, ScreeningQuestion, Skill
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
@@ -55,6 +57,7 @@ class Application(models.Model):
     current_position = models.CharField(max_length=200, default='Not specified')
     years_experience = models.CharField(max_length=50, default='Not specified')
     skills = models.TextField(default='Not specified', help_text="Comma-separated list of skills")
+    canonical_skills = models.ManyToManyField(Skill, through='ApplicationSkill', blank=True, related_name='applications')
     expected_salary = models.DecimalField(
         max_digits=10, 
         decimal_places=2, 
@@ -129,25 +132,77 @@ class Application(models.Model):
     class Meta:
         unique_together = ['job', 'applicant']
         ordering = ['-applied_at']
+        # Inbox filters and keyset sorts (applications.inbox); each sort ends in id
         indexes = [
             models.Index(fields=['status', 'applied_at']),
-            models.Index(fields=['job', 'status']),
+            models.Index(fields=['applied_at', 'id']),
+            models.Index(fields=['rating', 'applied_at', 'id']),
+            models.Index(fields=['expected_salary', 'id']),
+            models.Index(fields=['job', 'applied_at', 'id']),
+            models.Index(fields=['job', 'status', 'applied_at', 'id']),
+            models.Index(fields=['job', 'rating', 'applied_at', 'id']),
         ]
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+    
+    def tracked_values(self):
+        """Current value of every loaded (non-deferred) field, files by name"""
+        values = {}
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue
+            value = getattr(self, field.attname)
+            values[field.attname] = value.name if isinstance(field, models.FileField) else value
+        return values
+    
+    def remember_loaded_values(self):
+        """Snapshot the field values as stored, for get_dirty_fields()"""
+        self._loaded_values = self.tracked_values()
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        """Reload from the database and re-snapshot the reloaded fields"""
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        values = self.tracked_values()
+        if fields is None or not hasattr(self, '_loaded_values'):
+            self._loaded_values = values
+            return
+        # Deferred fields load through here too, one field at a time
+        for name in fields:
+            try:
+                attname = self._meta.get_field(name).attname
+            except FieldDoesNotExist:
+                continue
+            if attname in values:
+                self._loaded_values[attname] = values[attname]
+    
+    def get_dirty_fields(self):
+        """
+        Names of loaded fields changed since the row was read or last saved.
+        A field set while still deferred has no stored value to compare
+        with, so it counts as changed.
+        """
+        loaded = getattr(self, '_loaded_values', {})
+        return {
+            self._meta.get_field(attname).name
+            for attname, value in self.tracked_values().items()
+            if attname not in loaded or loaded[attname] != value
+        }
+    
+    def get_loaded_value(self, attname):
+        """Stored value of a field; only instances not read from the database need a query"""
+        loaded = getattr(self, '_loaded_values', {})
+        if attname in loaded:
+            return loaded[attname]
+        return Application.objects.filter(pk=self.pk).values_list(attname, flat=True).first()
+    
     def save(self, *args, **kwargs):
         """Auto-fill user information and track status changes"""
-        # Track status change
-        status_changed = False
-        old_status = None
-        
-        if self.pk:
-            try:
-                original = Application.objects.get(pk=self.pk)
-                old_status = original.status
-                if old_status != self.status:
-                    status_changed = True
-            except Application.DoesNotExist:
-                pass
+        is_new = self._state.adding or self.pk is None
+        old_status = None if is_new else self.get_loaded_value('status')
         
         # Auto-fill user information
         if not self.full_name or self.full_name == 'Not provided':
@@ -173,55 +228,59 @@ class Application(models.Model):
                 if not self.skills or self.skills == 'Not specified':
                     self.skills = profile.skills
         
+        # An existing row only writes the fields that changed, and nothing at all if none did
+        if not is_new and not args and kwargs.get('update_fields') is None and hasattr(self, '_loaded_values'):
+            dirty = self.get_dirty_fields()
+            if not dirty:
+                return
+            kwargs['update_fields'] = dirty | {'updated_at'}
+        
         # Save the application
         super().save(*args, **kwargs)
+        self.remember_loaded_values()
         
-        # Create status history after save (so we have access to the application instance)
-        if status_changed and old_status:
+        update_fields = kwargs.get('update_fields')
+        if is_new or (update_fields and 'skills' in update_fields):
+            from jobs.skills import sync_application_skills
+            sync_application_skills(self)
+        
+        # Status history and notification; update_status() supplies who/why
+        change = self.__dict__.pop('_status_change', None)
+        if old_status and old_status != self.status:
+            if change is None:
+                change = {'changed_by_id': self.job.company.employer_id}
             ApplicationStatusHistory.objects.create(
                 application=self,
                 old_status=old_status,
                 new_status=self.status,
-                changed_by=self.job.company.employer if hasattr(self.job, 'company') and hasattr(self.job.company, 'employer') else None,
-                notes=f"Status changed from {old_status} to {self.status}"
+                changed_by_id=change['changed_by_id'],
+                notes=change.get('notes') or f"Status changed from {old_status} to {self.status}"
             )
             
             # Send email notification when status changes
-            try:
-                from applications.emails import send_application_status_email
-                send_application_status_email(self, old_status)
-            except Exception as e:
-                print(f"Email sending failed: {e}")
-                # Continue even if email fails
+            if change.get('send_email', True):
+                try:
+                    from applications.emails import send_application_status_email
+                    send_application_status_email(self, old_status)
+                except Exception as e:
+                    print(f"Email sending failed: {e}")
+                    # Continue even if email fails
     
     def update_status(self, new_status, changed_by=None, notes=None, send_email=True):
-        """Helper method to update status and create history"""
+        """Change the status; save() writes the history record and sends the email"""
         old_status = self.status
         self.status = new_status
         
         # Set withdrawn timestamp if withdrawing
         if new_status == 'WITHDRAWN' and old_status != 'WITHDRAWN':
             self.withdrawn_at = timezone.now()
-            
-        self.save()
         
-        # Create detailed history record
-        if old_status != new_status:
-            ApplicationStatusHistory.objects.create(
-                application=self,
-                old_status=old_status,
-                new_status=new_status,
-                changed_by=changed_by,
-                notes=notes or f"Status changed from {old_status} to {new_status}"
-            )
-            
-            # Send email notification
-            if send_email:
-                try:
-                    from applications.emails import send_application_status_email
-                    send_application_status_email(self, old_status)
-                except Exception as e:
-                    print(f"Email sending failed: {e}")
+        self._status_change = {
+            'changed_by_id': changed_by.pk if changed_by else None,
+            'notes': notes or f"Status changed from {old_status} to {new_status}",
+            'send_email': send_email,
+        }
+        self.save()
     
     # DAGDAG NG FUNCTION PARA SA WITHDRAWAL
     def withdraw(self, reason=None, changed_by=None, send_email=True):
@@ -243,8 +302,8 @@ class Application(models.Model):
         return f"{self.full_name} - {self.job.title} ({self.status})"
     
     def get_skills_list(self):
-        """Return skills as a list"""
-        return [skill.strip() for skill in self.skills.split(',') if skill.strip()]
+        """Return skills as a list - prefetch_related('canonical_skills') to avoid a query"""
+        return [skill.name for skill in self.canonical_skills.all()]
     
     def get_formatted_salary(self):
         """Return formatted salary with currency"""
@@ -304,6 +363,16 @@ class Application(models.Model):
         }
         return icons.get(self.status, 'bi-clock')
 
+class ApplicationSkill(models.Model):
+    application = models.ForeignKey(Application, on_delete=models.CASCADE)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
+    
+    class Meta:
+        unique_together = ['application', 'skill']
+        indexes = [
+            models.Index(fields=['skill', 'application']),
+        ]
+
 class ScreeningResponse(models.Model):
     application = models.ForeignKey(
         Application, 
@@ -380,6 +449,27 @@ class ApplicationStatusHistory(models.Model):
             return 'WITHDRAWN'
         return 'STATUS_CHANGE'
     
+
+class ApplicationStatusCount(models.Model):
+    """Number of applications per job and status, kept up to date by applications.counters"""
+    company = models.ForeignKey(
+        'companies.Company',
+        on_delete=models.CASCADE,
+        related_name='application_status_counts'
+    )
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='application_status_counts')
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['job', 'status']
+        indexes = [
+            models.Index(fields=['company', 'status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} {self.status}: {self.count}"
+
  # applications/models.py - add this after ApplicationStatusHistory
 class Interview(models.Model):
     """Simplified interview scheduling - date, time, location only"""
@@ -419,4 +509,116 @@ class Interview(models.Model):
     def is_upcoming(self):
         """Check if interview is upcoming"""
         from django.utils import timezone
-        return self.full_datetime > timezone.now()
\ No newline at end of file
+        return self.full_datetime > timezone.now()
+
+
+class ArchivedApplication(models.Model):
+    """
+    Read-only copy of an application to an archived job (see jobs.archive).
+    Remaining fields, screening responses, status history, notes,
+    interviews and events are kept in `data`.
+    """
+    original_id = models.PositiveBigIntegerField(unique=True)
+    job = models.ForeignKey(ArchivedJob, on_delete=models.CASCADE, related_name='applications')
+    applicant = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='archived_applications'
+    )
+    full_name = models.CharField(max_length=200)
+    email = models.EmailField()
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    applied_at = models.DateTimeField()
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    
+    class Meta:
+        ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['job', '-applied_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.full_name} - {self.job.title} (archived)"
+
+
+class ExportJob(models.Model):
+    """Application export generated in the background by applications.tasks"""
+    FORMAT_CHOICES = [
+        ('CSV', 'CSV'),
+        ('XLSX', 'Excel (.xlsx)'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Queued'),
+        ('RUNNING', 'In Progress'),
+        ('READY', 'Ready'),
+        ('FAILED', 'Failed'),
+        ('EXPIRED', 'Expired'),
+    ]
+    
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+    company = models.ForeignKey('companies.Company', on_delete=models.CASCADE, related_name='export_jobs')
+    # One job's applications, otherwise the whole company's
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    selected_ids = models.JSONField(default=list, blank=True)
+    file_format = models.CharField(max_length=4, choices=FORMAT_CHOICES, default='CSV')
+    
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    filename = models.CharField(max_length=255)
+    file = models.FileField(upload_to='exports/%Y/%m/%d/', blank=True)
+    error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.filename} ({self.get_status_display()})"
+    
+    def get_queryset(self):
+        """The applications this export covers"""
+        applications = Application.objects.filter(job__company_id=self.company_id)
+        if self.job_id:
+            applications = applications.filter(job_id=self.job_id)
+        if self.selected_ids:
+            applications = applications.filter(id__in=self.selected_ids)
+        return applications
+    
+    def default_filename(self):
+        extension = self.file_format.lower()
+        stamp = timezone.now().strftime('%Y%m%d_%H%M')
+        if self.selected_ids:
+            return f"selected_applications_{stamp}.{extension}"
+        if self.job_id:
+            return f"applications_{self.job.slug}.{extension}"
+        return f"all_applications_{stamp}.{extension}"
+    
+    @property
+    def progress(self):
+        """Percent of rows written"""
+        if self.status == 'READY':
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(100, self.processed_rows * 100 // self.total_rows)
+    
+    @property
+    def is_finished(self):
+        return self.status in ('READY', 'FAILED', 'EXPIRED')
+    
+    @property
+    def is_downloadable(self):
+        return self.status == 'READY' and bool(self.file) and (
+            self.expires_at is None or self.expires_at > timezone.now()
+        )
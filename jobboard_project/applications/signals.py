@@ -0,0 +1,26 @@
+# applications/signals.py
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from companies.models import Company
+from jobs.models import Job
+from . import counters
+from .models import Application
+
+@receiver(pre_save, sender=Application)
+def remember_application_status(sender, instance, **kwargs):
+    # From the load-time snapshot, so no query for rows read from the database
+    instance._counter_old_status = None if instance._state.adding else instance.get_loaded_value('status')
+
+@receiver(post_save, sender=Application)
+def update_application_counts(sender, instance, update_fields=None, **kwargs):
+    """Move the application between status counts (same transaction as the save)"""
+    if update_fields is not None and 'status' not in update_fields:
+        return
+    counters.application_saved(instance, getattr(instance, '_counter_old_status', None))
+
+@receiver(post_delete, sender=Application)
+def update_deleted_application_counts(sender, instance, origin=None, **kwargs):
+    # Deleting a job or company cascades to its counts as well as its applications
+    if isinstance(origin, (Job, Company)) or getattr(origin, 'model', None) in (Job, Company):
+        return
+    counters.application_deleted(instance)
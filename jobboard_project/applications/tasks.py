@@ -0,0 +1,33 @@
+from celery import shared_task
+from . import emails
+from .exports import expire_exports, run_export
+from .models import Application, ExportJob
+
+@shared_task
+def run_application_export(export_id):
+    """
+    Build a queued application export in the background
+    """
+    export_job = ExportJob.objects.filter(pk=export_id, status='PENDING').select_related('job').first()
+    if export_job is None:
+        return f"Export {export_id} is not queued"
+    
+    export_job = run_export(export_job)
+    return f"Export {export_id}: {export_job.status} ({export_job.processed_rows} rows)"
+
+@shared_task
+def expire_application_exports():
+    """
+    Delete export files past their expiry
+    """
+    expired = expire_exports()
+    return f"Expired {expired} export file(s)"
+
+@shared_task
+def send_application_status_emails(application_ids):
+    """
+    Status emails for a batch of applications moved by applications.transitions
+    """
+    applications = Application.objects.filter(id__in=application_ids).select_related('job__company')
+    sent = emails.send_status_emails(applications)
+    return f"Sent {sent} of {len(application_ids)} status email(s)"
@@ -1,3 +1,112 @@
+from datetime import date, time, timedelta
+
 from django.test import TestCase
+from django.urls import reverse
+
+from analytics.models import ApplicationEvent
+from companies.models import Company
+from jobs.models import Job, ScreeningQuestion
+from users.models import CustomUser
+from .models import Application, ApplicationNote, ApplicationStatusHistory, Interview, ScreeningResponse
+
+# Session, user, the application with its job, company and applicant, and one
+# query each for history, notes, interviews, screening responses and events
+DETAIL_QUERY_BUDGET = 8
+
+
+class ApplicationDetailQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = CustomUser.objects.create_user('employer', 'employer@example.com', 'pw', role='EMPLOYER')
+        cls.seeker = CustomUser.objects.create_user('seeker', 'seeker@example.com', 'pw', role='JOB_SEEKER')
+        company = Company.objects.create(
+            employer=cls.employer, name='Acme', description='Acme Inc.', location='Manila', address='Makati'
+        )
+        cls.job = Job.objects.create(
+            company=company, title='Python Developer', description='Build things', requirements='Python',
+            location='Manila', employment_type='FULL_TIME'
+        )
+        cls.application = Application.objects.create(
+            job=cls.job, applicant=cls.seeker, cover_letter='Hello', resume='resumes/cv.pdf'
+        )
+
+    def add_related_rows(self, count):
+        """`count` more rows of every kind the detail page shows"""
+        start = ScreeningQuestion.objects.filter(job=self.job).count()
+        for i in range(start, start + count):
+            question = ScreeningQuestion.objects.create(job=self.job, question=f'Question {i}', order=i)
+            ScreeningResponse.objects.create(application=self.application, question=question, answer='Yes')
+            ApplicationStatusHistory.objects.create(
+                application=self.application, old_status='PENDING', new_status='REVIEWED', changed_by=self.employer
+            )
+            ApplicationNote.objects.create(application=self.application, author=self.employer, note=f'Note {i}')
+            Interview.objects.create(
+                application=self.application, interview_date=date.today() + timedelta(days=i),
+                interview_time=time(9), location='Main Office', scheduled_by=self.employer
+            )
+            ApplicationEvent.objects.create(application=self.application, event_type='VIEWED', performed_by=self.employer)
+
+    def get_detail(self, user):
+        self.client.force_login(user)
+        with self.assertNumQueries(DETAIL_QUERY_BUDGET):
+            response = self.client.get(reverse('application_detail', args=[self.application.pk]))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_employer_detail_query_count_does_not_grow(self):
+        self.add_related_rows(1)
+        self.get_detail(self.employer)
+
+        self.add_related_rows(25)
+        response = self.get_detail(self.employer)
+        self.assertEqual(len(response.context['status_history']), 26)
+        self.assertEqual(len(response.context['notes']), 26)
+        self.assertContains(response, 'Question 25')
+
+    def test_applicant_detail_query_count_does_not_grow(self):
+        self.add_related_rows(25)
+        response = self.get_detail(self.seeker)
+        self.assertNotIn('notes', response.context)
+        self.assertEqual(response.context['interview'].interview_date, date.today())
+
+
+class ApplicationDirtyFieldTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = CustomUser.objects.create_user('employer', 'employer@example.com', 'pw', role='EMPLOYER')
+        seeker = CustomUser.objects.create_user('seeker', 'seeker@example.com', 'pw', role='JOB_SEEKER')
+        company = Company.objects.create(
+            employer=employer, name='Acme', description='Acme Inc.', location='Manila', address='Makati'
+        )
+        job = Job.objects.create(
+            company=company, title='Python Developer', description='Build things', requirements='Python',
+            location='Manila', employment_type='FULL_TIME'
+        )
+        cls.application = Application.objects.create(
+            job=job, applicant=seeker, cover_letter='Hello', resume='resumes/cv.pdf'
+        )
+
+    def test_refresh_from_db_updates_the_snapshot(self):
+        from .transitions import bulk_transition
+        application = Application.objects.get(pk=self.application.pk)
+        bulk_transition(Application.objects.filter(pk=application.pk), 'REJECTED')
+        application.refresh_from_db()
+
+        application.rating = 3
+        application.save()
+        self.assertEqual(
+            ApplicationStatusHistory.objects.filter(application=application, new_status='REJECTED').count(), 1
+        )
+
+    def test_deferred_field_set_before_loading_is_saved(self):
+        application = Application.objects.only('id', 'status', 'applicant', 'job').get(pk=self.application.pk)
+        application.cover_letter = 'Changed'
+        application.save()
+        self.assertEqual(Application.objects.get(pk=application.pk).cover_letter, 'Changed')
 
-# Create your tests here.
+    def test_deferred_field_loaded_later_is_tracked(self):
+        application = Application.objects.only('id', 'status', 'applicant', 'job').get(pk=self.application.pk)
+        self.assertEqual(application.cover_letter, 'Hello')
+        application.cover_letter = 'Changed again'
+        application.save()
+        self.assertEqual(Application.objects.get(pk=application.pk).cover_letter, 'Changed again')
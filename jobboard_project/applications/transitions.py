@@ -0,0 +1,111 @@
+# applications/transitions.py
+"""
+Set-based status transitions for many applications at once.
+
+The selected rows are locked and read once, applications whose current
+status may not move to the target are skipped, and the rest are moved
+with a single UPDATE. One ApplicationStatusHistory row per moved
+application is bulk-inserted, the per-job status counts are moved with a
+few grouped UPDATEs, and status emails are handed to Celery in batches
+after the transaction commits, so the request never waits on SMTP.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import counters
+from .models import Application, ApplicationStatusHistory
+
+logger = logging.getLogger(__name__)
+
+EMAIL_BATCH_SIZE = 100
+
+# Where an employer may move an application from each status. HIRED is
+# final, REJECTED can be reconsidered, and only the applicant can reactivate
+# a WITHDRAWN application (ApplicationReactivateView).
+ALLOWED_TRANSITIONS = {
+    'PENDING': {'REVIEWED', 'SHORTLISTED', 'INTERVIEW', 'OFFER', 'REJECTED', 'WITHDRAWN'},
+    'REVIEWED': {'SHORTLISTED', 'INTERVIEW', 'OFFER', 'REJECTED', 'WITHDRAWN'},
+    'SHORTLISTED': {'REVIEWED', 'INTERVIEW', 'OFFER', 'REJECTED', 'WITHDRAWN'},
+    'INTERVIEW': {'SHORTLISTED', 'OFFER', 'HIRED', 'REJECTED', 'WITHDRAWN'},
+    'OFFER': {'INTERVIEW', 'HIRED', 'REJECTED', 'WITHDRAWN'},
+    'HIRED': set(),
+    'REJECTED': {'REVIEWED', 'SHORTLISTED'},
+    'WITHDRAWN': set(),
+}
+
+
+def can_transition(old_status, new_status):
+    return new_status in ALLOWED_TRANSITIONS.get(old_status, set())
+
+
+class TransitionResult:
+    def __init__(self):
+        self.updated = 0
+        self.skipped = 0
+        self.emails_queued = 0
+        self.updated_ids = []
+
+
+def queue_status_emails(application_ids):
+    """Hand the emails to Celery in batches; returns how many were queued"""
+    from .tasks import send_application_status_emails
+    queued = 0
+    for start in range(0, len(application_ids), EMAIL_BATCH_SIZE):
+        batch = application_ids[start:start + EMAIL_BATCH_SIZE]
+        try:
+            send_application_status_emails.delay(batch)
+        except Exception:
+            # The status change is already committed; a broker outage only costs the emails
+            logger.exception("Could not queue status emails for %s application(s)", len(batch))
+            continue
+        queued += len(batch)
+    return queued
+
+
+def bulk_transition(applications, new_status, changed_by=None, notes=None, send_email=False):
+    """
+    Move every application in the `applications` queryset that may go to
+    `new_status`; returns a TransitionResult.
+    """
+    result = TransitionResult()
+    with transaction.atomic():
+        rows = list(applications.select_for_update().order_by('id').values_list('id', 'status', 'job_id'))
+        movable = [row for row in rows if can_transition(row[1], new_status)]
+        result.skipped = len(rows) - len(movable)
+        if not movable:
+            return result
+
+        now = timezone.now()
+        changes = {'status': new_status, 'updated_at': now}
+        if new_status == 'WITHDRAWN':
+            changes['withdrawn_at'] = now
+        # First review time is kept
+        changes['reviewed_at'] = Coalesce('reviewed_at', Value(now))
+
+        result.updated_ids = [pk for pk, old_status, job_id in movable]
+        result.updated = Application.objects.filter(id__in=result.updated_ids).update(**changes)
+
+        ApplicationStatusHistory.objects.bulk_create([
+            ApplicationStatusHistory(
+                application_id=pk,
+                old_status=old_status,
+                new_status=new_status,
+                changed_by=changed_by,
+                notes=notes or f"Status changed from {old_status} to {new_status}"
+            )
+            for pk, old_status, job_id in movable
+        ], batch_size=500)
+        counters.statuses_moved([(job_id, old_status) for pk, old_status, job_id in movable], new_status)
+
+        if send_email:
+            ids = list(result.updated_ids)
+
+            def queue_emails():
+                result.emails_queued = queue_status_emails(ids)
+            transaction.on_commit(queue_emails)
+
+    return result
@@ -37,6 +37,14 @@ urlpatterns = [
     path('job/<slug:job_slug>/export/csv/', views.export_applications_csv, name='export_job_applications_csv'),
     path('job/<slug:job_slug>/export/excel/', views.export_applications_excel, name='export_job_applications_excel'),
     
+    # Background exports
+    path('exports/<int:pk>/', views.ExportJobDetailView.as_view(), name='export_job_detail'),
+    path('exports/<int:pk>/status/', views.export_job_status, name='export_job_status'),
+    path('exports/<int:pk>/download/', views.export_job_download, name='export_job_download'),
+    
+    # Export applications for an archived job
+    path('archived/<int:pk>/export/csv/', views.export_archived_applications_csv, name='export_archived_applications_csv'),
+    
     # ============ BULK ACTIONS ============
     path('bulk-update/', views.bulk_update_applications, name='bulk_update_applications'),
 ]
\ No newline at end of file
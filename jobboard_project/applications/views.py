@@ -3,21 +3,27 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import ListView, DetailView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.views import View
-from django.http import JsonResponse, HttpResponse
+from django.http import FileResponse, JsonResponse, HttpResponse
 from django.utils import timezone
 from django.views.decorators.http import require_POST
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.db import transaction
+from django.db.models import Prefetch
 import json
-import csv
-import xlwt
 from datetime import datetime
+from . import exports
 from .forms import SimpleInterviewForm, ApplicationStatusForm
-from .models import Application, Interview, ApplicationStatusHistory
-from jobs.models import Job
+from .models import Application, ApplicationNote, ApplicationStatusHistory, ExportJob, Interview, ScreeningResponse
+from . import inbox
+from .counters import queryset_status_counts, status_counts
+from .filters import ApplicationFilter
+from .transitions import TransitionResult, bulk_transition
+from analytics.models import ApplicationEvent
+from jobs.models import ArchivedJob, Job
+from jobs.trending import record_application
 from users.views import JobSeekerRequiredMixin, EmployerRequiredMixin
 from .forms import ApplicationForm
 from django.core.exceptions import PermissionDenied
@@ -29,36 +35,59 @@ class ApplicationListView(LoginRequiredMixin, ListView):
     
     def get_queryset(self):
         job_id = self.kwargs.get('job_id')
+        jobs = Job.objects.none()
         
         if job_id:
             queryset = Application.objects.filter(job_id=job_id)
+            jobs = Job.objects.filter(id=job_id)
         else:
             if self.request.user.is_job_seeker():
                 queryset = Application.objects.filter(applicant=self.request.user)
+                jobs = Job.objects.filter(applications__applicant=self.request.user)
             elif self.request.user.is_employer():
                 from companies.models import Company
                 try:
-                    company = Company.objects.get(employer=self.request.user)
-                    queryset = Application.objects.filter(job__company=company)
+                    self.company = Company.objects.get(employer=self.request.user)
+                    queryset = Application.objects.filter(job__company=self.company)
+                    jobs = Job.objects.filter(company=self.company)
                 except Company.DoesNotExist:
                     queryset = Application.objects.none()
             else:
                 queryset = Application.objects.none()
         
-        return queryset.select_related('applicant', 'job')
+        # Filtering happens in the database; the page is cut by inbox.paginate()
+        self.filterset = ApplicationFilter(
+            self.request.GET, queryset=queryset, jobs=jobs.only('id', 'title').order_by('title')
+        )
+        return self.filterset.qs.select_related('applicant', 'job')
     
     def get_context_data(self, **kwargs):
+        page = inbox.paginate(self.object_list, self.request.GET.get('sort'), self.request.GET.get('after'))
+        kwargs['object_list'] = page.applications
         context = super().get_context_data(**kwargs)
         job_id = self.kwargs.get('job_id')
         
+        context['page'] = page
+        context['filter'] = self.filterset
+        context['sorts'] = [(name, label) for name, (label, keys) in inbox.SORTS.items()]
+        context['is_filtered'] = any(
+            self.request.GET.get(name) for name in list(self.filterset.filters) + ['after']
+        )
+        
+        # Header counts: one read of the maintained counts for a job or company
         if job_id:
             context['job'] = get_object_or_404(Job, id=job_id)
+            counts = status_counts(job=context['job'])
+        elif getattr(self, 'company', None):
+            counts = status_counts(company=self.company)
+        else:
+            counts = queryset_status_counts(self.filterset.queryset)
         
-        queryset = self.get_queryset()
-        context['total_applications'] = queryset.count()
-        context['new_applications'] = queryset.filter(status='RECEIVED').count()
-        context['shortlisted_count'] = queryset.filter(status='SHORTLISTED').count()
-        context['hired_count'] = queryset.filter(status='HIRED').count()
+        context['status_counts'] = counts
+        context['total_applications'] = counts['total']
+        context['new_applications'] = counts['PENDING']
+        context['shortlisted_count'] = counts['SHORTLISTED']
+        context['hired_count'] = counts['HIRED']
         
         return context
 
@@ -144,6 +173,7 @@ class ApplicationCreateView(View):
                     application.university = 'Not specified'
                 
                 application.save()
+                record_application(job.id)
                 
                 # Send application confirmation email
                 try:
@@ -199,29 +229,46 @@ class ApplicationDetailView(LoginRequiredMixin, DetailView):
     
     def get_queryset(self):
         if self.request.user.is_job_seeker():
-            return Application.objects.filter(applicant=self.request.user)
+            queryset = Application.objects.filter(applicant=self.request.user)
         elif self.request.user.is_employer():
-            from companies.models import Company
-            try:
-                company = Company.objects.get(employer=self.request.user)
-                return Application.objects.filter(job__company=company)
-            except Company.DoesNotExist:
-                return Application.objects.none()
-        return Application.objects.none()
+            queryset = Application.objects.filter(job__company__employer=self.request.user)
+        else:
+            return Application.objects.none()
+        
+        # Everything the page shows, in a fixed number of queries however long the history is
+        return queryset.select_related('job__company', 'applicant', 'referred_by').prefetch_related(
+            Prefetch(
+                'status_history',
+                queryset=ApplicationStatusHistory.objects.select_related('changed_by').order_by('-changed_at')
+            ),
+            Prefetch('notes', queryset=ApplicationNote.objects.select_related('author').order_by('-created_at')),
+            Prefetch('interviews', queryset=Interview.objects.order_by('interview_date', 'interview_time')),
+            Prefetch(
+                'screening_responses',
+                queryset=ScreeningResponse.objects.select_related('question').order_by('question__order', 'id')
+            ),
+            Prefetch('events', queryset=ApplicationEvent.objects.select_related('performed_by').order_by('-created_at')),
+        )
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['applicant_user'] = self.object.applicant
-        context['can_withdraw'] = self.object.can_withdraw
+        application = self.object
+        context['applicant_user'] = application.applicant
+        context['can_withdraw'] = application.can_withdraw
+        context['responses'] = application.screening_responses.all()
+        context['events'] = application.events.all()
+        context['status_history'] = application.status_history.all()
         
         # Get upcoming interview if any
-        context['interview'] = self.object.interviews.filter(
-            interview_date__gte=timezone.now().date()
-        ).first()
+        today = timezone.now().date()
+        context['interview'] = next(
+            (interview for interview in application.interviews.all() if interview.interview_date >= today), None
+        )
         
         # Check if employer can schedule interview
         if self.request.user.is_employer():
-            context['can_schedule_interview'] = self.object.status in ['SHORTLISTED', 'REVIEWED', 'PENDING']
+            context['can_schedule_interview'] = application.status in ['SHORTLISTED', 'REVIEWED', 'PENDING']
+            context['notes'] = application.notes.all()
         
         return context
 
@@ -356,27 +403,9 @@ class ApplicationReactivateView(JobSeekerRequiredMixin, View):
             return redirect('application_detail', pk=application.pk)
         
         # Reactivate application (set back to PENDING)
-        old_status = application.status
-        application.status = 'PENDING'
         application.withdraw_reason = None
         application.withdrawn_at = None
-        application.save()
-        
-        # Create status history
-        ApplicationStatusHistory.objects.create(
-            application=application,
-            old_status=old_status,
-            new_status='PENDING',
-            changed_by=request.user,
-            notes='Application reactivated by applicant'
-        )
-        
-        # Send reactivation email
-        try:
-            from .emails import send_application_status_email
-            send_application_status_email(application, old_status)
-        except Exception as e:
-            print(f"Email sending failed: {e}")
+        application.update_status('PENDING', changed_by=request.user, notes='Application reactivated by applicant')
         
         messages.success(request, 'Application reactivated successfully.')
         return redirect('application_detail', pk=application.pk)
@@ -504,20 +533,13 @@ class ApplicationStatusUpdateView(EmployerRequiredMixin, View):
                 application.hire_location = "Main Office - HR Department"  # Default location
                 application.hire_instructions = "Please arrive by 8:00 AM. Bring original documents and ask for HR at reception."
                 application.hired_at = timezone.now()
-                application.save()
                 
                 # Update application status to HIRED (but don't send basic email)
-                old_status = application.status
-                application.status = 'HIRED'
-                application.save()
-                
-                # Create status history
-                ApplicationStatusHistory.objects.create(
-                    application=application,
-                    old_status=old_status,
-                    new_status='HIRED',
+                application.update_status(
+                    'HIRED',
                     changed_by=request.user,
-                    notes=f"Hired! Auto-scheduled start date: Monday, {next_monday.strftime('%B %d, %Y')}"
+                    notes=f"Hired! Auto-scheduled start date: Monday, {next_monday.strftime('%B %d, %Y')}",
+                    send_email=False
                 )
                 
                 # Send detailed hired email if requested
@@ -557,142 +579,109 @@ class ApplicationStatusUpdateView(EmployerRequiredMixin, View):
 
 # =================== EXPORT FUNCTIONS ===================
 
+def parse_selected_ids(value):
+    """Ids from the comma-separated `selected` parameter, or None if any of them is not an id"""
+    ids = []
+    for pk in value.split(','):
+        pk = pk.strip()
+        if not pk:
+            continue
+        if not pk.isdigit():
+            return None
+        ids.append(int(pk))
+    return ids
+
+def export_job_for(request, job_slug, file_format, selected_ids):
+    """Unsaved ExportJob for what the employer asked to export, or None without a company"""
+    from companies.models import Company
+    try:
+        company = Company.objects.get(employer=request.user)
+    except Company.DoesNotExist:
+        return None
+    
+    job = get_object_or_404(Job, slug=job_slug, company=company) if job_slug else None
+    
+    export_job = ExportJob(
+        requested_by=request.user,
+        company=company,
+        job=job,
+        selected_ids=selected_ids,
+        file_format=file_format
+    )
+    export_job.filename = export_job.default_filename()
+    return export_job
+
+def export_applications(request, job_slug, file_format):
+    """Small exports are streamed straight back; big ones are queued as an ExportJob"""
+    # Check if specific applications are selected; a bad selection must not widen to everything
+    selected = request.GET.get('selected', '')
+    selected_ids = parse_selected_ids(selected)
+    if selected.strip() and not selected_ids:
+        return HttpResponse("Invalid application selection", status=400)
+    
+    export_job = export_job_for(request, job_slug, file_format, selected_ids)
+    if export_job is None:
+        return HttpResponse("Company not found", status=404)
+    
+    applications = export_job.get_queryset()
+    if applications.count() <= exports.sync_max_rows():
+        if file_format == 'XLSX':
+            return exports.xlsx_response(
+                exports.application_rows(applications, full_cover_letter=True), export_job.filename
+            )
+        return exports.csv_response(exports.application_rows(applications), export_job.filename)
+    
+    export_job.save()
+    transaction.on_commit(lambda: exports.queue_export(export_job))
+    messages.info(request, "This export is large, so it is being prepared in the background. We'll email you when it is ready.")
+    return redirect('export_job_detail', pk=export_job.pk)
+
 @login_required
 def export_applications_csv(request, job_slug=None):
     """Export applications to CSV"""
-    if job_slug:
-        job = get_object_or_404(Job, slug=job_slug, company=request.user.company)
-        base_query = job.applications.all()
-        filename = f"applications_{job.slug}.csv"
-    else:
-        from companies.models import Company
-        try:
-            company = Company.objects.get(employer=request.user)
-            base_query = Application.objects.filter(job__company=company)
-            filename = f"all_applications_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
-        except Company.DoesNotExist:
-            return HttpResponse("Company not found", status=404)
-    
-    # Check if specific applications are selected
-    selected_ids = request.GET.get('selected', '').split(',')
-    if selected_ids and selected_ids[0]:
-        applications = base_query.filter(id__in=selected_ids)
-        filename = f"selected_applications_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
-    else:
-        applications = base_query
-    
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    
-    writer = csv.writer(response)
-    
-    # Write headers
-    writer.writerow([
-        'ID', 'Applicant Name', 'Email', 'Phone', 'Job Title',
-        'Applied Date', 'Status', 'Current Position', 'Skills',
-        'Education Level', 'Degree', 'University', 'Location',
-        'Expected Salary', 'Notice Period', 'Cover Letter'
-    ])
-    
-    # Write data
-    for app in applications:
-        writer.writerow([
-            app.id,
-            app.full_name or f"{app.applicant.username}",
-            app.email or app.applicant.email,
-            app.phone or '',
-            app.job.title,
-            app.applied_at.strftime('%Y-%m-%d %H:%M:%S'),
-            app.get_status_display(),
-            app.current_position or '',
-            app.skills or '',
-            app.get_education_level_display() if app.education_level else '',
-            app.degree or '',
-            app.university or '',
-            app.location or '',
-            app.expected_salary or '',
-            app.notice_period or '',
-            (app.cover_letter[:100] + '...') if app.cover_letter else ''
-        ])
-    
-    return response
+    return export_applications(request, job_slug, 'CSV')
 
 @login_required
 def export_applications_excel(request, job_slug=None):
-    """Export applications to Excel"""
-    if job_slug:
-        job = get_object_or_404(Job, slug=job_slug, company=request.user.company)
-        base_query = job.applications.all()
-        filename = f"applications_{job.slug}.xls"
-    else:
-        from companies.models import Company
-        try:
-            company = Company.objects.get(employer=request.user)
-            base_query = Application.objects.filter(job__company=company)
-            filename = f"all_applications_{datetime.now().strftime('%Y%m%d_%H%M')}.xls"
-        except Company.DoesNotExist:
-            return HttpResponse("Company not found", status=404)
-    
-    # Check if specific applications are selected
-    selected_ids = request.GET.get('selected', '').split(',')
-    if selected_ids and selected_ids[0]:
-        applications = base_query.filter(id__in=selected_ids)
-        filename = f"selected_applications_{datetime.now().strftime('%Y%m%d_%H%M')}.xls"
-    else:
-        applications = base_query
-    
-    response = HttpResponse(content_type='application/ms-excel')
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    
-    wb = xlwt.Workbook(encoding='utf-8')
-    ws = wb.add_sheet('Applications')
-    
-    # Header style
-    header_style = xlwt.easyxf(
-        'font: bold on; align: wrap on, vert centre, horiz center'
-    )
-    
-    # Column headers
-    headers = [
-        'ID', 'Applicant Name', 'Email', 'Phone', 'Job Title',
-        'Applied Date', 'Status', 'Current Position', 'Skills',
-        'Education Level', 'Degree', 'University', 'Location',
-        'Expected Salary', 'Notice Period', 'Cover Letter'
-    ]
-    
-    for col, header in enumerate(headers):
-        ws.write(0, col, header, header_style)
-        # Set column widths
-        if col in [0]:  # ID
-            ws.col(col).width = 2000
-        elif col in [5, 14]:  # Applied Date, Notice Period
-            ws.col(col).width = 4000
-        elif col == 15:  # Cover Letter
-            ws.col(col).width = 8000
-        else:
-            ws.col(col).width = 5000
+    """Export applications to Excel (.xlsx)"""
+    return export_applications(request, job_slug, 'XLSX')
+
+class ExportJobDetailView(LoginRequiredMixin, DetailView):
+    """Progress page for a background export"""
+    template_name = 'applications/export_job.html'
+    context_object_name = 'export_job'
     
-    # Data rows
-    for row, app in enumerate(applications, start=1):
-        ws.write(row, 0, app.id)
-        ws.write(row, 1, app.full_name or f"{app.applicant.username}")
-        ws.write(row, 2, app.email or app.applicant.email)
-        ws.write(row, 3, app.phone or '')
-        ws.write(row, 4, app.job.title)
-        ws.write(row, 5, app.applied_at.strftime('%Y-%m-%d %H:%M:%S'))
-        ws.write(row, 6, app.get_status_display())
-        ws.write(row, 7, app.current_position or '')
-        ws.write(row, 8, app.skills or '')
-        ws.write(row, 9, app.get_education_level_display() if app.education_level else '')
-        ws.write(row, 10, app.degree or '')
-        ws.write(row, 11, app.university or '')
-        ws.write(row, 12, app.location or '')
-        ws.write(row, 13, app.expected_salary or '')
-        ws.write(row, 14, app.notice_period or '')
-        ws.write(row, 15, app.cover_letter or '')
+    def get_queryset(self):
+        return ExportJob.objects.filter(requested_by=self.request.user)
+
+@login_required
+def export_job_status(request, pk):
+    """Progress of a background export, polled by the progress page"""
+    export_job = get_object_or_404(ExportJob, pk=pk, requested_by=request.user)
+    return JsonResponse({
+        'status': export_job.status,
+        'status_display': export_job.get_status_display(),
+        'processed_rows': export_job.processed_rows,
+        'total_rows': export_job.total_rows,
+        'progress': export_job.progress,
+        'download_url': reverse('export_job_download', kwargs={'pk': pk}) if export_job.is_downloadable else None,
+        'error': export_job.error,
+    })
+
+@login_required
+def export_job_download(request, pk):
+    export_job = get_object_or_404(ExportJob, pk=pk, requested_by=request.user)
+    if not export_job.is_downloadable:
+        messages.error(request, 'This export is not available for download.')
+        return redirect('export_job_detail', pk=pk)
     
-    wb.save(response)
-    return response
+    return FileResponse(export_job.file.open('rb'), as_attachment=True, filename=export_job.filename)
+
+@login_required
+def export_archived_applications_csv(request, pk):
+    """Export the applications of an archived job to CSV (same columns as the live export)"""
+    job = get_object_or_404(ArchivedJob, pk=pk, company__employer=request.user)
+    return exports.csv_response(exports.archived_application_rows(job), f"archived_applications_{job.slug}.csv")
 
 # =================== BULK UPDATE FUNCTION ===================
 
@@ -701,7 +690,11 @@ def export_applications_excel(request, job_slug=None):
 def bulk_update_applications(request):
     """Handle bulk updates for applications"""
     try:
-        selected_ids = request.POST.get('selected_ids', '').split(',')
+        selected_ids = parse_selected_ids(request.POST.get('selected_ids', ''))
+        if selected_ids is None:
+            return JsonResponse({'success': False, 'message': 'Invalid application selection'}, status=400)
+        if not selected_ids:
+            return JsonResponse({'success': False, 'message': 'No applications selected'}, status=400)
         status = request.POST.get('status')
         send_emails = request.POST.get('send_emails', 'false') == 'true'
         
@@ -714,28 +707,31 @@ def bulk_update_applications(request):
             job__company=company
         )
         
-        updated_count = 0
-        email_count = 0
+        if status and status not in dict(Application.STATUS_CHOICES):
+            return JsonResponse({'success': False, 'message': f'Unknown status: {status}'}, status=400)
         
-        # Update status if provided
+        result = TransitionResult()
         if status:
-            for app in applications:
-                old_status = app.status
-                if old_status != status:
-                    # Update with email option
-                    app.update_status(
-                        new_status=status,
-                        changed_by=request.user,
-                        notes='Bulk status update',
-                        send_email=send_emails
-                    )
-                    updated_count += 1
+            result = bulk_transition(
+                applications,
+                status,
+                changed_by=request.user,
+                notes='Bulk status update',
+                send_email=send_emails
+            )
+        
+        message = f'Updated {result.updated} application(s)'
+        if result.skipped:
+            message += f'; {result.skipped} could not move to {status}'
+        if send_emails and result.emails_queued < result.updated:
+            message += f'; {result.updated - result.emails_queued} status email(s) could not be queued'
         
         return JsonResponse({
             'success': True,
-            'updated': updated_count,
-            'emails_sent': email_count,
-            'message': f'Updated {updated_count} application(s)'
+            'updated': result.updated,
+            'skipped': result.skipped,
+            'emails_sent': result.emails_queued,
+            'message': message
         })
         
     except Exception as e:
@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils.text import slugify
+from jobboard.slugs import save_with_unique_slug, slug_base
 
 User = get_user_model()
 
@@ -57,9 +58,12 @@ class Company(models.Model):
         return self.name
     
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        if self.pk and self.slug:
+            super().save(*args, **kwargs)
+            return
+        
+        base = slugify(self.slug) or slug_base(self.name, self._meta.get_field('slug').max_length, 'company')
+        save_with_unique_slug(self, base, lambda: super(Company, self).save(*args, **kwargs))
     
     def get_absolute_url(self):
         from django.urls import reverse
@@ -0,0 +1,18 @@
+"""
+Celery app for jobboard.
+
+Configuration comes from the CELERY_* settings (broker, serializers,
+CELERY_BEAT_SCHEDULE) and tasks are discovered from each app's tasks.py.
+Run a worker with `celery -A jobboard worker` and the scheduler with
+`celery -A jobboard beat`.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobboard.settings')
+
+app = Celery('jobboard')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
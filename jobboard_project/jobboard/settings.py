@@ -151,6 +151,59 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'jobs.tasks.send_job_alerts',
         'schedule': timedelta(days=7),
     },
+    'rollup-job-views-hourly': {
+        'task': 'analytics.tasks.rollup_job_views',
+        'schedule': timedelta(hours=1),
+    },
+    'compact-job-views-daily': {
+        'task': 'analytics.tasks.compact_job_views',
+        'schedule': timedelta(days=1),
+    },
+    'refresh-trending-jobs': {
+        'task': 'jobs.tasks.refresh_trending_jobs',
+        'schedule': timedelta(minutes=10),
+    },
+    'refresh-job-similarity': {
+        'task': 'jobs.tasks.refresh_job_similarity',
+        'schedule': timedelta(minutes=15),
+    },
+    'expire-past-deadline-jobs-hourly': {
+        'task': 'jobs.tasks.expire_past_deadline_jobs',
+        'schedule': timedelta(hours=1),
+    },
+    'archive-closed-jobs-daily': {
+        'task': 'jobs.tasks.archive_closed_jobs',
+        'schedule': timedelta(days=1),
+    },
+    'expire-application-exports-hourly': {
+        'task': 'applications.tasks.expire_application_exports',
+        'schedule': timedelta(hours=1),
+    },
+    'build-job-cooccurrence-hourly': {
+        'task': 'analytics.tasks.build_job_cooccurrence',
+        'schedule': timedelta(hours=1),
+    },
 }
 
+# Reverse proxies in front of the app that append to X-Forwarded-For; 0 means
+# the header is ignored and REMOTE_ADDR is the client (see analytics.tracking)
+TRUSTED_PROXY_COUNT = 0
+
+# Months of raw JobView rows to keep; older months survive only as JobViewDaily rollups
+JOBVIEW_RETENTION_MONTHS = 6
+
+# Trending jobs: score half-life and how often each process flushes its counters
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_FLUSH_SECONDS = 60
+
+# Recommendations: how long each process reuses its job feature arrays
+RECOMMENDER_FEATURES_SECONDS = 300
+
+# Days a job stays closed before jobs.archive moves it to the archive tables
+JOB_ARCHIVE_AFTER_DAYS = 180
+
+# Application exports: bigger ones run in Celery; their files are kept this long
+EXPORT_SYNC_MAX_ROWS = 5000
+EXPORT_FILE_TTL_HOURS = 24
+
 
@@ -0,0 +1,97 @@
+# jobboard/slugs.py
+"""
+Unique slug allocation shared by Job and Company.
+
+The next free suffix is found with one query: every existing slug equal
+to the base or starting with "<base>-" is fetched and the highest numeric
+suffix wins. Two concurrent saves can still pick the same slug, so the
+insert runs in a savepoint and is retried with a fresh suffix when the
+unique index rejects it.
+"""
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+MAX_ATTEMPTS = 5
+
+
+def slug_base(text, max_length, fallback='item'):
+    """Slugified text, trimmed so a "-<n>" suffix still fits in `max_length`"""
+    base = slugify(text)[:max_length - 8].strip('-')
+    return base or fallback
+
+
+def taken_suffixes(queryset, base, field='slug'):
+    """Numeric suffixes in use for `base` (0 meaning the bare base)"""
+    pattern = re.compile(rf"^{re.escape(base)}(?:-(\d+))?$")
+    rows = queryset.filter(
+        Q(**{field: base}) | Q(**{f"{field}__startswith": f"{base}-"})
+    ).values_list(field, flat=True)
+    suffixes = set()
+    for slug in rows:
+        match = pattern.match(slug)
+        if match:
+            suffixes.add(int(match.group(1) or 0))
+    return suffixes
+
+
+def format_slug(base, suffix):
+    return f"{base}-{suffix}" if suffix else base
+
+
+def next_slug(queryset, base, field='slug'):
+    """First free slug for `base`: the base itself, then base-1, base-2, ..."""
+    suffixes = taken_suffixes(queryset, base, field)
+    if 0 not in suffixes:
+        return base
+    return format_slug(base, max(suffixes) + 1)
+
+
+def unique_slugs(queryset, bases, field='slug', chunk_size=100):
+    """
+    Allocate one slug per entry of `bases` (duplicates allowed) with one
+    query per `chunk_size` distinct bases - for bulk inserts.
+    """
+    distinct = list(dict.fromkeys(bases))
+    used = {base: set() for base in distinct}
+    for start in range(0, len(distinct), chunk_size):
+        chunk = distinct[start:start + chunk_size]
+        condition = Q()
+        for base in chunk:
+            condition |= Q(**{field: base}) | Q(**{f"{field}__startswith": f"{base}-"})
+        for slug in queryset.filter(condition).values_list(field, flat=True):
+            for base in chunk:
+                if slug == base:
+                    used[base].add(0)
+                elif slug.startswith(f"{base}-") and slug[len(base) + 1:].isdigit():
+                    used[base].add(int(slug[len(base) + 1:]))
+
+    slugs = []
+    for base in bases:
+        suffix = 0 if 0 not in used[base] else max(used[base]) + 1
+        used[base].add(suffix)
+        slugs.append(format_slug(base, suffix))
+    return slugs
+
+
+def save_with_unique_slug(instance, base, save, field='slug'):
+    """
+    Give `instance` the next free slug for `base` and call `save()`,
+    retrying with a new suffix if a concurrent insert took it first.
+    """
+    queryset = type(instance)._default_manager.all()
+    if instance.pk:
+        queryset = queryset.exclude(pk=instance.pk)
+
+    for attempt in range(MAX_ATTEMPTS):
+        setattr(instance, field, next_slug(queryset, base, field))
+        try:
+            with transaction.atomic():
+                save()
+            return
+        except IntegrityError:
+            # Only retry when it really was the slug that collided
+            if attempt == MAX_ATTEMPTS - 1 or not queryset.filter(**{field: getattr(instance, field)}).exists():
+                raise
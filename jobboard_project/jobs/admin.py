@@ -1,3 +1,14 @@
 from django.contrib import admin
+from .models import Skill, SkillAlias
 
 # Register your models here.
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key']
+    search_fields = ['name', 'key', 'aliases__alias']
+    inlines = [SkillAliasInline]
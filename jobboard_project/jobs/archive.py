@@ -0,0 +1,217 @@
+# jobs/archive.py
+"""
+Hot/cold archival of closed jobs.
+
+Jobs that have been inactive for more than JOB_ARCHIVE_AFTER_DAYS are
+copied, with everything attached to them, into ArchivedJob and
+ArchivedApplication rows and then deleted from the hot tables (Job,
+Application, their screening/status/note/interview rows and the raw
+JobView and JobViewDaily rows). Each batch is one transaction, so a job
+is either fully archived or untouched. Archived rows are read-only and
+keep only the columns employers list and export by as real fields.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from analytics.models import ApplicationEvent, JobView, JobViewDaily
+from applications.models import (
+    Application, ApplicationNote, ApplicationStatusHistory, ArchivedApplication, Interview, ScreeningResponse
+)
+
+from .models import ArchivedJob, Job, QuestionChoice, ScreeningQuestion
+
+BATCH_SIZE = 100
+
+
+def archive_after_days():
+    return getattr(settings, 'JOB_ARCHIVE_AFTER_DAYS', 180)
+
+
+def archivable_jobs(days=None):
+    """Inactive jobs closed more than `days` ago"""
+    days = archive_after_days() if days is None else days
+    return Job.objects.filter(is_active=False, closed_at__lt=timezone.now() - timedelta(days=days))
+
+
+def field_values(instance, exclude=()):
+    """Concrete field values by attname, file fields as their stored name"""
+    values = {}
+    for field in instance._meta.concrete_fields:
+        if field.name in exclude:
+            continue
+        value = field.value_from_object(instance)
+        if isinstance(field, models.FileField):
+            value = value.name if value else ''
+        values[field.attname] = value
+    return values
+
+
+def grouped(queryset, key, *fields):
+    """{key value: [row dicts without the key]} from one values() query"""
+    groups = defaultdict(list)
+    for row in queryset.values(key, *fields):
+        groups[row.pop(key)].append(row)
+    return groups
+
+
+def job_documents(job_ids):
+    """Tags, screening questions and daily views of each job, for ArchivedJob.data"""
+    tags = grouped(Job.tags.through.objects.filter(job_id__in=job_ids), 'job_id', 'jobtag__name')
+    questions = grouped(
+        ScreeningQuestion.objects.filter(job_id__in=job_ids).order_by('order', 'id'),
+        'job_id', 'id', 'question', 'question_type', 'is_required', 'order'
+    )
+    choices = grouped(
+        QuestionChoice.objects.filter(question__job_id__in=job_ids).order_by('id'),
+        'question_id', 'choice_text'
+    )
+    daily_views = grouped(
+        JobViewDaily.objects.filter(job_id__in=job_ids).order_by('date'),
+        'job_id', 'date', 'views', 'unique_viewers'
+    )
+
+    documents = {}
+    for job_id in job_ids:
+        job_questions = questions.get(job_id, [])
+        for question in job_questions:
+            question['choices'] = [row['choice_text'] for row in choices.get(question['id'], [])]
+        documents[job_id] = {
+            'tags': [row['jobtag__name'] for row in tags.get(job_id, [])],
+            'screening_questions': job_questions,
+            'daily_views': daily_views.get(job_id, []),
+        }
+    return documents
+
+
+def application_documents(application_ids):
+    """Dependent rows of each application, for ArchivedApplication.data"""
+    responses = grouped(
+        ScreeningResponse.objects.filter(application_id__in=application_ids),
+        'application_id', 'question__question', 'answer'
+    )
+    history = grouped(
+        ApplicationStatusHistory.objects.filter(application_id__in=application_ids).order_by('changed_at'),
+        'application_id', 'old_status', 'new_status', 'changed_by_id', 'notes', 'changed_at'
+    )
+    notes = grouped(
+        ApplicationNote.objects.filter(application_id__in=application_ids).order_by('created_at'),
+        'application_id', 'author_id', 'note', 'is_private', 'created_at'
+    )
+    interviews = grouped(
+        Interview.objects.filter(application_id__in=application_ids),
+        'application_id', 'interview_date', 'interview_time', 'location', 'scheduled_at', 'scheduled_by_id'
+    )
+    events = grouped(
+        ApplicationEvent.objects.filter(application_id__in=application_ids).order_by('created_at'),
+        'application_id', 'event_type', 'performed_by_id', 'notes', 'created_at'
+    )
+    return {
+        application_id: {
+            'screening_responses': [
+                {'question': row['question__question'], 'answer': row['answer']}
+                for row in responses.get(application_id, [])
+            ],
+            'status_history': history.get(application_id, []),
+            'notes': notes.get(application_id, []),
+            'interviews': interviews.get(application_id, []),
+            'events': events.get(application_id, []),
+        }
+        for application_id in application_ids
+    }
+
+
+def archive_batch(job_ids):
+    """Archive and delete one batch of jobs; returns (jobs, applications) archived"""
+    with transaction.atomic():
+        # Re-check under lock: a job reactivated since it was picked is skipped
+        job_ids = list(
+            Job.objects.select_for_update().filter(id__in=job_ids, is_active=False).values_list('id', flat=True)
+        )
+        if not job_ids:
+            return 0, 0
+
+        jobs = list(Job.objects.filter(id__in=job_ids).select_related('category'))
+        applications = list(Application.objects.filter(job_id__in=job_ids).order_by('id'))
+        rolled_up = dict(
+            JobViewDaily.objects.filter(job_id__in=job_ids).order_by().values('job_id')
+            .annotate(total=Sum('views')).values_list('job_id', 'total')
+        )
+        application_counts = defaultdict(int)
+        for application in applications:
+            application_counts[application.job_id] += 1
+
+        documents = job_documents(job_ids)
+        archived_jobs = []
+        for job in jobs:
+            data = field_values(job, exclude=[
+                'id', 'company', 'title', 'slug', 'location', 'employment_type', 'created_at', 'closed_at'
+            ])
+            data.update(documents[job.id])
+            archived_jobs.append(ArchivedJob(
+                original_id=job.id,
+                company_id=job.company_id,
+                title=job.title,
+                slug=job.slug,
+                location=job.location,
+                employment_type=job.employment_type,
+                category_name=job.category.name if job.category else '',
+                application_count=application_counts[job.id],
+                view_count=max(job.views, rolled_up.get(job.id) or 0),
+                created_at=job.created_at,
+                closed_at=job.closed_at,
+                data=data,
+            ))
+        ArchivedJob.objects.bulk_create(archived_jobs)
+        archived_ids = dict(
+            ArchivedJob.objects.filter(original_id__in=job_ids).values_list('original_id', 'id')
+        )
+
+        documents = application_documents([application.id for application in applications])
+        archived_applications = []
+        for application in applications:
+            data = field_values(application, exclude=[
+                'id', 'job', 'applicant', 'full_name', 'email', 'status', 'applied_at'
+            ])
+            data.update(documents[application.id])
+            archived_applications.append(ArchivedApplication(
+                original_id=application.id,
+                job_id=archived_ids[application.job_id],
+                applicant_id=application.applicant_id,
+                full_name=application.full_name,
+                email=application.email,
+                status=application.status,
+                applied_at=application.applied_at,
+                data=data,
+            ))
+        ArchivedApplication.objects.bulk_create(archived_applications, batch_size=500)
+
+        # Raw views have no dependants, so these are single DELETEs; the
+        # Job delete then cascades to applications and their rows
+        JobView.objects.filter(job_id__in=job_ids).delete()
+        JobViewDaily.objects.filter(job_id__in=job_ids).delete()
+        Job.objects.filter(id__in=job_ids).delete()
+
+    return len(job_ids), len(applications)
+
+
+def archive_jobs(days=None, batch_size=BATCH_SIZE, max_batches=None):
+    """Archive every job closed more than `days` ago; returns (jobs, applications) archived"""
+    queryset = archivable_jobs(days).order_by('id')
+    total_jobs = total_applications = batches = 0
+    while max_batches is None or batches < max_batches:
+        # Archived jobs leave the table, so each batch starts from the front
+        job_ids = list(queryset.values_list('id', flat=True)[:batch_size])
+        if not job_ids:
+            break
+        jobs, applications = archive_batch(job_ids)
+        if not jobs:
+            break
+        total_jobs += jobs
+        total_applications += applications
+        batches += 1
+    return total_jobs, total_applications
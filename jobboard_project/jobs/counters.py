@@ -0,0 +1,107 @@
+# jobs/counters.py
+"""
+Denormalized active job counts on JobCategory and JobTag.
+
+jobs.signals calls these helpers when a job is saved, deleted or has its
+tags changed; each adjustment is a single F() UPDATE inside the caller's
+transaction. Bulk queryset updates bypass signals, so code that does them
+(and the recount_job_counters command) calls recount_counters().
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Job, JobCategory, JobTag
+
+
+def adjust_category(category_id, delta):
+    if category_id and delta:
+        JobCategory.objects.filter(pk=category_id).update(active_job_count=F('active_job_count') + delta)
+
+
+def adjust_tags(tag_ids, delta):
+    tag_ids = list(tag_ids)
+    if tag_ids and delta:
+        JobTag.objects.filter(pk__in=tag_ids).update(active_job_count=F('active_job_count') + delta)
+
+
+def add_active_jobs(category_counts, tag_counts):
+    """Apply {category_id: n} and {tag_id: n} increments, grouping tags by amount"""
+    for category_id, count in category_counts.items():
+        adjust_category(category_id, count)
+    tags_by_count = {}
+    for tag_id, count in tag_counts.items():
+        tags_by_count.setdefault(count, []).append(tag_id)
+    for count, tag_ids in tags_by_count.items():
+        adjust_tags(tag_ids, count)
+
+
+def previous_state(job):
+    """(category_id, is_active) as last stored, or None for a new job"""
+    state = getattr(job, '_counted_state', None)
+    if state is None and job.pk:
+        state = Job.objects.filter(pk=job.pk).values_list('category_id', 'is_active').first()
+    return state
+
+
+def job_saved(job, old_state):
+    """Apply the counter changes between `old_state` and the job as saved"""
+    old_category, old_active = old_state or (None, False)
+    new_category, new_active = job.category_id, job.is_active
+
+    if old_active and (not new_active or old_category != new_category):
+        adjust_category(old_category, -1)
+    if new_active and (not old_active or old_category != new_category):
+        adjust_category(new_category, 1)
+
+    if old_active != new_active and old_state is not None:
+        adjust_tags(job.tags.values_list('pk', flat=True), 1 if new_active else -1)
+
+    job._counted_state = (new_category, new_active)
+
+
+def job_deleted(job, tag_ids):
+    state = previous_state(job)
+    if state and state[1]:
+        adjust_category(state[0], -1)
+        adjust_tags(tag_ids, -1)
+
+
+def tags_changed(instance, action, pk_set, reverse):
+    """m2m_changed on Job.tags from either side; pk_set are tags (forward) or jobs (reverse)"""
+    sign = 1 if action == 'post_add' else -1
+    if not reverse:
+        if instance.is_active:
+            adjust_tags(pk_set, sign)
+    else:
+        active = Job.objects.filter(pk__in=pk_set, is_active=True).count()
+        adjust_tags([instance.pk], sign * active)
+
+
+def recount_counters():
+    """Recompute every counter from the job table; returns (categories, tags) updated"""
+    category_counts = Job.objects.filter(
+        is_active=True, category=OuterRef('pk')
+    ).order_by().values('category').annotate(total=Count('pk')).values('total')
+    categories = JobCategory.objects.update(
+        active_job_count=Coalesce(Subquery(category_counts, output_field=IntegerField()), 0)
+    )
+
+    through = Job.tags.through
+    tag_counts = through.objects.filter(
+        jobtag=OuterRef('pk'), job__is_active=True
+    ).order_by().values('jobtag').annotate(total=Count('pk')).values('total')
+    tags = JobTag.objects.update(
+        active_job_count=Coalesce(Subquery(tag_counts, output_field=IntegerField()), 0)
+    )
+    return categories, tags
+
+
+def counter_drift():
+    """Categories and tags whose stored count differs from the live count"""
+    categories = JobCategory.objects.annotate(
+        live=Count('job', filter=Q(job__is_active=True))
+    ).exclude(active_job_count=F('live'))
+    tags = JobTag.objects.annotate(
+        live=Count('job', filter=Q(job__is_active=True))
+    ).exclude(active_job_count=F('live'))
+    return list(categories), list(tags)
@@ -0,0 +1,88 @@
+# jobs/expiry.py
+"""
+Deactivate jobs whose application deadline has passed.
+
+Expired jobs are found through the (is_active, deadline) index and closed
+in chunks, each chunk in its own transaction with a single
+UPDATE ... WHERE id IN (...). The chunk's category/tag counters are
+decremented in the same transaction. Its trending scores and content
+neighbour lists are dropped, and the jobs that listed it as similar are
+flagged for recomputation, so the hot active set only holds live postings.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import counters
+from .models import Job, JobNeighbours, JobTrendingScore
+from .similarity import KIND as SIMILARITY_KIND, mark_stale
+
+BATCH_SIZE = 1000
+
+
+class ExpiryResult:
+    def __init__(self):
+        self.expired = 0
+        self.batches = 0
+        self.categories = Counter()
+
+    def __str__(self):
+        return f"Expired {self.expired} job(s) in {self.batches} batch(es)"
+
+
+def expired_jobs(today=None):
+    """Active jobs whose deadline was before `today`"""
+    today = today or timezone.localdate()
+    return Job.objects.filter(is_active=True, deadline__lt=today)
+
+
+def expire_chunk(job_ids, now):
+    """Close one chunk of jobs; returns (jobs closed, {category_id: jobs closed})"""
+    with transaction.atomic():
+        rows = list(
+            Job.objects.select_for_update().filter(id__in=job_ids, is_active=True).values_list('id', 'category_id')
+        )
+        job_ids = [job_id for job_id, category_id in rows]
+        if not job_ids:
+            return 0, Counter()
+
+        Job.objects.filter(id__in=job_ids).update(is_active=False, closed_at=now, updated_at=now)
+
+        category_counts = Counter(category_id for job_id, category_id in rows if category_id)
+        tag_counts = Counter(
+            Job.tags.through.objects.filter(job_id__in=job_ids).values_list('jobtag_id', flat=True)
+        )
+        counters.add_active_jobs(
+            {category_id: -count for category_id, count in category_counts.items()},
+            {tag_id: -count for tag_id, count in tag_counts.items()}
+        )
+
+        JobTrendingScore.objects.filter(job_id__in=job_ids).delete()
+
+        # Similarity is symmetric enough that the jobs an expired job listed
+        # are the ones likely to list it; refresh those, drop its own list
+        lists = JobNeighbours.objects.filter(kind=SIMILARITY_KIND, job_id__in=job_ids)
+        affected = {other_id for neighbours in lists.values_list('neighbours', flat=True) for other_id, score in neighbours}
+        lists.delete()
+        mark_stale(affected.difference(job_ids))
+
+    return len(job_ids), category_counts
+
+
+def expire_jobs(today=None, batch_size=BATCH_SIZE):
+    """Deactivate every active job past its deadline; returns an ExpiryResult"""
+    result = ExpiryResult()
+    queryset = expired_jobs(today).order_by('id')
+    last_id = 0
+    while True:
+        job_ids = list(queryset.filter(id__gt=last_id).values_list('id', flat=True)[:batch_size])
+        if not job_ids:
+            break
+        last_id = job_ids[-1]
+
+        closed, category_counts = expire_chunk(job_ids, timezone.now())
+        result.expired += closed
+        result.categories.update(category_counts)
+        result.batches += 1
+    return result
@@ -1,12 +1,17 @@
 import django_filters
 from django.db.models import Q
 from .models import Job, JobCategory
+from .skills import skill_filter
 
 class JobFilter(django_filters.FilterSet):
     keyword = django_filters.CharFilter(
         method='filter_by_keyword',
         label='Search'
     )
+    skill = django_filters.CharFilter(
+        method='filter_by_skill',
+        label='Skill'
+    )
     location = django_filters.CharFilter(
         field_name='location',
         lookup_expr='icontains',
@@ -39,7 +44,7 @@ class JobFilter(django_filters.FilterSet):
     
     class Meta:
         model = Job
-        fields = ['keyword', 'location', 'salary_min', 'salary_max', 
+        fields = ['keyword', 'skill', 'location', 'salary_min', 'salary_max', 
                  'is_remote', 'employment_type', 'category']
     
     def filter_by_keyword(self, queryset, name, value):
@@ -50,4 +55,9 @@ class JobFilter(django_filters.FilterSet):
                 Q(requirements__icontains=value) |
                 Q(company__name__icontains=value)
             )
-        return queryset
\ No newline at end of file
+        return queryset
+    
+    def filter_by_skill(self, queryset, name, value):
+        if value:
+            return queryset.filter(skill_filter(value))
+        return queryset
@@ -156,22 +156,28 @@ class JobForm(forms.ModelForm):
         
         if commit:
             job.save()
-            # Save tags
+            # Save tags (only the difference is written)
             tags_input = self.cleaned_data.get('tags_input', '')
-            if tags_input:
-                tags = [tag.strip() for tag in tags_input.split(',') if tag.strip()]
-                job.tags.clear()
-                for tag_name in tags:
-                    tag, created = JobTag.objects.get_or_create(
-                        name=tag_name,
-                        defaults={'slug': tag_name.lower().replace(' ', '-')}
-                    )
-                    job.tags.add(tag)
-            else:
-                job.tags.clear()
+            job.set_tag_names(tag.strip() for tag in tags_input.split(','))
         
         return job
 
+class JobImportForm(forms.Form):
+    file = forms.FileField(
+        help_text='CSV with a header row, or JSON Lines (.jsonl) with one job object per line',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.jsonl,.ndjson,.json'})
+    )
+    send_alerts = forms.BooleanField(
+        required=False,
+        initial=True,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        help_text='Only validate the file; nothing is saved',
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
+    )
+
 class JobFilterForm(forms.Form):
     keyword = forms.CharField(
         required=False,
@@ -0,0 +1,452 @@
+# jobs/importer.py
+"""
+Bulk job import from CSV or JSON Lines.
+
+The file is streamed row by row and handled in chunks: each row is
+validated into an unsaved Job, then the whole chunk gets its slugs from
+one allocation query, is bulk-inserted, and has its tags, skills and
+screening questions linked with bulk inserts. Category/tag counters are
+bumped once per chunk. Instant job alerts are matched in memory as the
+chunks go and each alert receives a single digest email at the end,
+instead of a full alert scan per job.
+
+A chunk that hits an IntegrityError (another writer took one of its slugs
+or tags first) is rolled back and retried with fresh slugs. Uploads from
+the site are saved as a JobImport and run_import() imports them in a
+Celery worker, recording progress after every chunk, so neither the
+import nor the alert emails hold up the request.
+
+Columns: title, description, requirements, location, employment_type
+(required) and qualifications, skills, benefits, category (name or slug),
+tags (comma-separated or a JSON list), education_level, experience_years,
+is_remote, salary_min, salary_max, salary_currency, deadline,
+application_email, application_url, is_active, screening_questions
+("|"-separated in CSV, or a JSON list of strings / objects with
+question, question_type, is_required, choices) and company (company slug,
+only when no company is given to the importer).
+"""
+import csv
+import io
+import json
+import logging
+from collections import Counter, defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from companies.models import Company
+from jobboard.slugs import slug_base, unique_slugs
+
+from . import counters
+from .models import Job, JobAlert, JobCategory, JobImport, JobSkill, JobTag, QuestionChoice, ScreeningQuestion
+from .skills import resolve_skills, split_skills
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+INSERT_ATTEMPTS = 3
+MAX_REPORTED_ERRORS = 100
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+FALSE_VALUES = {'0', 'false', 'no', 'n', 'f', ''}
+
+TEXT_FIELDS = [
+    'title', 'description', 'requirements', 'qualifications', 'skills', 'benefits',
+    'location', 'employment_type', 'education_level', 'salary_currency',
+    'application_email', 'application_url',
+]
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.errors = []
+        self.error_count = 0
+        self.alert_emails = 0
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def error_message(error):
+    """One line for a ValidationError, naming the fields at fault"""
+    if hasattr(error, 'error_dict'):
+        return '; '.join(
+            f"{field}: {' '.join(messages)}" for field, messages in error.message_dict.items()
+        )
+    return '; '.join(error.messages)
+
+
+def detect_format(filename):
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def read_rows(stream, file_format):
+    """Yield (line number, row dict, error) from a text or binary stream"""
+    if isinstance(stream, io.TextIOBase):
+        yield from parse_rows(stream, file_format)
+        return
+
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        yield from parse_rows(text, file_format)
+    finally:
+        # Leave the caller's stream open; the wrapper would close it
+        text.detach()
+
+
+def parse_rows(stream, file_format):
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+        yield line_number, row, None
+
+
+def parse_bool(value, default):
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return default if value == '' else False
+    raise ValidationError(f"Invalid yes/no value: {value!r}")
+
+
+def parse_list(value, separator):
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [item.strip() for item in str(value).split(separator) if item.strip()]
+
+
+def parse_questions(value):
+    """Screening questions as dicts with question, question_type, is_required and choices"""
+    questions = []
+    for item in parse_list(value, '|'):
+        if isinstance(item, str):
+            item = {'question': item}
+        if not isinstance(item, dict) or not str(item.get('question', '')).strip():
+            raise ValidationError("Screening questions need a question text")
+        question_type = item.get('question_type') or 'TEXT'
+        if question_type not in dict(ScreeningQuestion.QUESTION_TYPE_CHOICES):
+            raise ValidationError(f"Invalid screening question type: {question_type!r}")
+        questions.append({
+            'question': str(item['question']).strip(),
+            'question_type': question_type,
+            'is_required': parse_bool(item.get('is_required'), True),
+            'choices': [str(choice)[:200] for choice in parse_list(item.get('choices'), ';')],
+        })
+    return questions
+
+
+class JobImporter:
+    def __init__(self, company=None, chunk_size=CHUNK_SIZE, send_alerts=True, dry_run=False, on_chunk=None):
+        self.company = company
+        self.chunk_size = chunk_size
+        # Called with the ImportResult after every chunk
+        self.on_chunk = on_chunk
+        self.send_alerts = send_alerts
+        self.dry_run = dry_run
+        self.result = ImportResult()
+
+        self.categories = {}
+        for category in JobCategory.objects.all():
+            self.categories[category.name.lower()] = category
+            self.categories[category.slug.lower()] = category
+        self.companies = {}
+
+        self.alerts = []
+        if send_alerts and not dry_run:
+            self.alerts = list(
+                JobAlert.objects.filter(
+                    frequency='INSTANT', email_notifications=True, is_active=True
+                ).select_related('job_seeker', 'category')
+            )
+        self.alert_matches = defaultdict(list)
+
+    def get_company(self, row):
+        if self.company:
+            return self.company
+        slug = str(row.get('company') or '').strip()
+        if not slug:
+            raise ValidationError("Missing company")
+        if slug not in self.companies:
+            self.companies[slug] = Company.objects.filter(slug=slug).first()
+        if self.companies[slug] is None:
+            raise ValidationError(f"Unknown company: {slug!r}")
+        return self.companies[slug]
+
+    def build(self, row):
+        """Validate one row into (unsaved Job, tag names, screening questions)"""
+        values = {
+            field: str(row[field]).strip() for field in TEXT_FIELDS
+            if row.get(field) not in (None, '')
+        }
+        job = Job(company=self.get_company(row), **values)
+
+        category = str(row.get('category') or '').strip().lower()
+        if category:
+            if category not in self.categories:
+                raise ValidationError(f"Unknown category: {row['category']!r}")
+            job.category = self.categories[category]
+
+        job.is_remote = parse_bool(row.get('is_remote'), False)
+        job.is_active = parse_bool(row.get('is_active'), True)
+        job.education_level = values.get('education_level') or None
+        if row.get('experience_years') not in (None, ''):
+            job.experience_years = row['experience_years']
+        for field in ('salary_min', 'salary_max', 'deadline'):
+            if row.get(field) not in (None, ''):
+                setattr(job, field, row[field])
+
+        # Company and category come from the importer's caches, already checked
+        job.full_clean(exclude=['slug', 'excerpt', 'company', 'category'], validate_unique=False)
+        if job.salary_min and job.salary_max and job.salary_min > job.salary_max:
+            raise ValidationError("salary_min is greater than salary_max")
+        if job.deadline and job.deadline < timezone.localdate():
+            raise ValidationError("Deadline is in the past")
+
+        tags = [JobTag.clean_name(name) for name in parse_list(row.get('tags'), ',')]
+        return job, [name for name in tags if name], parse_questions(row.get('screening_questions'))
+
+    def run(self, stream, file_format):
+        chunk = []
+        try:
+            for line_number, row, error in read_rows(stream, file_format):
+                self.result.rows += 1
+                if error:
+                    self.result.add_error(line_number, error)
+                    continue
+                try:
+                    chunk.append(self.build(row))
+                except ValidationError as e:
+                    self.result.add_error(line_number, error_message(e))
+                    continue
+                if len(chunk) >= self.chunk_size:
+                    self.insert(chunk)
+                    chunk = []
+            if chunk:
+                self.insert(chunk)
+        finally:
+            # Jobs from committed chunks stay posted, so their alerts still go out
+            self.notify_alerts()
+        return self.result
+
+    def insert(self, chunk):
+        if self.dry_run:
+            self.result.created += len(chunk)
+            return
+
+        now = timezone.now()
+        jobs = [job for job, tags, questions in chunk]
+        for job in jobs:
+            job.excerpt = Job.make_excerpt(job.description)
+            # bulk_create skips Job.save(), which stamps these
+            if job.is_active:
+                job.published_at = now
+            else:
+                job.closed_at = now
+
+        for attempt in range(1, INSERT_ATTEMPTS + 1):
+            try:
+                active = self.save_chunk(chunk)
+                break
+            except IntegrityError:
+                if attempt == INSERT_ATTEMPTS:
+                    raise
+                logger.warning("Job import chunk hit an IntegrityError, retrying (attempt %s)", attempt)
+                for job in jobs:
+                    job.pk = job.id = None
+
+        self.result.created += len(jobs)
+        self.match_alerts(active)
+        if self.on_chunk:
+            self.on_chunk(self.result)
+
+    def save_chunk(self, chunk):
+        """Insert one chunk with everything linked to it; returns its active jobs"""
+        max_length = Job._meta.get_field('slug').max_length
+        jobs = [job for job, tags, questions in chunk]
+        with transaction.atomic():
+            slugs = unique_slugs(
+                Job.objects.all(),
+                [slug_base(f"{job.title}-{job.company.name}", max_length, 'job') for job in jobs]
+            )
+            for job, slug in zip(jobs, slugs):
+                job.slug = slug
+            Job.objects.bulk_create(jobs, batch_size=500)
+
+            # Backends without RETURNING (MySQL) leave pk unset; slugs are unique
+            if any(job.pk is None for job in jobs):
+                ids = dict(Job.objects.filter(slug__in=slugs).values_list('slug', 'id'))
+                for job in jobs:
+                    job.pk = job.id = ids[job.slug]
+
+            tag_counts = self.link_tags(chunk)
+            self.link_skills(jobs)
+            self.add_questions(chunk)
+
+            active = [job for job in jobs if job.is_active]
+            category_counts = Counter(job.category_id for job in active if job.category_id)
+            counters.add_active_jobs(category_counts, tag_counts)
+        return active
+
+    def link_tags(self, chunk):
+        """Link the chunk's tags; returns {tag_id: active jobs added}"""
+        tag_ids = JobTag.ids_for(name for job, tags, questions in chunk for name in tags)
+        links = []
+        tag_counts = Counter()
+        for job, tags, questions in chunk:
+            for tag_id in {tag_ids.get(JobTag.key_for(name)) for name in tags} - {None}:
+                links.append(Job.tags.through(job_id=job.pk, jobtag_id=tag_id))
+                if job.is_active:
+                    tag_counts[tag_id] += 1
+        Job.tags.through.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+        return tag_counts
+
+    def link_skills(self, jobs):
+        parsed = {job.pk: split_skills(job.skills) for job in jobs}
+        names = {}
+        for skills in parsed.values():
+            for key, display in skills.items():
+                names.setdefault(key, display)
+        skill_ids = resolve_skills(names)
+        JobSkill.objects.bulk_create(
+            [JobSkill(job_id=job_id, skill_id=skill_ids[key]) for job_id, skills in parsed.items() for key in skills],
+            batch_size=1000,
+            ignore_conflicts=True
+        )
+
+    def add_questions(self, chunk):
+        questions = []
+        choices = {}
+        for job, tags, job_questions in chunk:
+            for order, item in enumerate(job_questions):
+                questions.append(ScreeningQuestion(
+                    job_id=job.pk,
+                    question=item['question'],
+                    question_type=item['question_type'],
+                    is_required=item['is_required'],
+                    order=order,
+                ))
+                if item['choices']:
+                    choices[(job.pk, order)] = item['choices']
+        if not questions:
+            return
+
+        ScreeningQuestion.objects.bulk_create(questions, batch_size=1000)
+        if choices:
+            question_ids = {
+                (job_id, order): question_id
+                for question_id, job_id, order in ScreeningQuestion.objects.filter(
+                    job_id__in={job_id for job_id, order in choices}
+                ).values_list('id', 'job_id', 'order')
+            }
+            QuestionChoice.objects.bulk_create(
+                [
+                    QuestionChoice(question_id=question_ids[key], choice_text=text)
+                    for key, texts in choices.items() for text in texts
+                ],
+                batch_size=1000
+            )
+
+    def match_alerts(self, jobs):
+        for alert in self.alerts:
+            for job in jobs:
+                if alert.does_job_match(job, verbose=False):
+                    self.alert_matches[alert.pk].append(job)
+
+    def notify_alerts(self):
+        for alert in self.alerts:
+            matches = self.alert_matches.get(alert.pk)
+            if matches and alert.send_email_notification(matching_jobs=matches):
+                self.result.alert_emails += 1
+
+
+def import_jobs(stream, file_format='csv', company=None, **options):
+    """Import jobs from a CSV/JSONL stream; returns an ImportResult"""
+    return JobImporter(company=company, **options).run(stream, file_format)
+
+
+def run_import(job_import):
+    """Import the file of a queued JobImport, saving progress after every chunk"""
+    job_import.status = 'RUNNING'
+    job_import.started_at = timezone.now()
+    job_import.total_bytes = job_import.file.size
+    job_import.save(update_fields=['status', 'started_at', 'total_bytes'])
+
+    result = ImportResult()
+    fields = ['status', 'rows', 'created_jobs', 'error_count', 'errors', 'alert_emails', 'file', 'finished_at']
+    try:
+        with job_import.file.open('rb') as upload:
+            def save_progress(result):
+                JobImport.objects.filter(pk=job_import.pk).update(
+                    processed_bytes=upload.tell(),
+                    rows=result.rows,
+                    created_jobs=result.created,
+                    error_count=result.error_count,
+                )
+
+            importer = JobImporter(
+                company=job_import.company,
+                send_alerts=job_import.send_alerts,
+                dry_run=job_import.dry_run,
+                on_chunk=save_progress,
+            )
+            result = importer.result
+            importer.run(upload, job_import.file_format)
+        job_import.status = 'DONE'
+        job_import.processed_bytes = job_import.total_bytes
+        fields.append('processed_bytes')
+    except Exception as e:
+        logger.exception("Job import %s failed", job_import.pk)
+        job_import.status = 'FAILED'
+        job_import.error = str(e)
+        fields.append('error')
+
+    job_import.rows = result.rows
+    job_import.created_jobs = result.created
+    job_import.error_count = result.error_count
+    job_import.errors = [list(error) for error in result.errors]
+    job_import.alert_emails = result.alert_emails
+    job_import.finished_at = timezone.now()
+    job_import.file.delete(save=False)
+    job_import.save(update_fields=fields)
+    return job_import
+
+
+def queue_import(job_import):
+    """Hand a saved JobImport to Celery; marks it FAILED if the broker refuses it"""
+    from .tasks import run_job_import
+    try:
+        run_job_import.delay(job_import.pk)
+    except Exception as e:
+        logger.exception("Could not queue job import %s", job_import.pk)
+        job_import.status = 'FAILED'
+        job_import.error = f"Could not queue the import: {e}"
+        job_import.finished_at = timezone.now()
+        job_import.file.delete(save=False)
+        job_import.save(update_fields=['status', 'error', 'finished_at', 'file'])
+        return False
+    return True
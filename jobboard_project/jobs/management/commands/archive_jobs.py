@@ -0,0 +1,21 @@
+# jobs/management/commands/archive_jobs.py
+from django.core.management.base import BaseCommand
+from jobs.archive import BATCH_SIZE, archivable_jobs, archive_after_days, archive_jobs
+
+class Command(BaseCommand):
+    help = 'Move long-closed jobs and their applications into the archive tables'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Archive jobs closed more than this many days ago (default: JOB_ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Jobs archived per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the jobs that would be archived')
+    
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else archive_after_days()
+        
+        if options['dry_run']:
+            self.stdout.write(f"🔍 {archivable_jobs(days).count()} job(s) closed more than {days} day(s) ago")
+            return
+        
+        jobs, applications = archive_jobs(days=days, batch_size=options['batch_size'])
+        self.stdout.write(f"🎉 Archived {jobs} job(s) and {applications} application(s)")
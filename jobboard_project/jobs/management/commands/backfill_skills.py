@@ -0,0 +1,18 @@
+# jobs/management/commands/backfill_skills.py
+from django.core.management.base import BaseCommand
+from jobs.skills import backfill_job_skills, backfill_application_skills
+
+class Command(BaseCommand):
+    help = 'Link existing jobs and applications to canonical skills parsed from their skills text'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+    
+    def handle(self, *args, **options):
+        jobs = backfill_job_skills(options['batch_size'])
+        self.stdout.write(f"✅ {jobs} job(s) linked to skills")
+        
+        applications = backfill_application_skills(options['batch_size'])
+        self.stdout.write(f"✅ {applications} application(s) linked to skills")
+        
+        self.stdout.write("🎉 Skills backfill complete")
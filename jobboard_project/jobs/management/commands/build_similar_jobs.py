@@ -0,0 +1,13 @@
+# jobs/management/commands/build_similar_jobs.py
+from django.core.management.base import BaseCommand
+from jobs.similarity import refresh_similar_jobs
+
+class Command(BaseCommand):
+    help = 'Precompute similar jobs (content neighbours) for active jobs'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every active job, not only new or changed ones')
+    
+    def handle(self, *args, **options):
+        refreshed = refresh_similar_jobs(full=options['full'])
+        self.stdout.write(f"🎉 Similar jobs computed for {refreshed} job(s)")
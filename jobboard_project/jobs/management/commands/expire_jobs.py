@@ -0,0 +1,22 @@
+# jobs/management/commands/expire_jobs.py
+from django.core.management.base import BaseCommand
+from jobs.expiry import BATCH_SIZE, expire_jobs, expired_jobs
+from jobs.models import JobCategory
+
+class Command(BaseCommand):
+    help = 'Deactivate jobs whose application deadline has passed'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Jobs closed per UPDATE')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the expired jobs')
+    
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write(f"🔍 {expired_jobs().count()} active job(s) are past their deadline")
+            return
+        
+        result = expire_jobs(batch_size=options['batch_size'])
+        names = dict(JobCategory.objects.filter(pk__in=result.categories).values_list('pk', 'name'))
+        for category_id, count in result.categories.most_common():
+            self.stdout.write(f"📁 {names.get(category_id, category_id)}: {count}")
+        self.stdout.write(f"🎉 {result}")
@@ -0,0 +1,49 @@
+# jobs/management/commands/import_jobs.py
+from django.core.management.base import BaseCommand, CommandError
+from companies.models import Company
+from jobs.importer import CHUNK_SIZE, detect_format, import_jobs
+
+class Command(BaseCommand):
+    help = 'Bulk import jobs from a CSV or JSON Lines file'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file to import')
+        parser.add_argument('--company', help='Company slug for every row (otherwise read from the "company" column)')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='File format (default: from the file extension)')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows inserted per batch')
+        parser.add_argument('--dry-run', action='store_true', help='Validate rows without saving anything')
+        parser.add_argument('--no-alerts', action='store_true', help='Do not email instant job alerts')
+    
+    def handle(self, *args, **options):
+        company = None
+        if options['company']:
+            company = Company.objects.filter(slug=options['company']).first()
+            if company is None:
+                raise CommandError(f"Unknown company: {options['company']}")
+        
+        file_format = options['format'] or detect_format(options['path'])
+        try:
+            stream = open(options['path'], 'rb')
+        except OSError as e:
+            raise CommandError(f"Cannot open {options['path']}: {e}")
+        
+        with stream:
+            result = import_jobs(
+                stream,
+                file_format,
+                company=company,
+                chunk_size=options['chunk_size'],
+                send_alerts=not options['no_alerts'],
+                dry_run=options['dry_run'],
+            )
+        
+        for line, message in result.errors:
+            self.stdout.write(f"❌ Line {line}: {message}")
+        if result.error_count > len(result.errors):
+            self.stdout.write(f"... and {result.error_count - len(result.errors)} more error(s)")
+        
+        action = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(
+            f"🎉 {action} {result.created} of {result.rows} row(s); "
+            f"{result.error_count} error(s), {result.alert_emails} alert email(s) sent"
+        )
@@ -0,0 +1,21 @@
+# jobs/management/commands/recount_job_counters.py
+from django.core.management.base import BaseCommand
+from jobs.counters import counter_drift, recount_counters
+
+class Command(BaseCommand):
+    help = 'Repair the active job counts stored on categories and tags'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only report counters that drifted')
+    
+    def handle(self, *args, **options):
+        categories, tags = counter_drift()
+        for item in categories + tags:
+            self.stdout.write(f"⚠️ {item.__class__.__name__} '{item.name}': stored {item.active_job_count}, actual {item.live}")
+        
+        if options['check']:
+            self.stdout.write(f"🔍 {len(categories)} category and {len(tags)} tag counter(s) drifted")
+            return
+        
+        recount_counters()
+        self.stdout.write(f"🎉 Recounted; fixed {len(categories)} category and {len(tags)} tag counter(s)")
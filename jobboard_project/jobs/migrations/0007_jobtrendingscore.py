@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_create_job_alert_fresh'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobTrendingScore',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending_score', serialize=False, to='jobs.job')),
+                ('score', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-score'], name='jobs_jobtre_score_905f91_idx')],
+            },
+        ),
+    ]
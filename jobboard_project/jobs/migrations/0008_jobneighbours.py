@@ -0,0 +1,30 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_jobtrendingscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobNeighbours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('CONTENT', 'Similar content'), ('BEHAVIOUR', 'Viewed together')], max_length=10)),
+                ('neighbours', models.JSONField(default=list)),
+                ('is_stale', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbour_lists', to='jobs.job')),
+            ],
+            options={
+                'verbose_name_plural': 'Job Neighbours',
+                'indexes': [models.Index(fields=['kind', 'is_stale'], name='jobs_jobnei_kind_c292b8_idx')],
+                'unique_together': {('job', 'kind')},
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:08
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+EXCERPT_LENGTH = 200
+
+
+def fill_excerpts(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    last_id = 0
+    while True:
+        jobs = list(Job.objects.filter(id__gt=last_id).order_by('id').only('id', 'description')[:500])
+        if not jobs:
+            break
+        for job in jobs:
+            text = ' '.join(strip_tags(job.description or '').split())
+            job.excerpt = Truncator(text).chars(EXCERPT_LENGTH)
+        Job.objects.bulk_update(jobs, ['excerpt'])
+        last_id = jobs[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_skill'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:09
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_active_jobs(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobCategory = apps.get_model('jobs', 'JobCategory')
+    JobTag = apps.get_model('jobs', 'JobTag')
+    
+    active = Job.objects.filter(is_active=True)
+    for row in active.exclude(category=None).values('category').annotate(total=Count('id')):
+        JobCategory.objects.filter(pk=row['category']).update(active_job_count=row['total'])
+    
+    through = Job.tags.through.objects.filter(job__is_active=True)
+    for row in through.values('jobtag').annotate(total=Count('id')):
+        JobTag.objects.filter(pk=row['jobtag']).update(active_job_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobcategory',
+            name='active_job_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobtag',
+            name='active_job_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='jobcategory',
+            index=models.Index(fields=['-active_job_count'], name='jobs_jobcat_active__25b8f1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobtag',
+            index=models.Index(fields=['-active_job_count'], name='jobs_jobtag_active__9bfd95_idx'),
+        ),
+        migrations.RunPython(count_active_jobs, migrations.RunPython.noop),
+    ]
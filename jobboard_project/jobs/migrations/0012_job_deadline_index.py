@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_initial'),
+        ('jobs', '0011_active_job_counts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'deadline'], name='jobs_job_is_acti_44aadb_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:17
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_closed_at(apps, schema_editor):
+    # Best guess for jobs closed before closed_at existed
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.filter(is_active=False, closed_at__isnull=True).update(closed_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0002_initial'),
+        ('jobs', '0012_job_deadline_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.PositiveIntegerField(unique=True)),
+                ('title', models.CharField(max_length=200)),
+                ('slug', models.SlugField(max_length=200)),
+                ('location', models.CharField(max_length=200)),
+                ('employment_type', models.CharField(choices=[('FULL_TIME', 'Full Time'), ('PART_TIME', 'Part Time'), ('CONTRACT', 'Contract'), ('INTERNSHIP', 'Internship'), ('REMOTE', 'Remote')], max_length=20)),
+                ('category_name', models.CharField(blank=True, max_length=100)),
+                ('application_count', models.PositiveIntegerField(default=0)),
+                ('view_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('closed_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('data', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+            ],
+            options={
+                'ordering': ['-closed_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='closed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_closed_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['is_active', 'closed_at'], name='jobs_job_is_acti_e5e503_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedjob',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_jobs', to='companies.company'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedjob',
+            index=models.Index(fields=['company', '-closed_at'], name='jobs_archiv_company_e19d66_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-19 06:00
+# Field definitions the models already had but no migration recorded
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_archivedjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='salary_currency',
+            field=models.CharField(default='PHP', max_length=3),
+        ),
+        migrations.AlterField(
+            model_name='jobalert',
+            name='email_notifications',
+            field=models.BooleanField(default=True, verbose_name='Send Email Notifications'),
+        ),
+        migrations.AlterField(
+            model_name='jobalert',
+            name='frequency',
+            field=models.CharField(choices=[('INSTANT', 'Instant'), ('DAILY', 'Daily'), ('WEEKLY', 'Weekly')], default='DAILY', max_length=10, verbose_name='Frequency'),
+        ),
+        migrations.AlterField(
+            model_name='jobalert',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='Active'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.9 on 2026-10-19 09:00
+# A row's score was already its weight as of updated_at, so renaming the
+# column to landmark keeps existing scores valid under forward decay
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_job_and_jobalert_field_catch_up'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='jobtrendingscore',
+            old_name='updated_at',
+            new_name='landmark',
+        ),
+    ]
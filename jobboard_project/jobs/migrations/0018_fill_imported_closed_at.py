@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-19 10:30
+
+from django.db import migrations
+from django.db.models import F
+
+
+def fill_closed_at(apps, schema_editor):
+    # Inactive jobs bulk-imported without a closed_at could never be archived
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.filter(is_active=False, closed_at__isnull=True).update(closed_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_jobimport'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_closed_at, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,13 @@
-from django.db import models
+from django.db import models, transaction
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.auth import get_user_model
-from django.utils.text import slugify
+from django.utils.text import slugify, Truncator
+from django.utils.html import strip_tags
 from companies.models import Company
+from jobboard.slugs import save_with_unique_slug, slug_base, unique_slugs
 from django.utils import timezone
 from django.db.models import Q
+from django.db.models.functions import Lower
 from django.core.mail import send_mail
 from django.conf import settings
 from django.template.loader import render_to_string
@@ -15,9 +19,14 @@ class JobCategory(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(unique=True)
     description = models.TextField(blank=True)
+    # Maintained by jobs.counters
+    active_job_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         verbose_name_plural = "Job Categories"
+        indexes = [
+            models.Index(fields=['-active_job_count']),
+        ]
     
     def __str__(self):
         return self.name
@@ -30,16 +39,106 @@ class JobCategory(models.Model):
 class JobTag(models.Model):
     name = models.CharField(max_length=50)
     slug = models.SlugField(unique=True)
+    # Maintained by jobs.counters
+    active_job_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['-active_job_count']),
+        ]
     
     def __str__(self):
         return self.name
     
+    @classmethod
+    def clean_name(cls, name):
+        return ' '.join((name or '').split())[:50]
+    
+    @classmethod
+    def key_for(cls, name):
+        """Tags are matched on their name, ignoring case (as get_or_create(name=...) did on MySQL)"""
+        return cls.clean_name(name).lower()
+    
+    @classmethod
+    def ids_for(cls, names):
+        """{key_for(name): id} for tag names, bulk-creating the missing tags"""
+        wanted = {}
+        for name in names:
+            name = cls.clean_name(name)
+            if name:
+                wanted.setdefault(name.lower(), name)
+        if not wanted:
+            return {}
+        
+        by_key = cls.objects.annotate(key=Lower('name')).order_by('id')
+        tag_ids = {}
+        for key, tag_id in by_key.filter(key__in=list(wanted)).values_list('key', 'id'):
+            tag_ids.setdefault(key, tag_id)
+        
+        missing = [key for key in wanted if key not in tag_ids]
+        if missing:
+            # Slugs as JobTag.save() makes them, with a suffix where two names slugify alike
+            slugs = unique_slugs(cls.objects.all(), [slug_base(wanted[key], 50, 'tag') for key in missing])
+            cls.objects.bulk_create(
+                [cls(name=wanted[key], slug=slug) for key, slug in zip(missing, slugs)],
+                ignore_conflicts=True
+            )
+            for key, tag_id in by_key.filter(key__in=missing).values_list('key', 'id'):
+                tag_ids.setdefault(key, tag_id)
+        return tag_ids
+    
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
 
+class Skill(models.Model):
+    """A canonical skill; `key` is the normalized lookup form (see jobs.skills)"""
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, unique=True)
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+    
+    def save(self, *args, **kwargs):
+        from .skills import normalize_skill
+        self.key = normalize_skill(self.key or self.name)
+        super().save(*args, **kwargs)
+
+class SkillAlias(models.Model):
+    """Another spelling of a skill, e.g. "js" for JavaScript"""
+    alias = models.CharField(max_length=100, unique=True)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+    
+    class Meta:
+        verbose_name_plural = "Skill Aliases"
+    
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+    
+    def save(self, *args, **kwargs):
+        from .skills import normalize_skill
+        self.alias = normalize_skill(self.alias)
+        super().save(*args, **kwargs)
+
+class JobQuerySet(models.QuerySet):
+    def for_cards(self):
+        """Only the columns job cards render - no long text fields"""
+        return self.select_related('company').only(*Job.CARD_FIELDS)
+
 class Job(models.Model):
+    EXCERPT_LENGTH = 200
+    
+    # Columns list pages, feeds and recommendation cards need
+    CARD_FIELDS = [
+        'id', 'title', 'slug', 'excerpt', 'location', 'is_remote', 'is_featured', 'is_active',
+        'employment_type', 'salary_min', 'salary_max', 'salary_currency', 'views',
+        'deadline', 'created_at', 'company__id', 'company__name', 'company__slug', 'company__logo',
+    ]
+    
     EMPLOYMENT_TYPE_CHOICES = [
         ('FULL_TIME', 'Full Time'),
         ('PART_TIME', 'Part Time'),
@@ -86,6 +185,8 @@ class Job(models.Model):
         verbose_name="Years of Experience Required"
     )
     skills = models.TextField(blank=True, verbose_name="Skills")
+    # Plain-text start of the description, refreshed on save
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False)
     
     benefits = models.TextField(blank=True)
     location = models.CharField(max_length=200)
@@ -93,6 +194,8 @@ class Job(models.Model):
     employment_type = models.CharField(max_length=20, choices=EMPLOYMENT_TYPE_CHOICES)
     category = models.ForeignKey(JobCategory, on_delete=models.SET_NULL, null=True, blank=True)
     tags = models.ManyToManyField(JobTag, blank=True)
+    # Normalized copy of `skills`, kept in sync by jobs.signals
+    canonical_skills = models.ManyToManyField(Skill, through='JobSkill', blank=True, related_name='jobs')
     
     salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
@@ -110,12 +213,18 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
+    # When the job was last deactivated; jobs.archive moves long-closed jobs out
+    closed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    objects = JobQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['-created_at']),
             models.Index(fields=['is_active']),
+            models.Index(fields=['is_active', 'deadline']),
+            models.Index(fields=['is_active', 'closed_at']),
             models.Index(fields=['is_featured']),
             models.Index(fields=['education_level']),
             models.Index(fields=['experience_years']),
@@ -124,36 +233,68 @@ class Job(models.Model):
     def __str__(self):
         return f"{self.title} at {self.company.name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_counted_state()
+        return instance
+    
+    def remember_counted_state(self):
+        """Snapshot what the category/tag counters last counted (see jobs.counters)"""
+        loaded = self.__dict__
+        if 'category_id' in loaded and 'is_active' in loaded:
+            self._counted_state = (self.category_id, self.is_active)
+    
     def save(self, *args, **kwargs):
         is_new = self.pk is None
         
-        if not self.slug:
-            base_slug = slugify(f"{self.title}-{self.company.name}")
-            self.slug = base_slug
-        
-        if self.slug:
-            original_slug = self.slug
-            counter = 1
-            
-            while True:
-                query = Job.objects.filter(slug=self.slug)
-                if self.pk:
-                    query = query.exclude(pk=self.pk)
-                
-                if not query.exists():
-                    break
-                
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-        
         if not self.published_at and self.is_active:
             self.published_at = timezone.now()
         
-        super().save(*args, **kwargs)
+        if self.is_active:
+            self.closed_at = None
+        elif not self.closed_at:
+            self.closed_at = timezone.now()
+        
+        self.excerpt = self.make_excerpt(self.description)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'description' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'excerpt'}
+        if update_fields is not None and 'is_active' in update_fields:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'closed_at'}
+        
+        def save_row():
+            # Atomic so the counter updates in jobs.signals commit with the row
+            with transaction.atomic():
+                super(Job, self).save(*args, **kwargs)
+        
+        if is_new or not self.slug:
+            max_length = self._meta.get_field('slug').max_length
+            base = slugify(self.slug) or slug_base(f"{self.title}-{self.company.name}", max_length, 'job')
+            save_with_unique_slug(self, base, save_row)
+        else:
+            save_row()
         
         if is_new and self.is_active:
             self.check_job_alerts()
     
+    def set_tag_names(self, names):
+        """
+        Make the job's tags exactly `names`: missing tags are bulk-created and
+        the through table gets one insert and one delete for the difference.
+        """
+        tag_ids = JobTag.ids_for(names)
+        
+        # set() diffs against the current rows and still sends m2m_changed,
+        # which keeps the tag counters and similar-jobs staleness in step
+        self.tags.set(tag_ids.values())
+    
+    @classmethod
+    def make_excerpt(cls, description):
+        """Plain text, whitespace collapsed, cut at EXCERPT_LENGTH with an ellipsis"""
+        text = ' '.join(strip_tags(description or '').split())
+        return Truncator(text).chars(cls.EXCERPT_LENGTH)
+    
     def check_job_alerts(self):
         JobAlert = apps.get_model('jobs', 'JobAlert')
         
@@ -217,6 +358,170 @@ class Job(models.Model):
             if value == self.employment_type:
                 return label
         return self.employment_type
+    
+    @property
+    def skills_list(self):
+        """Skill names - prefetch_related('canonical_skills') to avoid a query per job"""
+        return [skill.name for skill in self.canonical_skills.all()]
+
+class JobSkill(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
+    
+    class Meta:
+        unique_together = ['job', 'skill']
+        indexes = [
+            models.Index(fields=['skill', 'job']),
+        ]
+
+class JobTrendingScore(models.Model):
+    """
+    Forward-decayed view/application score, maintained by jobs.trending.
+    `score` is the job's weight as of `landmark`; rows sharing a landmark
+    compare directly, so ordering by -score ranks them.
+    """
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='trending_score')
+    score = models.FloatField(default=0)
+    landmark = models.DateTimeField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score']),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id}: {self.score:.2f}"
+
+class JobNeighbours(models.Model):
+    """Precomputed nearest neighbours of a job, best first"""
+    KIND_CHOICES = [
+        ('CONTENT', 'Similar content'),
+        ('BEHAVIOUR', 'Viewed together'),
+    ]
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='neighbour_lists')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # [[job_id, score], ...] sorted by score, highest first
+    neighbours = models.JSONField(default=list)
+    is_stale = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['job', 'kind']
+        verbose_name_plural = 'Job Neighbours'
+        indexes = [
+            models.Index(fields=['kind', 'is_stale']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} for job {self.job_id}"
+    
+    @classmethod
+    def jobs_for(cls, job, kind, limit=5):
+        """Active neighbour jobs in score order: one unique-key lookup plus one pk lookup"""
+        neighbours = cls.objects.filter(job=job, kind=kind).values_list('neighbours', flat=True).first()
+        if not neighbours:
+            return []
+        
+        ids = [job_id for job_id, score in neighbours]
+        jobs = Job.objects.filter(id__in=ids, is_active=True).for_cards()
+        position = {job_id: index for index, job_id in enumerate(ids)}
+        return sorted(jobs, key=lambda j: position[j.id])[:limit]
+
+class ArchivedJob(models.Model):
+    """
+    Read-only copy of a closed job moved out of the hot tables by
+    jobs.archive. The columns employers list and filter on are kept as
+    fields; everything else (remaining job fields, tags, screening
+    questions, daily view counts) is in `data`.
+    """
+    original_id = models.PositiveBigIntegerField(unique=True)
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='archived_jobs')
+    title = models.CharField(max_length=200)
+    slug = models.SlugField(max_length=200)
+    location = models.CharField(max_length=200)
+    employment_type = models.CharField(max_length=20, choices=Job.EMPLOYMENT_TYPE_CHOICES)
+    category_name = models.CharField(max_length=100, blank=True)
+    application_count = models.PositiveIntegerField(default=0)
+    view_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField()
+    closed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    
+    class Meta:
+        ordering = ['-closed_at']
+        indexes = [
+            models.Index(fields=['company', '-closed_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} (archived)"
+    
+    @property
+    def tags(self):
+        return self.data.get('tags', [])
+    
+    @property
+    def screening_questions(self):
+        return self.data.get('screening_questions', [])
+
+class JobImport(models.Model):
+    """Uploaded job file imported in the background by jobs.tasks"""
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Queued'),
+        ('RUNNING', 'In Progress'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+    
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_imports')
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='job_imports')
+    # Removed once the import has run; the counts and errors below remain
+    file = models.FileField(upload_to='imports/%Y/%m/%d/', blank=True)
+    filename = models.CharField(max_length=255)
+    file_format = models.CharField(max_length=5, choices=FORMAT_CHOICES, default='csv')
+    send_alerts = models.BooleanField(default=True)
+    dry_run = models.BooleanField(default=False)
+    
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    total_bytes = models.PositiveBigIntegerField(default=0)
+    processed_bytes = models.PositiveBigIntegerField(default=0)
+    rows = models.PositiveIntegerField(default=0)
+    created_jobs = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    # [line, message] pairs, capped at jobs.importer.MAX_REPORTED_ERRORS
+    errors = models.JSONField(default=list, blank=True)
+    alert_emails = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.filename} ({self.get_status_display()})"
+    
+    @property
+    def progress(self):
+        """Percent of the file read"""
+        if self.status == 'DONE':
+            return 100
+        if not self.total_bytes:
+            return 0
+        return min(100, self.processed_bytes * 100 // self.total_bytes)
+    
+    @property
+    def is_finished(self):
+        return self.status in ('DONE', 'FAILED')
 
 class ScreeningQuestion(models.Model):
     QUESTION_TYPE_CHOICES = [
@@ -319,8 +624,9 @@ class JobAlert(models.Model):
     def __str__(self):
         return f"{self.name} - {self.job_seeker.username}"
     
-    def does_job_match(self, job):
+    def does_job_match(self, job, verbose=True):
         """Check if a specific job matches ALL alert criteria - STRICT CHECK"""
+        log = print if verbose else (lambda *args: None)
         
         # 1. KEYWORD - DAPAT NASA JOB TITLE (kung may keyword sa alert)
         if self.keyword and self.keyword.strip():
@@ -329,10 +635,10 @@ class JobAlert(models.Model):
             
             # Keyword dapat nasa job title
             if keyword not in job_title:
-                print(f"❌ Keyword '{keyword}' NOT in job title '{job_title}'")
+                log(f"❌ Keyword '{keyword}' NOT in job title '{job_title}'")
                 return False  # ❌ HINDI MATCH, WALANG EMAIL
             else:
-                print(f"✅ Keyword found in job title")
+                log(f"✅ Keyword found in job title")
         
         # 2. LOCATION - DAPAT NASA JOB LOCATION (kung may location sa alert)
         if self.location and self.location.strip():
@@ -340,18 +646,18 @@ class JobAlert(models.Model):
             job_location = job.location.lower()
             
             if location not in job_location:
-                print(f"❌ Location '{location}' NOT in job location '{job_location}'")
+                log(f"❌ Location '{location}' NOT in job location '{job_location}'")
                 return False  # ❌ HINDI MATCH, WALANG EMAIL
             else:
-                print(f"✅ Location found in job location")
+                log(f"✅ Location found in job location")
         
         # 3. EMPLOYMENT TYPE - DAPAT EXACT MATCH (kung may employment type sa alert)
         if self.employment_type and self.employment_type.strip():
             if job.employment_type != self.employment_type.strip():
-                print(f"❌ Employment type mismatch: job='{job.employment_type}', alert='{self.employment_type}'")
+                log(f"❌ Employment type mismatch: job='{job.employment_type}', alert='{self.employment_type}'")
                 return False  # ❌ HINDI MATCH, WALANG EMAIL
             else:
-                print(f"✅ Employment type matches")
+                log(f"✅ Employment type matches")
         
         # 4. EDUCATION - JOB EDUCATION DAPAT MAS MATAAS O EQUAL (kung may education sa alert)
         if self.education_level and self.education_level.strip():
@@ -369,10 +675,10 @@ class JobAlert(models.Model):
             alert_edu_level = education_hierarchy.get(self.education_level.strip(), 0)
             
             if job_edu_level < alert_edu_level:
-                print(f"❌ Education too low: job={job_edu_level}, alert={alert_edu_level}")
+                log(f"❌ Education too low: job={job_edu_level}, alert={alert_edu_level}")
                 return False  # ❌ HINDI MATCH, WALANG EMAIL
             else:
-                print(f"✅ Education meets requirement")
+                log(f"✅ Education meets requirement")
         
         # 5. EXPERIENCE - JOB EXPERIENCE DAPAT MAS MABABA O EQUAL (kung may experience sa alert)
         if self.experience_years is not None:
@@ -381,43 +687,43 @@ class JobAlert(models.Model):
             alert_exp = int(self.experience_years)
             
             if job_exp > alert_exp:
-                print(f"❌ Experience too high: job={job_exp} years, alert max={alert_exp} years")
+                log(f"❌ Experience too high: job={job_exp} years, alert max={alert_exp} years")
                 return False  # ❌ HINDI MATCH, WALANG EMAIL
             else:
-                print(f"✅ Experience meets requirement")
+                log(f"✅ Experience meets requirement")
         
         # 6. REMOTE WORK - DAPAT EXACT MATCH (kung may remote setting sa alert)
         if self.is_remote is not None:
             if job.is_remote != self.is_remote:
-                print(f"❌ Remote work mismatch: job={job.is_remote}, alert={self.is_remote}")
+                log(f"❌ Remote work mismatch: job={job.is_remote}, alert={self.is_remote}")
                 return False  # ❌ HINDI MATCH, WALANG EMAIL
             else:
-                print(f"✅ Remote work matches")
+                log(f"✅ Remote work matches")
         
         # 7. CATEGORY - DAPAT EXACT MATCH (kung may category sa alert)
         if self.category:
             job_category_id = job.category.id if job.category else None
             if not job.category or job.category.id != self.category.id:
-                print(f"❌ Category mismatch: job category={job_category_id}, alert category={self.category.id}")
+                log(f"❌ Category mismatch: job category={job_category_id}, alert category={self.category.id}")
                 return False  # ❌ HINDI MATCH, WALANG EMAIL
             else:
-                print(f"✅ Category matches")
+                log(f"✅ Category matches")
         
         # 8. SALARY - DAPAT NASA LOOB NG RANGE (kung may salary sa alert)
         if self.min_salary or self.max_salary:
             # Check minimum salary
             if self.min_salary and (not job.salary_min or job.salary_min < self.min_salary):
-                print(f"❌ Salary too low: job min={job.salary_min}, alert min={self.min_salary}")
+                log(f"❌ Salary too low: job min={job.salary_min}, alert min={self.min_salary}")
                 return False  # ❌ HINDI MATCH, WALANG EMAIL
             
             # Check maximum salary
             if self.max_salary and (not job.salary_max or job.salary_max > self.max_salary):
-                print(f"❌ Salary too high: job max={job.salary_max}, alert max={self.max_salary}")
+                log(f"❌ Salary too high: job max={job.salary_max}, alert max={self.max_salary}")
                 return False  # ❌ HINDI MATCH, WALANG EMAIL
             
-            print(f"✅ Salary meets requirements")
+            log(f"✅ Salary meets requirements")
         
-        print(f"🎉 ALL CRITERIA MATCH! Sending email...")
+        log(f"🎉 ALL CRITERIA MATCH! Sending email...")
         return True  # ✅ MATCH, MAG-EEMAIL
     
     def get_matching_jobs(self):
@@ -465,11 +771,13 @@ class JobAlert(models.Model):
         
         return False
     
-    def send_email_notification(self):
+    def send_email_notification(self, matching_jobs=None):
+        """Email a digest of `matching_jobs` (default: every active match)"""
         if not self.email_notifications or not self.is_active:
             return 0
         
-        matching_jobs = self.get_matching_jobs()
+        if matching_jobs is None:
+            matching_jobs = self.get_matching_jobs()
         if not matching_jobs:
             return 0
         
@@ -478,7 +786,9 @@ class JobAlert(models.Model):
             site_name = getattr(settings, 'SITE_NAME', 'JobBoard')
             site_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
             
-            if self.frequency == 'DAILY':
+            if self.frequency == 'INSTANT':
+                subject = f"New Job Alert: {len(matching_jobs)} New Jobs Matching '{self.name}'"
+            elif self.frequency == 'DAILY':
                 subject = f"Daily Job Alert: {len(matching_jobs)} Jobs Matching '{self.name}'"
             else:
                 subject = f"Weekly Job Alert: {len(matching_jobs)} Jobs Matching '{self.name}'"
@@ -0,0 +1,265 @@
+# jobs/recommender.py
+"""
+Personalised job recommendations scored in one vectorised pass.
+
+Active jobs are kept in memory as NumPy feature arrays (education rank,
+experience, salary, category, remote flag, creation time and a packed
+bitset of skill/tag tokens). A seeker is turned into a profile from their
+job alerts (explicit preferences), applications and saved jobs, and every
+active job is scored against it with array operations; only the top-k
+ids go back to the database.
+"""
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+
+from applications.models import Application
+
+from .models import Job, JobAlert, SavedJob
+from .similarity import skill_terms
+
+# Higher rank = more education required; "none" and blank require nothing
+EDUCATION_RANK = {
+    '': 0, 'NONE': 0, 'HIGH_SCHOOL': 1, 'VOCATIONAL': 2, 'ASSOCIATE': 3,
+    'BACHELOR': 4, 'MASTER': 5, 'DOCTORATE': 6,
+}
+
+SKILL_WEIGHT = 4.0
+CATEGORY_WEIGHT = 2.0
+REMOTE_WEIGHT = 1.0
+RECENCY_WEIGHT = 1.0
+EDUCATION_PENALTY = 1.5
+EXPERIENCE_PENALTY = 0.75
+SALARY_PENALTY = 2.0
+RECENCY_HALF_LIFE_DAYS = 14
+APPLIED_WEIGHT = 2
+SAVED_WEIGHT = 1
+
+
+def set_bits(row, positions):
+    """Set bits `positions` in the packed uint8 `row` (np.packbits order)"""
+    positions = np.asarray(positions, dtype=np.int64)
+    np.bitwise_or.at(row, positions >> 3, (0x80 >> (positions & 7)).astype(np.uint8))
+
+
+def job_tokens(skills, tag_names):
+    return set(skill_terms(skills)) | {f"t:{' '.join(name.lower().split())}" for name in tag_names}
+
+
+class JobFeatures:
+    """Column arrays for every active job, row i describing ids[i]"""
+
+    def __init__(self):
+        tags = {}
+        through = Job.tags.through.objects.filter(job__is_active=True)
+        for job_id, name in through.values_list('job_id', 'jobtag__name').iterator(chunk_size=5000):
+            tags.setdefault(job_id, []).append(name)
+
+        rows = list(
+            Job.objects.filter(is_active=True).values_list(
+                'id', 'education_level', 'experience_years', 'salary_min', 'salary_max',
+                'category_id', 'is_remote', 'created_at', 'skills'
+            ).iterator(chunk_size=2000)
+        )
+        count = len(rows)
+
+        self.ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=count)
+        self.position = {job_id: index for index, job_id in enumerate(self.ids.tolist())}
+        self.education = np.fromiter(
+            (EDUCATION_RANK.get(row[1] or '', 0) for row in rows), dtype=np.int8, count=count
+        )
+        self.experience = np.fromiter((row[2] or 0 for row in rows), dtype=np.int16, count=count)
+        self.salary_min = np.fromiter(
+            (float(row[3]) if row[3] is not None else np.nan for row in rows), dtype=np.float64, count=count
+        )
+        self.salary_max = np.fromiter(
+            (float(row[4]) if row[4] is not None else np.nan for row in rows), dtype=np.float64, count=count
+        )
+        self.category = np.fromiter((row[5] or 0 for row in rows), dtype=np.int64, count=count)
+        self.remote = np.fromiter((bool(row[6]) for row in rows), dtype=bool, count=count)
+        self.created = np.fromiter((row[7].timestamp() for row in rows), dtype=np.float64, count=count)
+
+        # Skill/tag tokens as one bit per vocabulary entry, packed into bytes
+        # row by row, so no unpacked jobs x vocabulary matrix is ever built
+        token_sets = [job_tokens(row[8], tags.get(row[0], ())) for row in rows]
+        self.vocabulary = {}
+        for tokens in token_sets:
+            for token in tokens:
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+        self.skills = np.zeros((count, self.packed_width), dtype=np.uint8)
+        for index, tokens in enumerate(token_sets):
+            set_bits(self.skills[index], [self.vocabulary[token] for token in tokens])
+        self.skill_counts = np.fromiter((len(tokens) for tokens in token_sets), dtype=np.int64, count=count)
+
+        self.built_at = time.time()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def packed_width(self):
+        """Bytes per packed skill bitset"""
+        return (max(len(self.vocabulary), 1) + 7) // 8
+
+    def token_bits(self, tokens):
+        """Packed bitset for a set of tokens, matching self.skills"""
+        bits = np.zeros(self.packed_width, dtype=np.uint8)
+        set_bits(bits, [self.vocabulary[token] for token in tokens if token in self.vocabulary])
+        return bits
+
+
+_features = None
+_features_lock = threading.Lock()
+
+
+def get_features():
+    """Shared feature arrays, rebuilt after RECOMMENDER_FEATURES_SECONDS"""
+    global _features
+    max_age = getattr(settings, 'RECOMMENDER_FEATURES_SECONDS', 300)
+    features = _features
+    if features is None or time.time() - features.built_at > max_age:
+        with _features_lock:
+            if _features is None or time.time() - _features.built_at > max_age:
+                _features = JobFeatures()
+            features = _features
+    return features
+
+
+def clear_features():
+    global _features
+    _features = None
+
+
+class SeekerProfile:
+    """What we know about a seeker: alert preferences plus jobs they acted on"""
+
+    def __init__(self, user, features):
+        applied = list(Application.objects.filter(applicant=user).values_list('job_id', flat=True))
+        saved = list(SavedJob.objects.filter(job_seeker=user).values_list('job_id', flat=True))
+        alerts = list(
+            JobAlert.objects.filter(job_seeker=user, is_active=True).values(
+                'category_id', 'is_remote', 'min_salary', 'education_level', 'experience_years'
+            )
+        )
+
+        self.applied_ids = set(applied)
+        weights = Counter()
+        for job_id in applied:
+            weights[job_id] += APPLIED_WEIGHT
+        for job_id in saved:
+            weights[job_id] += SAVED_WEIGHT
+        rows = np.array(
+            [features.position[job_id] for job_id in weights if job_id in features.position], dtype=np.int64
+        )
+        row_weights = np.array(
+            [weights[job_id] for job_id in weights if job_id in features.position], dtype=np.float64
+        )
+        self.has_signals = bool(alerts) or len(rows) > 0
+
+        # Skills: every token of a job the seeker applied to or saved
+        if len(rows):
+            self.skills = np.bitwise_or.reduce(features.skills[rows], axis=0)
+        else:
+            self.skills = np.zeros(features.skills.shape[1], dtype=np.uint8)
+
+        # Categories: weighted share of interactions, plus alert categories
+        categories = Counter()
+        for row, weight in zip(rows.tolist(), row_weights.tolist()):
+            if features.category[row]:
+                categories[int(features.category[row])] += weight
+        for alert in alerts:
+            if alert['category_id']:
+                categories[alert['category_id']] += APPLIED_WEIGHT
+        total = sum(categories.values())
+        self.categories = {category: weight / total for category, weight in categories.items()} if total else {}
+
+        # Education and experience: alert preference, else the highest seen
+        alert_education = [EDUCATION_RANK.get(a['education_level'] or '', 0) for a in alerts if a['education_level']]
+        alert_experience = [a['experience_years'] for a in alerts if a['experience_years'] is not None]
+        if alert_education:
+            self.education = max(alert_education)
+        elif len(rows):
+            self.education = int(features.education[rows].max())
+        else:
+            self.education = None
+        if alert_experience:
+            self.experience = max(alert_experience)
+        elif len(rows):
+            self.experience = int(features.experience[rows].max())
+        else:
+            self.experience = None
+
+        alert_salary = [float(a['min_salary']) for a in alerts if a['min_salary']]
+        self.min_salary = min(alert_salary) if alert_salary else None
+
+        alert_remote = [a['is_remote'] for a in alerts if a['is_remote'] is not None]
+        if alert_remote:
+            self.remote = sum(alert_remote) / len(alert_remote)
+        elif len(rows):
+            self.remote = float(np.average(features.remote[rows], weights=row_weights))
+        else:
+            self.remote = None
+
+
+def score_jobs(features, profile, now=None):
+    """Score every job in `features` against `profile`; returns a float array"""
+    now = now or time.time()
+    age_days = (now - features.created) / 86400
+    scores = RECENCY_WEIGHT * np.exp2(-np.maximum(age_days, 0) / RECENCY_HALF_LIFE_DAYS)
+
+    # Popcounts straight on the packed bytes
+    seeker_skills = int(np.bitwise_count(profile.skills).sum())
+    if seeker_skills:
+        overlap = np.bitwise_count(features.skills & profile.skills).sum(axis=1, dtype=np.int64)
+        scores += SKILL_WEIGHT * overlap / np.sqrt(np.maximum(features.skill_counts, 1) * seeker_skills)
+
+    if profile.categories:
+        category_ids = np.array(list(profile.categories), dtype=np.int64)
+        category_weights = np.array(list(profile.categories.values()), dtype=np.float64)
+        matches = features.category[:, None] == category_ids[None, :]
+        scores += CATEGORY_WEIGHT * (matches * category_weights).sum(axis=1)
+
+    if profile.remote is not None:
+        scores += REMOTE_WEIGHT * np.where(features.remote, profile.remote, 1 - profile.remote)
+
+    if profile.education is not None:
+        scores -= EDUCATION_PENALTY * np.maximum(features.education - profile.education, 0)
+
+    if profile.experience is not None:
+        scores -= EXPERIENCE_PENALTY * np.maximum(features.experience - profile.experience, 0)
+
+    if profile.min_salary is not None:
+        best_salary = np.where(np.isnan(features.salary_max), features.salary_min, features.salary_max)
+        scores -= SALARY_PENALTY * (best_salary < profile.min_salary)
+
+    return scores
+
+
+def recommend_job_ids(user, k=100):
+    """Ids of the top-k active jobs for `user`, best first, excluding jobs already applied to"""
+    features = get_features()
+    if not len(features):
+        return []
+
+    profile = SeekerProfile(user, features)
+    scores = score_jobs(features, profile)
+    applied = [features.position[job_id] for job_id in profile.applied_ids if job_id in features.position]
+    scores[applied] = -np.inf
+
+    k = min(k, len(features) - len(applied))
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.lexsort((-features.created[top], -scores[top]))]
+    return features.ids[top].tolist()
+
+
+def recommend_jobs(user, k=100):
+    """Top-k recommended Job objects for `user`, best first"""
+    job_ids = recommend_job_ids(user, k)
+    jobs = Job.objects.filter(id__in=job_ids, is_active=True).for_cards()
+    position = {job_id: index for index, job_id in enumerate(job_ids)}
+    return sorted(jobs, key=lambda job: position[job.id])
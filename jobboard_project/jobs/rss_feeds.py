@@ -8,13 +8,13 @@ class LatestJobsFeed(Feed):
     description = "Latest job postings on our platform"
     
     def items(self):
-        return Job.objects.filter(is_active=True).order_by('-created_at')[:50]
+        return Job.objects.filter(is_active=True).for_cards().order_by('-created_at')[:50]
     
     def item_title(self, item):
         return item.title
     
     def item_description(self, item):
-        return f"{item.company.name} - {item.location}\n\n{item.description[:200]}..."
+        return f"{item.company.name} - {item.location}\n\n{item.excerpt}"
     
     def item_link(self, item):
         return item.get_absolute_url()
@@ -0,0 +1,62 @@
+# jobs/signals.py
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from . import counters
+from .models import Job
+from .similarity import mark_stale
+from .skills import sync_job_skills
+
+# Saving only these fields does not change what a job is about
+CONTENT_FIELDS = {'title', 'skills', 'category', 'is_active'}
+
+@receiver(post_save, sender=Job)
+def job_content_changed(sender, instance, created, update_fields=None, **kwargs):
+    """Flag the job's similar-jobs list for recomputation"""
+    if created:
+        return
+    if update_fields is not None and not CONTENT_FIELDS.intersection(update_fields):
+        return
+    mark_stale([instance.pk])
+
+@receiver(post_save, sender=Job)
+def job_skills_changed(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the JobSkill rows in step with the skills text"""
+    if update_fields is not None and 'skills' not in update_fields:
+        return
+    sync_job_skills(instance)
+
+@receiver(m2m_changed, sender=Job.tags.through)
+def job_tags_changed(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, Job):
+        mark_stale([instance.pk])
+
+@receiver(pre_save, sender=Job)
+def remember_job_counts(sender, instance, **kwargs):
+    instance._counter_old_state = counters.previous_state(instance)
+
+@receiver(post_save, sender=Job)
+def update_job_counts(sender, instance, **kwargs):
+    """Move the job between category/tag active counts (same transaction as the save)"""
+    counters.job_saved(instance, getattr(instance, '_counter_old_state', None))
+
+@receiver(pre_delete, sender=Job)
+def remember_deleted_job_tags(sender, instance, **kwargs):
+    # The tag links are gone by post_delete
+    instance._counter_tag_ids = list(instance.tags.values_list('pk', flat=True))
+
+@receiver(post_delete, sender=Job)
+def update_deleted_job_counts(sender, instance, **kwargs):
+    counters.job_deleted(instance, getattr(instance, '_counter_tag_ids', []))
+
+@receiver(m2m_changed, sender=Job.tags.through)
+def update_tag_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # clear() does not pass pk_set, so remember what is about to go
+        if reverse:
+            instance._counter_cleared = set(instance.job_set.values_list('pk', flat=True))
+        else:
+            instance._counter_cleared = set(instance.tags.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        counters.tags_changed(instance, 'post_remove', getattr(instance, '_counter_cleared', set()), reverse)
+    elif action in ('post_add', 'post_remove'):
+        counters.tags_changed(instance, action, pk_set, reverse)
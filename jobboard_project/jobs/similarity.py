@@ -0,0 +1,193 @@
+# jobs/similarity.py
+"""
+Content similarity between active jobs.
+
+Each job is a TF-IDF vector over its title words, its comma-separated
+skills (whole phrases), its tags and its category. Nearest neighbours are
+found through an inverted index, so a job is only compared with jobs that
+share at least one term, and are stored in JobNeighbours (kind CONTENT).
+Jobs are flagged stale when they change (see jobs.signals) and only stale
+or missing jobs are recomputed on each run.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Job, JobNeighbours
+
+KIND = 'CONTENT'
+NEIGHBOURS_KEPT = 10
+# Terms found in more than this share of jobs carry no signal and are skipped
+# (only once there are enough jobs for the share to mean something)
+MAX_DOCUMENT_FREQUENCY = 0.5
+MIN_JOBS_FOR_PRUNING = 100
+
+TITLE_WEIGHT = 1.0
+SKILL_WEIGHT = 2.0
+TAG_WEIGHT = 1.5
+CATEGORY_WEIGHT = 1.0
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'at', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with',
+    'sr', 'jr', 'senior', 'junior', 'ii', 'iii',
+}
+
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def title_terms(title):
+    return [
+        f"w:{word}" for word in WORD_PATTERN.findall((title or '').lower())
+        if word not in STOP_WORDS and len(word) > 1
+    ]
+
+
+def skill_terms(skills):
+    return [
+        f"s:{' '.join(skill.lower().split())}"
+        for skill in (skills or '').split(',') if skill.strip()
+    ]
+
+
+def job_terms(title, skills, tag_names, category_id):
+    terms = Counter()
+    for term in title_terms(title):
+        terms[term] += TITLE_WEIGHT
+    for term in skill_terms(skills):
+        terms[term] += SKILL_WEIGHT
+        # Single skill words also match titles ("python" in "Python Developer")
+        for word in term[2:].split():
+            if word not in STOP_WORDS:
+                terms[f"w:{word}"] += TITLE_WEIGHT / 2
+    for name in tag_names:
+        terms[f"t:{' '.join(name.lower().split())}"] += TAG_WEIGHT
+    if category_id:
+        terms[f"c:{category_id}"] += CATEGORY_WEIGHT
+    return terms
+
+
+def build_vectors():
+    """L2-normalised TF-IDF vectors for every active job, plus the inverted index"""
+    tags = defaultdict(list)
+    through = Job.tags.through.objects.filter(job__is_active=True)
+    for job_id, name in through.values_list('job_id', 'jobtag__name').iterator(chunk_size=5000):
+        tags[job_id].append(name)
+
+    raw = {}
+    jobs = Job.objects.filter(is_active=True).values_list('id', 'title', 'skills', 'category_id')
+    for job_id, title, skills, category_id in jobs.iterator(chunk_size=2000):
+        raw[job_id] = job_terms(title, skills, tags[job_id], category_id)
+
+    total = len(raw)
+    document_frequency = Counter()
+    for terms in raw.values():
+        document_frequency.update(terms.keys())
+
+    max_df = int(total * MAX_DOCUMENT_FREQUENCY) if total >= MIN_JOBS_FOR_PRUNING else total
+    idf = {
+        term: math.log((1 + total) / (1 + df)) + 1
+        for term, df in document_frequency.items()
+        if df <= max_df
+    }
+
+    vectors = {}
+    index = defaultdict(list)
+    for job_id, terms in raw.items():
+        vector = {term: tf * idf[term] for term, tf in terms.items() if term in idf}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if not norm:
+            vectors[job_id] = {}
+            continue
+        vector = {term: weight / norm for term, weight in vector.items()}
+        vectors[job_id] = vector
+        for term, weight in vector.items():
+            index[term].append((job_id, weight))
+
+    return vectors, index
+
+
+def nearest_neighbours(job_id, vectors, index, k=NEIGHBOURS_KEPT):
+    scores = defaultdict(float)
+    for term, weight in vectors.get(job_id, {}).items():
+        for other_id, other_weight in index[term]:
+            if other_id != job_id:
+                scores[other_id] += weight * other_weight
+    best = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))[:k]
+    return [[other_id, round(score, 4)] for other_id, score in best]
+
+
+def insert_neighbour(neighbours, job_id, score, k=NEIGHBOURS_KEPT):
+    """Insert/refresh job_id in a stored neighbour list; returns True if the list changed"""
+    current = [pair for pair in neighbours if pair[0] != job_id]
+    if len(current) >= k and score <= current[-1][1]:
+        changed = len(current) != len(neighbours)
+        neighbours[:] = current
+        return changed
+    current.append([job_id, score])
+    current.sort(key=lambda pair: (-pair[1], -pair[0]))
+    neighbours[:] = current[:k]
+    return True
+
+
+def refresh_similar_jobs(full=False, k=NEIGHBOURS_KEPT, batch_size=500):
+    """
+    Recompute neighbours for stale or missing jobs (or every active job when
+    `full`), then push each refreshed job into its neighbours' lists.
+    Returns the number of jobs recomputed.
+    """
+    vectors, index = build_vectors()
+
+    if full:
+        targets = list(vectors)
+    else:
+        fresh = set(
+            JobNeighbours.objects.filter(kind=KIND, is_stale=False).values_list('job_id', flat=True)
+        )
+        targets = [job_id for job_id in vectors if job_id not in fresh]
+
+    now = timezone.now()
+    for start in range(0, len(targets), batch_size):
+        chunk = targets[start:start + batch_size]
+        computed = {job_id: nearest_neighbours(job_id, vectors, index, k) for job_id in chunk}
+
+        with transaction.atomic():
+            JobNeighbours.objects.bulk_create(
+                [JobNeighbours(job_id=job_id, kind=KIND) for job_id in chunk],
+                ignore_conflicts=True
+            )
+            rows = {
+                row.job_id: row
+                for row in JobNeighbours.objects.select_for_update().filter(kind=KIND, job_id__in=chunk)
+            }
+            for job_id, neighbours in computed.items():
+                rows[job_id].neighbours = neighbours
+                rows[job_id].is_stale = False
+                rows[job_id].updated_at = now
+            JobNeighbours.objects.bulk_update(list(rows.values()), ['neighbours', 'is_stale', 'updated_at'])
+
+            if not full:
+                # Symmetric update: a refreshed job may now belong in other lists
+                reverse = defaultdict(list)
+                for job_id, neighbours in computed.items():
+                    for other_id, score in neighbours:
+                        if other_id not in computed:
+                            reverse[other_id].append((job_id, score))
+                changed = []
+                others = JobNeighbours.objects.select_for_update().filter(kind=KIND, job_id__in=list(reverse))
+                for row in others:
+                    if any([insert_neighbour(row.neighbours, job_id, score, k) for job_id, score in reverse[row.job_id]]):
+                        row.updated_at = now
+                        changed.append(row)
+                JobNeighbours.objects.bulk_update(changed, ['neighbours', 'updated_at'])
+
+    # Inactive jobs do not need neighbours
+    JobNeighbours.objects.filter(kind=KIND, job__is_active=False).delete()
+
+    return len(targets)
+
+
+def mark_stale(job_ids):
+    JobNeighbours.objects.filter(kind=KIND, job_id__in=job_ids).update(is_stale=True)
@@ -0,0 +1,131 @@
+# jobs/skills.py
+"""
+Canonical skills.
+
+The comma-separated `skills` text on jobs and applications is split once,
+normalized to a lookup key and resolved to Skill rows (through SkillAlias
+for known spellings such as "js" -> JavaScript). The text stays the
+editable source; search and templates read the JobSkill/ApplicationSkill
+through tables instead of re-splitting strings.
+"""
+from django.db.models import Q
+
+from .models import Job, JobSkill, Skill, SkillAlias
+
+# Placeholders the application form stores when nothing was entered
+IGNORED_KEYS = {'', 'not specified', 'none', 'n/a', 'na'}
+MAX_LENGTH = 100
+
+
+def normalize_skill(name):
+    """Lookup key for a skill name: lower case, single spaces, no trailing punctuation"""
+    return ' '.join((name or '').lower().split()).strip(' .;:')[:MAX_LENGTH]
+
+
+def split_skills(text):
+    """{key: display name} for each distinct skill in a comma-separated string, in order"""
+    skills = {}
+    for part in (text or '').split(','):
+        display = ' '.join(part.split()).strip(' .;:')[:MAX_LENGTH]
+        key = normalize_skill(display)
+        if key not in IGNORED_KEYS and key not in skills:
+            skills[key] = display
+    return skills
+
+
+def resolve_skills(skills, create=True):
+    """
+    Map {key: display name} to {key: skill_id}, following aliases and
+    creating missing skills (unless `create` is False).
+    """
+    if not skills:
+        return {}
+
+    resolved = dict(SkillAlias.objects.filter(alias__in=list(skills)).values_list('alias', 'skill_id'))
+    remaining = [key for key in skills if key not in resolved]
+    resolved.update(Skill.objects.filter(key__in=remaining).values_list('key', 'id'))
+
+    missing = [key for key in skills if key not in resolved]
+    if missing and create:
+        Skill.objects.bulk_create(
+            [Skill(key=key, name=skills[key]) for key in missing],
+            ignore_conflicts=True
+        )
+        resolved.update(Skill.objects.filter(key__in=missing).values_list('key', 'id'))
+    return resolved
+
+
+def sync_skill_links(through, owner_field, owner_id, skill_ids):
+    """Make the through rows of one owner match `skill_ids` with one insert and one delete"""
+    current = set(through.objects.filter(**{owner_field: owner_id}).values_list('skill_id', flat=True))
+    wanted = set(skill_ids)
+    if wanted - current:
+        through.objects.bulk_create(
+            [through(**{owner_field: owner_id, 'skill_id': skill_id}) for skill_id in wanted - current],
+            ignore_conflicts=True
+        )
+    if current - wanted:
+        through.objects.filter(**{owner_field: owner_id, 'skill_id__in': current - wanted}).delete()
+
+
+def sync_job_skills(job):
+    sync_skill_links(JobSkill, 'job_id', job.pk, resolve_skills(split_skills(job.skills)).values())
+
+
+def sync_application_skills(application):
+    from applications.models import ApplicationSkill
+    skill_ids = resolve_skills(split_skills(application.skills)).values()
+    sync_skill_links(ApplicationSkill, 'application_id', application.pk, skill_ids)
+
+
+def matching_skill_ids(keyword):
+    """Ids of the skills a search keyword names (exact key or alias, both indexed)"""
+    key = normalize_skill(keyword)
+    if key in IGNORED_KEYS:
+        return []
+    return list(
+        Skill.objects.filter(Q(key=key) | Q(aliases__alias=key)).values_list('id', flat=True).distinct()
+    )
+
+
+def skill_filter(keyword):
+    """Q matching jobs that list the skill named by `keyword`, as an indexed join"""
+    return Q(id__in=JobSkill.objects.filter(skill_id__in=matching_skill_ids(keyword)).values('job_id'))
+
+
+def backfill(model, through, owner_field, batch_size=500):
+    """Link every row of `model` to its skills; returns the number of rows processed"""
+    processed = 0
+    last_id = 0
+    while True:
+        rows = list(
+            model.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'skills')[:batch_size]
+        )
+        if not rows:
+            return processed
+
+        parsed = {row_id: split_skills(text) for row_id, text in rows}
+        names = {}
+        for skills in parsed.values():
+            for key, display in skills.items():
+                names.setdefault(key, display)
+        resolved = resolve_skills(names)
+
+        links = [
+            through(**{owner_field: row_id, 'skill_id': resolved[key]})
+            for row_id, skills in parsed.items()
+            for key in skills
+        ]
+        through.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+
+        processed += len(rows)
+        last_id = rows[-1][0]
+
+
+def backfill_job_skills(batch_size=500):
+    return backfill(Job, JobSkill, 'job_id', batch_size)
+
+
+def backfill_application_skills(batch_size=500):
+    from applications.models import Application, ApplicationSkill
+    return backfill(Application, ApplicationSkill, 'application_id', batch_size)
@@ -3,7 +3,12 @@ from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.db.models import Q
-from .models import JobAlert, Job
+from .models import JobAlert, Job, JobImport
+from .archive import archive_jobs
+from .expiry import expire_jobs
+from .importer import run_import
+from .similarity import refresh_similar_jobs
+from .trending import refresh_trending
 from datetime import datetime, timedelta
 
 @shared_task
@@ -62,4 +67,51 @@ def send_job_alerts():
             alert.last_sent = datetime.now()
             alert.save(update_fields=['last_sent'])
     
-    return f"Sent alerts to {alerts.count()} subscribers"
\ No newline at end of file
+    return f"Sent alerts to {alerts.count()} subscribers"
+
+@shared_task
+def refresh_trending_jobs():
+    """
+    Decay stored trending scores and cache the top jobs
+    """
+    top_ids = refresh_trending()
+    return f"Trending jobs refreshed ({len(top_ids)} in top list)"
+
+
+@shared_task
+def refresh_job_similarity():
+    """
+    Recompute similar jobs for new and changed postings
+    """
+    refreshed = refresh_similar_jobs()
+    return f"Refreshed similar jobs for {refreshed} job(s)"
+
+
+@shared_task
+def expire_past_deadline_jobs():
+    """
+    Deactivate jobs whose application deadline has passed
+    """
+    return str(expire_jobs())
+
+
+@shared_task
+def archive_closed_jobs():
+    """
+    Move long-closed jobs and their applications into the archive tables
+    """
+    jobs, applications = archive_jobs()
+    return f"Archived {jobs} job(s) and {applications} application(s)"
+
+
+@shared_task
+def run_job_import(import_id):
+    """
+    Import an uploaded job file in the background, alert emails included
+    """
+    job_import = JobImport.objects.filter(pk=import_id, status='PENDING').select_related('company').first()
+    if job_import is None:
+        return f"Import {import_id} is not queued"
+    
+    job_import = run_import(job_import)
+    return f"Import {import_id}: {job_import.status} ({job_import.created_jobs} jobs)"
@@ -0,0 +1,187 @@
+# jobs/trending.py
+"""
+Trending jobs from forward-decayed view and application counters.
+
+Every event costs O(1): the in-process tracker decays the job's pending
+counter to "now" and adds the event weight. A timer flushes pending
+counters into JobTrendingScore within TRENDING_FLUSH_SECONDS of the first
+unflushed event. Stored scores are weights as of a landmark time, so a
+flush only adds to them with F() updates and never reads them back. The
+periodic task moves old rows onto the current landmark in one UPDATE per
+landmark (the decay) and drops faded rows. Every row then shares one
+landmark, so the top-k job ids come from a single ORDER BY -score query
+on the score index (no heap) and are cached; the job list reads the
+trending section from that cache without any aggregate query.
+"""
+import math
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, Value, When
+
+from .models import Job, JobTrendingScore
+
+VIEW_WEIGHT = 1.0
+APPLICATION_WEIGHT = 5.0
+TOP_K = 20
+MIN_SCORE = 0.01
+CACHE_KEY = 'jobs:trending:top'
+CACHE_TIMEOUT = 300
+
+
+def half_life_seconds():
+    return getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24) * 3600
+
+
+def decay(value, elapsed_seconds):
+    """Value of a counter `elapsed_seconds` after it was last updated"""
+    if elapsed_seconds <= 0:
+        return value
+    return value * math.exp(-math.log(2) * elapsed_seconds / half_life_seconds())
+
+
+def growth(landmark, now):
+    """Factor that turns a weight at `now` into a weight as of `landmark`"""
+    return math.exp(math.log(2) * (now - landmark.timestamp()) / half_life_seconds())
+
+
+def landmark_for(now):
+    """Start of the half-life period containing `now` (a Unix timestamp)"""
+    period = half_life_seconds()
+    return datetime.fromtimestamp(now // period * period, tz=dt_timezone.utc)
+
+
+class TrendingTracker:
+    """Per-process decayed counters, flushed into JobTrendingScore in batches"""
+
+    def __init__(self, flush_seconds=None):
+        self.flush_seconds = flush_seconds or getattr(settings, 'TRENDING_FLUSH_SECONDS', 60)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def record(self, job_id, weight, now=None):
+        now = now or time.time()
+        with self._lock:
+            value, updated = self._pending.get(job_id, (0.0, now))
+            self._pending[job_id] = (decay(value, now - updated) + weight, now)
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_on_timer(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error flushing trending counters: {e}")
+        finally:
+            # The timer thread opened its own connection
+            connection.close()
+
+    def flush(self, now=None):
+        now = now or time.time()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            timer, self._timer = self._timer, None
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        if not pending:
+            return 0
+
+        increments = {
+            job_id: decay(value, now - updated)
+            for job_id, (value, updated) in pending.items()
+        }
+
+        with transaction.atomic():
+            JobTrendingScore.objects.bulk_create(
+                [
+                    JobTrendingScore(job_id=job_id, score=0, landmark=landmark_for(now))
+                    for job_id in increments
+                ],
+                ignore_conflicts=True
+            )
+            # Locked rows cannot be moved to a new landmark under us
+            landmarks = {}
+            rows = JobTrendingScore.objects.select_for_update().filter(job_id__in=increments)
+            for job_id, landmark in rows.values_list('job_id', 'landmark'):
+                landmarks.setdefault(landmark, []).append(job_id)
+            for landmark, job_ids in landmarks.items():
+                factor = growth(landmark, now)
+                JobTrendingScore.objects.filter(job_id__in=job_ids).update(
+                    score=F('score') + Case(
+                        *[When(job_id=job_id, then=Value(increments[job_id] * factor)) for job_id in job_ids],
+                        output_field=FloatField()
+                    )
+                )
+        return len(pending)
+
+tracker = TrendingTracker()
+
+
+def record_view(job_id):
+    try:
+        tracker.record(job_id, VIEW_WEIGHT)
+    except Exception as e:
+        print(f"Error recording trending view: {e}")
+
+
+def record_application(job_id):
+    try:
+        tracker.record(job_id, APPLICATION_WEIGHT)
+    except Exception as e:
+        print(f"Error recording trending application: {e}")
+
+
+def refresh_trending(limit=TOP_K):
+    """
+    Move every stored score onto the current landmark, drop inactive or
+    faded jobs and cache the ids of the top `limit` jobs, ranked by the
+    database on the -score index. Returns those ids.
+    """
+    now = time.time()
+    current = landmark_for(now)
+
+    JobTrendingScore.objects.filter(job__is_active=False).delete()
+
+    # Each UPDATE decays in the database, so concurrent flushes are not lost
+    old_landmarks = (
+        JobTrendingScore.objects.filter(landmark__lt=current)
+        .values_list('landmark', flat=True).distinct()
+    )
+    for landmark in list(old_landmarks):
+        JobTrendingScore.objects.filter(landmark=landmark).update(
+            score=F('score') / growth(landmark, current.timestamp()),
+            landmark=current
+        )
+
+    JobTrendingScore.objects.filter(landmark=current, score__lt=MIN_SCORE * growth(current, now)).delete()
+
+    top_ids = list(
+        JobTrendingScore.objects.filter(job__is_active=True)
+        .order_by('-score')
+        .values_list('job_id', flat=True)[:limit]
+    )
+    cache.set(CACHE_KEY, top_ids, CACHE_TIMEOUT)
+    return top_ids
+
+def get_trending_jobs(limit=5):
+    """Top trending active jobs, read from the cached top-k (no aggregates)"""
+    top_ids = cache.get(CACHE_KEY)
+    if top_ids is None:
+        top_ids = list(
+            JobTrendingScore.objects.filter(job__is_active=True)
+            .order_by('-score')
+            .values_list('job_id', flat=True)[:TOP_K]
+        )
+        cache.set(CACHE_KEY, top_ids, CACHE_TIMEOUT)
+
+    top_ids = top_ids[:limit]
+    jobs = Job.objects.filter(id__in=top_ids, is_active=True).for_cards()
+    position = {job_id: index for index, job_id in enumerate(top_ids)}
+    return sorted(jobs, key=lambda job: position[job.id])
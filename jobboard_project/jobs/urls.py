@@ -6,6 +6,9 @@ urlpatterns = [
     # Job Listings
     path('', views.JobListView.as_view(), name='job_list'),
     path('create/', views.JobCreateView.as_view(), name='job_create'),
+    path('import/', views.JobImportView.as_view(), name='job_import'),
+    path('import/<int:pk>/', views.JobImportDetailView.as_view(), name='job_import_detail'),
+    path('import/<int:pk>/status/', views.JobImportStatusView.as_view(), name='job_import_status'),
     path('<int:pk>/edit/', views.JobUpdateView.as_view(), name='job_update'),
     
     # Job Alerts - MUST BE BEFORE job_detail!
@@ -20,14 +23,22 @@ urlpatterns = [
     path('save/<int:job_id>/', views.SaveJobView.as_view(), name='save_job'),
     path('saved/clear/', views.ClearSavedJobsView.as_view(), name='clear_saved_jobs'),
     
+    # Archived Jobs (read-only)
+    path('archived/', views.ArchivedJobListView.as_view(), name='archived_jobs'),
+    path('archived/<int:pk>/', views.ArchivedJobDetailView.as_view(), name='archived_job_detail'),
+    
+    # Search & Recommendations - MUST BE BEFORE job_detail!
+    path('search/', views.JobSearchView.as_view(), name='job_search'),
+    path('recommended/', views.RecommendedJobsView.as_view(), name='recommended_jobs'),
+    
+    # Employer Dashboard - MUST BE BEFORE job_detail!
+    path('dashboard/', views.JobDashboardView.as_view(), name='job_dashboard'),
+    
     # Job Detail - MUST BE AFTER alerts!
     path('<slug:slug>/', views.JobDetailView.as_view(), name='job_detail'),
     
     # Additional Job Features
-    path('search/', views.JobSearchView.as_view(), name='job_search'),
-    path('recommended/', views.RecommendedJobsView.as_view(), name='recommended_jobs'),
     path('applications/', views.MyApplicationsView.as_view(), name='my_applications'),
-    path('dashboard/', views.JobDashboardView.as_view(), name='job_dashboard'),
     
     # RSS Feed
     path('feed/rss/', LatestJobsFeed(), name='job_feed'),
@@ -2,13 +2,21 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.db import transaction
+from django.db.models import Q, Count, prefetch_related_objects
+from django.http import JsonResponse
 from django_filters.views import FilterView
 from users.views import EmployerRequiredMixin, JobSeekerRequiredMixin
-from .models import Job, JobCategory, JobTag, SavedJob, JobAlert, ScreeningQuestion
-from .forms import JobForm, JobFilterForm, JobAlertForm, ScreeningQuestionForm
+from .models import ArchivedJob, Job, JobCategory, JobImport, JobTag, SavedJob, JobAlert, ScreeningQuestion, JobNeighbours
+from .forms import JobForm, JobFilterForm, JobAlertForm, JobImportForm, ScreeningQuestionForm
 from .filters import JobFilter
+from .importer import detect_format, queue_import
+from .trending import get_trending_jobs, record_view
+from .recommender import recommend_jobs
+from .skills import skill_filter
 from analytics.models import JobView
+from analytics.rollups import job_view_counts, unique_viewer_counts
+from analytics.tracking import get_client_ip, get_visitor_id, is_crawler, remember_visitor
 from django.urls import reverse_lazy
 from django.utils import timezone
 from datetime import timedelta
@@ -26,9 +34,10 @@ class JobListView(FilterView):
     context_object_name = 'jobs'
     
     def get_queryset(self):
-        queryset = Job.objects.filter(is_active=True).select_related('company')
+        queryset = Job.objects.filter(is_active=True).for_cards().prefetch_related('tags')
         
         keyword = self.request.GET.get('keyword', '')
+        skill = self.request.GET.get('skill', '')
         location = self.request.GET.get('location', '')
         remote = self.request.GET.get('remote', '')
         education_level = self.request.GET.get('education_level', '')
@@ -40,9 +49,12 @@ class JobListView(FilterView):
                 Q(description__icontains=keyword) |
                 Q(requirements__icontains=keyword) |
                 Q(qualifications__icontains=keyword) |
-                Q(skills__icontains=keyword)
+                skill_filter(keyword)
             )
         
+        if skill:
+            queryset = queryset.filter(skill_filter(skill))
+        
         if location:
             queryset = queryset.filter(location__icontains=location)
         
@@ -63,12 +75,10 @@ class JobListView(FilterView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = JobCategory.objects.annotate(
-            job_count=Count('job')
-        ).order_by('-job_count')[:10]
-        context['popular_tags'] = JobTag.objects.annotate(
-            job_count=Count('job')
-        ).order_by('-job_count')[:15]
+        # Counters are maintained by jobs.counters - no aggregate over jobs here
+        context['categories'] = JobCategory.objects.order_by('-active_job_count')[:10]
+        context['popular_tags'] = JobTag.objects.order_by('-active_job_count')[:15]
+        context['trending_jobs'] = get_trending_jobs(5)
         return context
 
 class JobDetailView(DetailView):
@@ -76,34 +86,45 @@ class JobDetailView(DetailView):
     template_name = 'jobs/job_detail.html'
     context_object_name = 'job'
     
+    def get(self, request, *args, **kwargs):
+        self.new_visitor_id = None
+        response = super().get(request, *args, **kwargs)
+        
+        # Remember anonymous visitors with a signed cookie (no session row)
+        if self.new_visitor_id:
+            remember_visitor(response, self.new_visitor_id)
+        return response
+    
+    def get_queryset(self):
+        return Job.objects.select_related('company').prefetch_related('canonical_skills')
+    
     def get_object(self, queryset=None):
         obj = super().get_object(queryset)
         
         # Track the view
         try:
-            # Create session if it doesn't exist (for anonymous users)
-            if not self.request.session.session_key:
-                self.request.session.create()
-            
             if self.request.user.is_authenticated:
                 # For authenticated users - track with user
                 JobView.objects.create(
                     job=obj,
                     viewer=self.request.user,
-                    ip_address=self.request.META.get('REMOTE_ADDR')
+                    ip_address=get_client_ip(self.request)
                 )
             else:
-                # For anonymous users - track with session key
-                session_key = self.request.session.session_key
+                # For anonymous users - track with a stateless visitor id
+                visitor_id, is_new = get_visitor_id(self.request)
                 JobView.objects.create(
                     job=obj,
-                    session_key=session_key,
-                    ip_address=self.request.META.get('REMOTE_ADDR')
+                    session_key=visitor_id,
+                    ip_address=get_client_ip(self.request)
                 )
+                if is_new and not is_crawler(self.request):
+                    self.new_visitor_id = visitor_id
             
             # Increment view count on the job
             obj.views += 1
             obj.save(update_fields=['views'])
+            record_view(obj.id)
             
         except Exception as e:
             # Log error but don't crash the page
@@ -115,12 +136,6 @@ class JobDetailView(DetailView):
         context = super().get_context_data(**kwargs)
         job = self.object
         
-        # Process skills list
-        if job.skills:
-            context['skills_list'] = [skill.strip() for skill in job.skills.split(',')]
-        else:
-            context['skills_list'] = []
-        
         # Check if job is saved (for job seekers)
         if self.request.user.is_authenticated and hasattr(self.request.user, 'role') and self.request.user.role == 'JOB_SEEKER':
             context['is_saved'] = SavedJob.objects.filter(
@@ -143,12 +158,16 @@ class JobDetailView(DetailView):
         else:
             context['has_applied'] = False
         
-        # Get similar jobs
-        similar_jobs = Job.objects.filter(
-            Q(category=job.category) | 
-            Q(skills__icontains=job.skills)
-        ).exclude(id=job.id).filter(is_active=True).select_related('company')[:5]
+        # Get similar jobs (precomputed by jobs.similarity)
+        similar_jobs = JobNeighbours.jobs_for(job, 'CONTENT', limit=5)
+        if not similar_jobs and job.category_id:
+            # Not computed yet - fall back to the newest jobs in the same category
+            similar_jobs = Job.objects.filter(
+                category_id=job.category_id,
+                is_active=True
+            ).exclude(id=job.id).for_cards()[:5]
         context['similar_jobs'] = similar_jobs
+        context['also_viewed_jobs'] = JobNeighbours.jobs_for(job, 'BEHAVIOUR', limit=5)
         
         return context
 class JobCreateView(EmployerRequiredMixin, CreateView):
@@ -200,6 +219,69 @@ class JobCreateView(EmployerRequiredMixin, CreateView):
     def get_success_url(self):
         return reverse_lazy('job_detail', kwargs={'slug': self.object.slug})
 
+class JobImportView(EmployerRequiredMixin, View):
+    """Bulk job upload from a CSV or JSON Lines file"""
+    template_name = 'jobs/job_import.html'
+    
+    def get(self, request):
+        return render(request, self.template_name, self.get_context(JobImportForm()))
+    
+    def get_context(self, form):
+        return {
+            'form': form,
+            'recent_imports': JobImport.objects.filter(requested_by=self.request.user)[:5],
+        }
+    
+    def post(self, request):
+        from companies.models import Company
+        try:
+            company = Company.objects.get(employer=request.user)
+        except Company.DoesNotExist:
+            messages.error(request, 'You need to create a company profile before posting jobs.')
+            return redirect('company_create')
+        
+        form = JobImportForm(request.POST, request.FILES)
+        if not form.is_valid():
+            return render(request, self.template_name, self.get_context(form))
+        
+        upload = form.cleaned_data['file']
+        job_import = JobImport.objects.create(
+            requested_by=request.user,
+            company=company,
+            file=upload,
+            filename=upload.name,
+            file_format=detect_format(upload.name),
+            send_alerts=form.cleaned_data['send_alerts'],
+            dry_run=form.cleaned_data['dry_run'],
+        )
+        transaction.on_commit(lambda: queue_import(job_import))
+        
+        messages.info(request, 'Your file is being imported in the background.')
+        return redirect('job_import_detail', pk=job_import.pk)
+
+class JobImportDetailView(EmployerRequiredMixin, DetailView):
+    """Progress and results of a background job import"""
+    template_name = 'jobs/job_import_progress.html'
+    context_object_name = 'job_import'
+    
+    def get_queryset(self):
+        return JobImport.objects.filter(requested_by=self.request.user)
+
+class JobImportStatusView(EmployerRequiredMixin, View):
+    """Progress of a background job import, polled by the progress page"""
+    
+    def get(self, request, pk):
+        job_import = get_object_or_404(JobImport, pk=pk, requested_by=request.user)
+        return JsonResponse({
+            'status': job_import.status,
+            'status_display': job_import.get_status_display(),
+            'rows': job_import.rows,
+            'created_jobs': job_import.created_jobs,
+            'error_count': job_import.error_count,
+            'progress': job_import.progress,
+            'error': job_import.error,
+        })
+
 class JobUpdateView(EmployerRequiredMixin, UpdateView):
     model = Job
     form_class = JobForm
@@ -237,16 +319,11 @@ class SavedJobsView(JobSeekerRequiredMixin, ListView):
     context_object_name = 'saved_jobs'
     
     def get_queryset(self):
-        return SavedJob.objects.filter(job_seeker=self.request.user).select_related('job')
-    
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        for saved_job in context['saved_jobs']:
-            if saved_job.job.skills:
-                saved_job.job.skills_list = [skill.strip() for skill in saved_job.job.skills.split(',')]
-            else:
-                saved_job.job.skills_list = []
-        return context
+        return SavedJob.objects.filter(
+            job_seeker=self.request.user
+        ).select_related('job', 'job__company').only(
+            'id', 'saved_at', 'job_seeker_id', *[f'job__{field}' for field in Job.CARD_FIELDS]
+        ).prefetch_related('job__tags')
 
 class SaveJobView(JobSeekerRequiredMixin, View):
     def post(self, request, job_id):
@@ -294,7 +371,7 @@ class CreateJobAlertView(JobSeekerRequiredMixin, View):
         context = {
             'form': form,
             'title': 'Create Job Alert',
-            'categories': JobCategory.objects.annotate(job_count=Count('job'))
+            'categories': JobCategory.objects.order_by('name')
         }
         return render(request, self.template_name, context)
     
@@ -309,7 +386,7 @@ class CreateJobAlertView(JobSeekerRequiredMixin, View):
             context = {
                 'form': form,
                 'title': 'Create Job Alert',
-                'categories': JobCategory.objects.annotate(job_count=Count('job'))
+                'categories': JobCategory.objects.order_by('name')
             }
             return render(request, self.template_name, context)
 
@@ -325,7 +402,7 @@ class EditJobAlertView(JobSeekerRequiredMixin, View):
             'form': form,
             'alert': alert,
             'title': 'Edit Job Alert',
-            'categories': JobCategory.objects.annotate(job_count=Count('job'))
+            'categories': JobCategory.objects.order_by('name')
         }
         return render(request, self.template_name, context)
     
@@ -343,7 +420,7 @@ class EditJobAlertView(JobSeekerRequiredMixin, View):
                 'form': form,
                 'alert': alert,
                 'title': 'Edit Job Alert',
-                'categories': JobCategory.objects.annotate(job_count=Count('job'))
+                'categories': JobCategory.objects.order_by('name')
             }
             return render(request, self.template_name, context)
 
@@ -471,33 +548,20 @@ class RecommendedJobsView(JobSeekerRequiredMixin, ListView):
     paginate_by = 20
     
     def get_queryset(self):
-        user = self.request.user
-        queryset = Job.objects.filter(is_active=True).select_related('company')
-        
-        if hasattr(user, 'jobseekerprofile'):
-            if user.jobseekerprofile.education_level:
-                education_order = [choice[0] for choice in Job.EDUCATION_CHOICES]
-                if user.jobseekerprofile.education_level in education_order:
-                    selected_index = education_order.index(user.jobseekerprofile.education_level)
-                    allowed_levels = education_order[selected_index:]
-                    queryset = queryset.filter(education_level__in=allowed_levels)
-            
-            if user.jobseekerprofile.years_experience is not None:
-                queryset = queryset.filter(experience_years__lte=user.jobseekerprofile.years_experience)
-        
-        return queryset.order_by('-created_at')[:100]
+        # Scored in memory by jobs.recommender; only the top 100 are fetched
+        return recommend_jobs(self.request.user, k=100)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        for job in context['jobs']:
-            if job.skills:
-                job.skills_list = [skill.strip() for skill in job.skills.split(',')]
-            else:
-                job.skills_list = []
+        # Skill lists for the current page only
+        prefetch_related_objects(list(context['jobs']), 'canonical_skills')
         return context
 
 class JobSearchView(View):
     template_name = 'jobs/job_search.html'
+    paginate_by = 20
+    # Deeper pages than this are not served - refine the search instead
+    max_results = 1000
     
     def get(self, request):
         form = JobFilterForm(request.GET or None)
@@ -510,6 +574,7 @@ class JobSearchView(View):
             remote = form.cleaned_data.get('remote')
             education_level = form.cleaned_data.get('education_level')
             experience_years = form.cleaned_data.get('experience_years')
+            employment_type = form.cleaned_data.get('employment_type')
             
             if keyword:
                 jobs = jobs.filter(
@@ -517,7 +582,7 @@ class JobSearchView(View):
                     Q(description__icontains=keyword) |
                     Q(requirements__icontains=keyword) |
                     Q(qualifications__icontains=keyword) |
-                    Q(skills__icontains=keyword)
+                    skill_filter(keyword)
                 )
             
             if location:
@@ -526,40 +591,79 @@ class JobSearchView(View):
             if category:
                 jobs = jobs.filter(category=category)
             
-            if remote:
+            if remote == 'remote':
                 jobs = jobs.filter(is_remote=True)
+            elif remote == 'onsite':
+                jobs = jobs.filter(is_remote=False)
             
             if education_level:
                 jobs = jobs.filter(education_level=education_level)
             
-            if experience_years is not None:
+            if experience_years not in (None, ''):
                 jobs = jobs.filter(experience_years=experience_years)
+            
+            if employment_type:
+                jobs = jobs.filter(employment_type=employment_type)
         
-        for job in jobs:
-            if job.skills:
-                job.skills_list = [skill.strip() for skill in job.skills.split(',')]
-            else:
-                job.skills_list = []
+        # Capped before paginating so COUNT and OFFSET stay bounded
+        jobs = jobs.for_cards().order_by('-created_at', '-id')
+        paginator = Paginator(jobs[:self.max_results], self.paginate_by)
+        page_obj = paginator.get_page(request.GET.get('page'))
+        prefetch_related_objects(list(page_obj), 'canonical_skills')
+        
+        query = request.GET.copy()
+        query.pop('page', None)
         
         return render(request, self.template_name, {
             'form': form,
-            'jobs': jobs,
+            'jobs': page_obj,
+            'page_obj': page_obj,
+            'is_capped': paginator.count >= self.max_results,
+            'max_results': self.max_results,
+            'querystring': query.urlencode(),
             'categories': JobCategory.objects.all()
         })
 
+class ArchivedJobListView(EmployerRequiredMixin, ListView):
+    """Read-only list of the employer's archived (long-closed) jobs"""
+    template_name = 'jobs/archived_jobs.html'
+    context_object_name = 'archived_jobs'
+    paginate_by = 20
+    
+    def get_queryset(self):
+        return ArchivedJob.objects.filter(company__employer=self.request.user).defer('data')
+
+class ArchivedJobDetailView(EmployerRequiredMixin, DetailView):
+    template_name = 'jobs/archived_job_detail.html'
+    context_object_name = 'job'
+    
+    def get_queryset(self):
+        return ArchivedJob.objects.filter(company__employer=self.request.user)
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['applications'] = self.object.applications.defer('data')
+        return context
+
 class JobDashboardView(EmployerRequiredMixin, View):
     template_name = 'jobs/employer_dashboard.html'
     
     def get(self, request):
         from companies.models import Company
+        from applications.counters import job_totals, status_counts
         from applications.models import Application
         
         company = get_object_or_404(Company, employer=request.user)
         
         total_jobs = Job.objects.filter(company=company).count()
         active_jobs = Job.objects.filter(company=company, is_active=True).count()
-        total_views = JobView.objects.filter(job__company=company).count()
-        total_applications = Application.objects.filter(job__company=company).count()
+        view_counts = job_view_counts(company=company)
+        total_views = sum(view_counts.values())
+        unique_counts, unique_viewers = unique_viewer_counts(
+            start_date=timezone.localdate() - timedelta(days=29),
+            company=company
+        )
+        total_applications = status_counts(company=company)['total']
         
         education_distribution = Job.objects.filter(
             company=company
@@ -573,22 +677,37 @@ class JobDashboardView(EmployerRequiredMixin, View):
             count=Count('id')
         ).order_by('experience_years')
         
+        education_labels = dict(Job.EDUCATION_CHOICES)
+        experience_labels = dict(Job.EXPERIENCE_CHOICES)
+        education_distribution = [
+            {**row, 'label': education_labels.get(row['education_level'], 'Not specified')}
+            for row in education_distribution
+        ]
+        experience_distribution = [
+            {**row, 'label': experience_labels.get(row['experience_years'], f"{row['experience_years']} years")}
+            for row in experience_distribution
+        ]
+        
         recent_applications = Application.objects.filter(
             job__company=company
-        ).select_related('applicant', 'job').order_by('-created_at')[:10]
-        
-        popular_jobs = Job.objects.filter(
-            company=company
-        ).annotate(
-            view_count=Count('jobview'),
-            application_count=Count('application')
-        ).order_by('-view_count')[:5]
+        ).select_related('applicant', 'job').order_by('-applied_at')[:10]
+        
+        # Views come from the daily rollups, not from the raw JobView table
+        popular_ids = [job_id for job_id, count in view_counts.most_common(5)]
+        popular_jobs = list(Job.objects.filter(id__in=popular_ids))
+        application_counts = job_totals(popular_ids)
+        for job in popular_jobs:
+            job.application_count = application_counts.get(job.id, 0)
+            job.view_count = view_counts[job.id]
+            job.unique_viewers = unique_counts.get(job.id, 0)
+        popular_jobs.sort(key=lambda job: job.view_count, reverse=True)
         
         context = {
             'company': company,
             'total_jobs': total_jobs,
             'active_jobs': active_jobs,
             'total_views': total_views,
+            'unique_viewers_30d': unique_viewers,
             'total_applications': total_applications,
             'education_distribution': education_distribution,
             'experience_distribution': experience_distribution,
@@ -11,6 +11,7 @@ from .forms import CustomUserCreationForm, CustomLoginForm
 from companies.models import Company
 from jobs.models import Job, SavedJob
 from applications.models import Application
+from applications.counters import status_counts
 from django.contrib.auth import get_user_model
 from django.contrib.auth import logout as auth_logout 
 from django.views import View 
@@ -75,7 +76,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             context['total_users'] = User.objects.count()
             context['total_companies'] = Company.objects.count()
             context['total_jobs'] = Job.objects.count()
-            context['total_applications'] = Application.objects.count()
+            context['total_applications'] = status_counts()['total']
             
             # ADD THESE TWO LINES:
             context['recent_users'] = User.objects.order_by('-date_joined')[:10]
@@ -88,12 +89,10 @@ class DashboardView(LoginRequiredMixin, TemplateView):
                 jobs = company.jobs.all()
                 
                 # Calculate all necessary stats
-                total_apps = Application.objects.filter(job__company=company).count()
+                counts = status_counts(company=company)
+                total_apps = counts['total']
                 active_jobs = jobs.filter(is_active=True).count()
-                hired_count = Application.objects.filter(
-                    job__company=company,
-                    status='HIRED'
-                ).count()
+                hired_count = counts['HIRED']
                 recent_apps = Application.objects.filter(
                     job__company=company
                 ).order_by('-applied_at')[:5]  # Last 5 applications